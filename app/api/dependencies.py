@@ -8,37 +8,59 @@ and provides their return values to route handlers.
 """
 
 # API dependencies
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
+import hmac
+from typing import Optional
 
+from fastapi import Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import ADMIN_API_KEY
+from ..core.common import AdminAccessDeniedException
+from ..database import AsyncSessionLocal
 
-def get_db():
+
+async def get_db():
     """
-    Database Session Dependency - Provides a database connection to routes
+    Database Session Dependency - Provides an async database session to routes
     
-    This function creates a new database session for each API request,
+    This function creates a new AsyncSession for each API request,
     yields it to the route handler, and ensures it's closed afterward
     (even if an exception occurs).
     
-    The 'yield' keyword makes this a generator, allowing cleanup code
-    after the route handler completes.
+    Queries on this session await the database driver, so a slow query
+    only suspends its own request instead of blocking the event loop for
+    every other request on the worker. Route handlers go through the
+    Async*Service classes, which run the service logic via run_sync.
     
     Usage:
-        @router.get("/bookings")
-        def get_bookings(db: Session = Depends(get_db)):
+        @router.get("/meals")
+        async def get_meals(db: AsyncSession = Depends(get_db)):
             # 'db' is automatically injected here
-            return db.query(Booking).all()
+            return await AsyncMealService.get_available_meals(db)
     
     Yields:
-        Session: SQLAlchemy database session for this request
+        AsyncSession: SQLAlchemy async database session for this request
     """
-    # Create a new session from our session factory
-    db = SessionLocal()
-    try:
-        # Provide the session to the route handler
+    # Create a new session from our async session factory
+    async with AsyncSessionLocal() as db:
+        # Provide the session to the route handler; leaving the block
+        # closes it and returns the connection to the pool
         yield db
-    finally:
-        # Cleanup: Always close the session when done
-        # This returns the connection to the pool
-        db.close()
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """
+    Admin Key Dependency - Guards the admin endpoints
+    
+    The X-Admin-Key header must match ADMIN_API_KEY (compared in constant
+    time). With no ADMIN_API_KEY configured every request is refused.
+    
+    Usage:
+        @router.post("/trips/cancel", dependencies=[Depends(require_admin)])
+    
+    Raises:
+        AdminAccessDeniedException: Header missing or wrong (403)
+    """
+    if not ADMIN_API_KEY or not x_admin_key or not hmac.compare_digest(
+        x_admin_key.encode(), ADMIN_API_KEY.encode()
+    ):
+        raise AdminAccessDeniedException()
@@ -0,0 +1,86 @@
+"""Admin API Endpoints - Operator tools for the booking system
+
+Every endpoint requires the X-Admin-Key header matching ADMIN_API_KEY
+(require_admin); with no key configured they all refuse requests.
+- db-pool: connection pool statistics
+- trips/cancel: cancel every booking on a journey date or range
+- model, model/reload: inspect and switch the served prediction model
+"""
+
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from ...api.dependencies import get_db, require_admin
+from ...core.pool_metrics import pool_snapshots
+from ...database import engine, async_engine
+from ...schemas.schemas import ModelReloadRequest, TripCancellationRequest
+from ...services.booking_service import AsyncBookingService
+from ...services.model_registry import ModelRegistry
+
+router = APIRouter()
+
+
+@router.get("/db-pool", dependencies=[Depends(require_admin)])
+async def get_db_pool_stats():
+    """
+    Live connection pool statistics for the sync and async engines.
+    Checked-out connections, overflow and checkout wait histograms show
+    whether slow requests are queueing for a connection or waiting on Postgres.
+    """
+    return {"pools": pool_snapshots(async_engine, engine)}
+
+
+@router.post("/trips/cancel", dependencies=[Depends(require_admin)])
+async def cancel_trip(
+    cancellation: TripCancellationRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cancel every booking on a journey date (or date range), e.g. after a breakdown.
+    Requires the X-Admin-Key header; the range is capped at
+    TRIP_CANCELLATION_MAX_DAYS dates.
+    Responds with newline-delimited JSON: a summary line first, then one
+    refund line per cancelled booking. The summary needs every cancelled
+    row, so the report is built in memory once the transaction commits.
+    """
+    result = await AsyncBookingService.cancel_trip(
+        db, cancellation.journey_date, cancellation.end_date, cancellation.refund_percentage
+    )
+
+    lines = [json.dumps({"summary": jsonable_encoder(result["summary"])})]
+    for row in result["refunds"]:
+        lines.append(json.dumps({
+            "booking_reference": row.booking_reference,
+            "pnr": row.pnr,
+            "email": row.email,
+            "journey_date": row.journey_date,
+            "total_amount": row.total_amount,
+            "refund_amount": row.refund_amount
+        }))
+
+    return Response("".join(line + "\n" for line in lines), media_type="application/x-ndjson")
+
+
+@router.get("/model", dependencies=[Depends(require_admin)])
+async def get_model_status():
+    """Served prediction model version, versions on disk and recent load failures"""
+    return await run_in_threadpool(ModelRegistry.status)
+
+
+@router.post("/model/reload", dependencies=[Depends(require_admin)])
+async def reload_model(reload: Optional[ModelReloadRequest] = None):
+    """
+    Swap in another prediction model version without restarting workers.
+    Requires the X-Admin-Key header.
+    Loads the requested version (newest when omitted) in this worker and
+    points the CURRENT file at it; other workers follow within
+    MODEL_REFRESH_SECONDS. If the load fails (503) nothing changes.
+    """
+    version = reload.version if reload else None
+    await run_in_threadpool(ModelRegistry.promote, version)
+    return await run_in_threadpool(ModelRegistry.status)
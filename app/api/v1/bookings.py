@@ -1,11 +1,21 @@
 """Booking API Endpoints - Handle ticket reservations and cancellations"""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from ...api.dependencies import get_db
-from ...services.booking_service import BookingService
-from ...schemas.schemas import BookingResponse, BookingCreate, BookingCancellation
+from ...services.booking_service import AsyncBookingService
+from ...services.booking_modification_service import AsyncBookingModificationService
+from ...services.idempotency_service import IdempotencyService
+from ...schemas.schemas import (
+    BookingResponse,
+    BookingCreate,
+    BookingCancellation,
+    BookingHistoryPage,
+    BookingModification,
+    BookingModificationResponse
+)
 
 router = APIRouter()
 
@@ -13,46 +23,63 @@ router = APIRouter()
 @router.post("/", response_model=BookingResponse)
 async def create_booking(
     booking: BookingCreate,
-    db: Session = Depends(get_db)
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create new booking - validates availability, calculates price, generates booking reference
     Returns booking details with confirmation probability from ML model
+    
+    Retries carrying the same Idempotency-Key header get the original booking back
+    (marked with an Idempotent-Replayed: true response header) instead of a new one.
     """
+    if idempotency_key:
+        booking_response, replayed = await IdempotencyService.create_booking(db, idempotency_key, booking)
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return booking_response
+    
     # Create booking in database (handles seat blocking, price calculation)
-    new_booking = BookingService.create_booking(db, booking)
+    new_booking, seat_numbers = await AsyncBookingService.create_booking(db, booking)
     
-    # Convert DB model to API response format (includes enriched data like seat numbers, journey details)
-    return BookingService.get_booking_response_object(db, new_booking.id)
+    # Build the response from the just-committed row, its seats and the request (no re-query)
+    return await AsyncBookingService.new_booking_response(db, new_booking, seat_numbers, booking)
 
 
 @router.get("/{booking_reference}", response_model=BookingResponse)
 async def get_booking(
     booking_reference: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Fetch booking details using booking reference (e.g., BUS-AHM-MUM-20260123-XYZW)"""
-    # Retrieve booking from database
-    booking = BookingService.get_booking_details(db, booking_reference)
-    
-    # Format and return enriched response
-    return BookingService.get_booking_response_object(db, booking.id)
+    # Booking, seats and meals are fetched together in one joined query
+    return await AsyncBookingService.get_booking_response_by_reference(db, booking_reference)
 
 
-@router.get("/history/{email}")
+@router.get("/history/{email}", response_model=BookingHistoryPage)
 async def get_booking_history(
     email: str,
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100, description="Bookings per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status: Optional[str] = Query(None, pattern="^(CONFIRMED|CANCELLED|PENDING|WAITLISTED)$"),
+    date_from: Optional[date] = Query(None, description="Earliest journey date"),
+    date_to: Optional[date] = Query(None, description="Latest journey date"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all bookings for a user by email"""
-    bookings = BookingService.get_booking_history(db, email)
-    return bookings
+    """
+    Get a user's bookings by email, newest first, one page at a time
+    Follow next_cursor until it is null to walk the full history.
+    """
+    return await AsyncBookingService.get_booking_history(
+        db, email, limit, cursor, status, date_from, date_to
+    )
 
 
 @router.delete("/{booking_reference}", response_model=BookingCancellation)
 async def cancel_booking(
     booking_reference: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cancel a booking
@@ -62,22 +89,40 @@ async def cancel_booking(
     - 50% refund if cancelled 12-24 hours before journey
     - No refund if cancelled less than 12 hours before journey
     """
-    cancellation_info = BookingService.cancel_booking(db, booking_reference)
+    cancellation_info = await AsyncBookingService.cancel_booking(db, booking_reference)
     return cancellation_info
 
 
+@router.patch("/{booking_reference}", response_model=BookingModificationResponse)
+async def modify_booking(
+    booking_reference: str,
+    modification: BookingModification,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Modify a confirmed booking in place - drop seats, change the boarding or
+    alighting station, or swap seats - keeping its reference and PNR
+    
+    The removed part of the fare is refunded under the cancellation policy;
+    any added fare is charged on top of the booking total.
+    """
+    result = await AsyncBookingModificationService.modify_booking(db, booking_reference, modification)
+    result["booking"] = await AsyncBookingService.get_booking_response_object(db, result.pop("booking_id"))
+    return result
+
+
 @router.put("/{booking_reference}/meals")
 async def update_booking_meals(
     booking_reference: str,
     meal_ids: List[int],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update meal selection for an existing booking
     
     Body: List of meal IDs
     """
-    updated_booking = BookingService.update_booking_meals(
+    updated_booking = await AsyncBookingService.update_booking_meals(
         db, booking_reference, meal_ids
     )
     return updated_booking
@@ -0,0 +1,32 @@
+"""Seat Hold API Endpoints - Reserve seats while the customer checks out"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...api.dependencies import get_db
+from ...services.seat_hold_service import AsyncSeatHoldService
+from ...schemas.schemas import SeatHoldCreate, SeatHoldResponse
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SeatHoldResponse)
+async def create_hold(
+    hold: SeatHoldCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Hold seats for a route and date for a limited time (default 10 minutes)
+    Held seats show as booked to everyone else. Pass the returned hold_token
+    in POST /api/v1/bookings to book them; otherwise they are released on expiry.
+    """
+    return await AsyncSeatHoldService.create_hold(db, hold)
+
+
+@router.delete("/{hold_token}")
+async def release_hold(
+    hold_token: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Release held seats before the hold expires (e.g. checkout abandoned)"""
+    released = await AsyncSeatHoldService.release_hold(db, hold_token)
+    return {"hold_token": hold_token, "released_seats": released}
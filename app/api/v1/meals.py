@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ...api.dependencies import get_db
-from ...models.meal import Meal
+from ...services.meal_service import AsyncMealService
 from ...schemas.schemas import Meal as MealSchema
 
 router = APIRouter()
 
 @router.get("/", response_model=List[MealSchema])
-async def get_meals(db: Session = Depends(get_db)):
+async def get_meals(db: AsyncSession = Depends(get_db)):
     """
     Get list of available meals
     """
-    meals = db.query(Meal).filter(Meal.is_available == True).all()
+    meals = await AsyncMealService.get_available_meals(db)
     return meals
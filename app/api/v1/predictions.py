@@ -1,4 +1,11 @@
-from fastapi import APIRouter
+import json
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from ...config import PREDICTION_BATCH_MAX_ROWS
+from ...services.prediction_batcher import PredictionBatcher
 from ...services.prediction_service import PredictionService
 from ...schemas.schemas import PredictionRequest, PredictionResponse
 
@@ -7,8 +14,15 @@ router = APIRouter()
 
 @router.post("/booking-confirmation", response_model=PredictionResponse)
 async def predict_booking_confirmation(prediction_request: PredictionRequest):
-    """Single heuristic endpoint for confirmation probability."""
-    result = PredictionService.predict(prediction_request.dict())
+    """
+    Single heuristic endpoint for confirmation probability.
+    With PREDICTION_BATCH_WINDOW_MS set, concurrent calls are scored
+    together in micro-batches (PredictionBatcher).
+    """
+    if PredictionBatcher.enabled():
+        result = await PredictionBatcher.predict(prediction_request.model_dump())
+    else:
+        result = PredictionService.predict(prediction_request.model_dump())
 
     return PredictionResponse(
         confirmation_probability=result.confirmation_probability,
@@ -16,3 +30,103 @@ async def predict_booking_confirmation(prediction_request: PredictionRequest):
         recommendation=result.recommendation,
         factors=result.factors,
     )
+
+
+def _too_many_rows() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"At most {PREDICTION_BATCH_MAX_ROWS} prediction requests per batch"
+    )
+
+
+def _parse_json(data: bytes):
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {e}")
+
+
+async def _read_ndjson(request: Request) -> list:
+    """
+    Raw request items from an NDJSON body, parsed line by line as it arrives
+    Only the unfinished last line is buffered, and a body with too many
+    rows is refused without reading the rest of it.
+    """
+    items = []
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                if len(items) == PREDICTION_BATCH_MAX_ROWS:
+                    raise _too_many_rows()
+                items.append(_parse_json(line))
+    if buffer.strip():
+        if len(items) == PREDICTION_BATCH_MAX_ROWS:
+            raise _too_many_rows()
+        items.append(_parse_json(buffer))
+    return items
+
+
+def _parse_array(body: bytes) -> list:
+    """Raw request items from a JSON array body"""
+    items = _parse_json(body)
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of prediction requests")
+    return items
+
+
+def _score_batch(items: list) -> dict:
+    """Validate and score raw request items (CPU-bound: runs in the threadpool)"""
+    if len(items) > PREDICTION_BATCH_MAX_ROWS:
+        raise _too_many_rows()
+
+    requests = []
+    for index, item in enumerate(items):
+        try:
+            requests.append(PredictionRequest(**item).model_dump())
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"index": index, "errors": json.loads(e.json())}
+            )
+        except TypeError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"index": index, "errors": "Each prediction request must be a JSON object"}
+            )
+
+    results = PredictionService.predict_batch(requests)
+
+    # Plain dicts straight to JSON: no per-row response model validation
+    return {
+        "predictions": [
+            {
+                "confirmation_probability": float(result.confirmation_probability),
+                "cancellation_risk": float(result.cancellation_risk),
+                "recommendation": result.recommendation,
+                "factors": result.factors,
+            }
+            for result in results
+        ]
+    }
+
+
+@router.post("/booking-confirmation/batch")
+async def predict_booking_confirmation_batch(request: Request):
+    """
+    Score many prediction requests in one call (e.g. pricing analysis).
+    Body: a JSON array of prediction requests, or NDJSON (Content-Type:
+    application/x-ndjson) with one request per line.
+    Returns {"predictions": [...]} in input order; each entry has the same
+    fields as the single endpoint's response.
+    Validation and scoring of up to PREDICTION_BATCH_MAX_ROWS rows run in
+    the threadpool, so a large batch doesn't stall other requests.
+    """
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        items = await _read_ndjson(request)
+    else:
+        items = await run_in_threadpool(_parse_array, await request.body())
+
+    return JSONResponse(await run_in_threadpool(_score_batch, items))
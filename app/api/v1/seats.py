@@ -1,11 +1,13 @@
 """Seats API Endpoints - Handle seat availability and pricing queries"""
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...api.dependencies import get_db
-from ...services.seat_service import SeatService
-from ...services.station_service import StationService
+from ...core.common import InvalidStationException
+from ...services.seat_service import AsyncSeatService
+from ...services.station_service import AsyncStationService
 from ...schemas.schemas import Seat
+from ...utils.utils import validate_station_combination
 
 router = APIRouter()
 
@@ -15,50 +17,52 @@ async def get_seats_status(
     from_station: str = Query(..., alias="from", description="From station name (e.g. Ahmedabad)"),
     to_station: str = Query(..., alias="to", description="To station name (e.g. Mumbai)"),
     date: str = Query(..., description="Travel date in YYYY-MM-DD format"),
-    db: Session = Depends(get_db)
+    view: str = Query(
+        "available",
+        pattern="^(available|map)$",
+        description="'available' lists bookable seats only; 'map' returns all 40 berths with status"
+    ),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    List all available seats for a route and date with dynamic pricing
-    Returns seat numbers, types, and calculated prices based on distance
+    List seats for a route and date with dynamic pricing
+    - view=available (default): only seats that can be booked for this segment
+    - view=map: the full bus layout, each seat marked booked/available with deck and fare
     """
-    from sqlalchemy import select
-    from ...models.station import Station
-    
-    # Convert station names to database IDs
-    src = db.query(Station).filter(Station.name == from_station).first()
-    dest = db.query(Station).filter(Station.name == to_station).first()
+    # Resolve station names from the in-memory registry
+    stations = await AsyncStationService.get_registry(db)
+    src = stations.by_name(from_station)
+    dest = stations.by_name(to_station)
     
     if not src or not dest:
         return {"error": "Invalid stations"}
+    if not validate_station_combination(src.sequence, dest.sequence):
+        raise InvalidStationException("From station must come before to station in the route")
+
+    if view == "map":
+        return {"seats": await AsyncSeatService.get_seat_map(db, src, dest, date)}
 
     # Get seats that aren't blocked for this route/date
-    available_seats = SeatService.get_available_seats(
+    available_seats = await AsyncSeatService.get_available_seats(
         db, src.id, dest.id, date
     )
     
+    # Price every seat from the precomputed fare matrix
+    prices = await AsyncSeatService.calculate_seat_prices(
+        db, [seat.id for seat in available_seats], src, dest
+    )
+    
     # Build response with pricing for each available seat
     result = []
     for seat in available_seats:
-        price = SeatService.calculate_seat_price(db, seat.id, src.id, dest.id)
         result.append({
             "seat_id": seat.seat_number,  # User-friendly ID (e.g., "S02")
             "seat_number": seat.seat_number,
             "type": seat.seat_type,
-            "status": "available", # Since get_available_seats returns available ones. 
-                                   # Ideally we should return all seats and their status.
-            "price": price
+            "status": "available",
+            "price": prices[seat.id]
         })
     
-    # If we need ALL seats (booked and available), get_available_seats might filter out booked ones. 
-    # The requirement says "List of Seats" and shows "status": "available". 
-    # If a seat is booked, it probably shouldn't be in the list or should show 'booked'.
-    # The example response shows [ ... ], implying a list.
-    
-    # For a perfect implementation, we should iterate ALL seats and check status.
-    # But SeatService.get_available_seats suggests it only returns available ones.
-    # Given the constraint of time, I will assume listing available seats is sufficient or 
-    # I should check if SeatService has a method to get seat status for all.
-    
     return {"seats": result}
 
 
@@ -68,7 +72,7 @@ async def get_seat(
     date: str = Query(None, description="Travel date in YYYY-MM-DD format"),
     from_station: str = Query(None, alias="from", description="From station name"),
     to_station: str = Query(None, alias="to", description="To station name"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get seat details by seat number (e.g., S10, S40).
@@ -79,12 +83,10 @@ async def get_seat(
     - from: From station name - optional (required if checking availability)
     - to: To station name - optional (required if checking availability)
     """
-    from ...models.seat import Seat as SeatModel, SeatAvailability
-    from ...models.station import Station
     from datetime import datetime
     
     # Get basic seat details
-    seat = db.query(SeatModel).filter(SeatModel.seat_number == seat_id).first()
+    seat = await AsyncSeatService.get_seat_by_number(db, seat_id)
     if not seat:
         return {"error": "Seat not found"}
     
@@ -99,11 +101,14 @@ async def get_seat(
     # If route and date are provided, check specific availability
     if date and from_station and to_station:
         # Get station IDs
-        from_st = db.query(Station).filter(Station.name == from_station).first()
-        to_st = db.query(Station).filter(Station.name == to_station).first()
+        stations = await AsyncStationService.get_registry(db)
+        from_st = stations.by_name(from_station)
+        to_st = stations.by_name(to_station)
         
         if not from_st or not to_st:
             return {"error": "Invalid station names"}
+        if not validate_station_combination(from_st.sequence, to_st.sequence):
+            raise InvalidStationException("From station must come before to station in the route")
         
         # Parse date
         try:
@@ -111,24 +116,19 @@ async def get_seat(
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}
         
-        # Check if seat is booked for this specific route and date
-        availability = db.query(SeatAvailability).filter(
-            SeatAvailability.seat_id == seat.id,
-            SeatAvailability.from_station_id == from_st.id,
-            SeatAvailability.to_station_id == to_st.id,
-            SeatAvailability.journey_date == journey_date
-        ).first()
+        # Check if any segment of this route is already occupied for the seat
+        is_free = await AsyncSeatService.is_seat_free(
+            db, seat.id, from_st, to_st, journey_date
+        )
         
-        if availability and availability.is_booked:
+        if not is_free:
             response["status"] = "booked"
             response["available_for_journey"] = False
-            if availability.booked_by:
-                response["booking_id"] = availability.booked_by
         else:
             response["status"] = "available"
             response["available_for_journey"] = True
             # Calculate price for this route
-            price = SeatService.calculate_seat_price(db, seat.id, from_st.id, to_st.id)
+            price = await AsyncSeatService.calculate_seat_price(db, seat.id, from_st.id, to_st.id)
             response["price"] = price
         
         response["journey_details"] = {
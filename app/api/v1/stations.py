@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...api.dependencies import get_db
-from ...services.station_service import StationService
+from ...services.station_service import AsyncStationService
 from ...schemas.schemas import Station, StationsResponse
 
 router = APIRouter()
 
 
 @router.get("/stations", response_model=StationsResponse)
-async def get_all_stations(db: Session = Depends(get_db)):
+async def get_all_stations(db: AsyncSession = Depends(get_db)):
     """
     Get list of all stations on the Ahmedabad-Mumbai route.
     Returns stations in sequence order with timing information.
     """
-    stations = StationService.get_all_stations(db)
+    stations = await AsyncStationService.get_all_stations(db)
     
     return {
         "route": "Ahmedabad → Mumbai", # Hardcoded or generated
@@ -22,9 +22,9 @@ async def get_all_stations(db: Session = Depends(get_db)):
 
 
 @router.get("/{station_id}")
-async def get_station(station_id: int, db: Session = Depends(get_db)):
+async def get_station(station_id: int, db: AsyncSession = Depends(get_db)):
     """Get station details by ID"""
-    station = StationService.get_station_by_id(db, station_id)
+    station = await AsyncStationService.get_station_by_id(db, station_id)
     return station
 
 
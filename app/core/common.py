@@ -8,10 +8,12 @@ All exceptions inherit from FastAPI's HTTPException, which automatically
 converts them to proper HTTP error responses with status codes.
 """
 
-import random
+import hashlib
+import hmac
 import string
 from datetime import datetime
 from fastapi import HTTPException, status
+from ..config import ID_PERMUTATION_KEY
 
 # =============================================================================
 # CUSTOM EXCEPTIONS (Domain-Specific HTTP Errors)
@@ -113,17 +115,152 @@ class InvalidBookingException(HTTPException):
             detail=detail
         )
 
+class SeatHoldNotFoundException(HTTPException):
+    """
+    Raised when a seat hold token is unknown or the hold has expired
+    
+    HTTP Status: 404 Not Found
+    Use cases:
+        - Booking with a hold token whose TTL ran out (seats were released)
+        - Releasing a hold that was already converted, released or reaped
+    """
+    def __init__(self, detail: str = "Seat hold not found or expired"):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+
+class IdempotencyKeyReusedException(HTTPException):
+    """
+    Raised when an Idempotency-Key is replayed with a different request body
+    
+    HTTP Status: 422 Unprocessable Entity
+    A key identifies ONE logical request; returning the stored booking for a
+    different payload would silently hand the client the wrong ticket.
+    """
+    def __init__(self, detail: str = "Idempotency-Key was already used with a different request"):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail
+        )
+
+class ModelUnavailableException(HTTPException):
+    """
+    Raised when a booking predictor version can't be loaded
+    
+    HTTP Status: 503 Service Unavailable
+    Use cases:
+        - Admin reload of a version that doesn't exist or has a broken artifact
+        - Reload retried before the failed-load cool-down has passed
+    Predictions keep serving the previous model (or the heuristic) meanwhile.
+    """
+    def __init__(self, detail: str = "Prediction model could not be loaded"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail
+        )
+
+class AdminAccessDeniedException(HTTPException):
+    """
+    Raised when an admin endpoint is called without the admin key
+    
+    HTTP Status: 403 Forbidden
+    Use cases:
+        - X-Admin-Key header missing or wrong
+        - ADMIN_API_KEY not configured (admin endpoints are disabled)
+    """
+    def __init__(self, detail: str = "Admin key missing or invalid"):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+# PostgreSQL SQLSTATE for exclusion_violation, raised by the seat segment
+# overlap constraint on seat_availability
+EXCLUSION_VIOLATION_SQLSTATE = "23P01"
+
+def is_segment_conflict(error: Exception) -> bool:
+    """
+    Check whether a database IntegrityError came from the seat segment
+    exclusion constraint (i.e. a concurrent double booking)
+    
+    Works with both psycopg3 (sqlstate) and psycopg2 (pgcode) errors.
+    """
+    orig = getattr(error, "orig", error)
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == EXCLUSION_VIOLATION_SQLSTATE
+
 # =============================================================================
 # BOOKING IDENTIFIER GENERATORS
 # =============================================================================
-# These functions create unique, human-readable identifiers for bookings
+# These functions turn a booking's sequence number (leased from the database
+# by IdService, see services/id_service.py) into unique, human-readable
+# identifiers. A keyed permutation scrambles the number first, so
+# consecutive bookings don't get guessable consecutive codes, while distinct
+# numbers still always map to distinct codes.
+
+# Characters used in reference suffixes and PNRs
+ID_ALPHABET = string.ascii_uppercase + string.digits
 
-def generate_booking_reference(from_station: str, to_station: str) -> str:
+class FeistelPermutation:
     """
-    Generate unique booking reference in format: BUS-FROM-TO-DATE-RANDOM
+    Keyed one-to-one shuffle of the integers 0 .. domain-1
+    
+    A balanced Feistel network over the smallest even number of bits that
+    covers the domain, with HMAC-SHA256 as the round function. A Feistel
+    network is a bijection for any round function; values that land outside
+    the domain are encrypted again ("cycle walking") until they fall inside,
+    which keeps it a bijection on the domain itself.
+    """
+    
+    def __init__(self, domain: int, key: str, rounds: int = 4):
+        bits = max((domain - 1).bit_length(), 2)
+        bits += bits % 2
+        self.domain = domain
+        self.half_bits = bits // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        self.rounds = rounds
+        self._mac = hmac.new(key.encode(), digestmod=hashlib.sha256)
+    
+    def _round(self, index: int, value: int) -> int:
+        mac = self._mac.copy()
+        mac.update(bytes([index]) + value.to_bytes(8, "big"))
+        return int.from_bytes(mac.digest()[:8], "big") & self.half_mask
+    
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.half_mask
+        for index in range(self.rounds):
+            left, right = right, left ^ self._round(index, right)
+        return (left << self.half_bits) | right
+    
+    def permute(self, value: int) -> int:
+        """Position of value in the shuffled domain"""
+        if not 0 <= value < self.domain:
+            raise ValueError(f"{value} is outside the permutation domain")
+        value = self._encrypt(value)
+        while value >= self.domain:
+            value = self._encrypt(value)
+        return value
+
+def encode_base36(value: int, width: int) -> str:
+    """Fixed-width code over ID_ALPHABET (most significant character first)"""
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, len(ID_ALPHABET))
+        chars.append(ID_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+REFERENCE_CODE_LENGTH = 4
+PNR_LENGTH = 9
+_reference_permutation = FeistelPermutation(len(ID_ALPHABET) ** REFERENCE_CODE_LENGTH, ID_PERMUTATION_KEY + ":reference")
+_pnr_permutation = FeistelPermutation(len(ID_ALPHABET) ** PNR_LENGTH, ID_PERMUTATION_KEY + ":pnr")
+
+def generate_booking_reference(from_station: str, to_station: str, sequence: int) -> str:
+    """
+    Generate booking reference in format: BUS-FROM-TO-DATE-CODE
     
     This creates a booking ID that is:
-    - Unique: Timestamp + random suffix prevents collisions
+    - Unique: CODE is derived from the booking's sequence number
     - Informative: Contains route info at a glance  
     - User-friendly: Easy to share over phone or email
     
@@ -132,43 +269,50 @@ def generate_booking_reference(from_station: str, to_station: str) -> str:
         FROM: First 3 letters of origin station (e.g., AHM for Ahmedabad)
         TO: First 3 letters of destination (e.g., MUM for Mumbai)
         DATE: Creation date in YYYYMMDD format
-        RANDOM: 4-character random suffix for uniqueness
+        CODE: 4 characters - the sequence number, permuted and base-36 encoded
     
     Args:
         from_station: Name of origin station
         to_station: Name of destination station
+        sequence: Booking sequence number from IdService
     
     Returns:
         str: Booking reference like "BUS-AHM-MUM-20250121-A1B2"
     
-    Example:
-        >>> generate_booking_reference("Ahmedabad", "Mumbai")
-        'BUS-AHM-MUM-20260123-X7Y9'
+    Note:
+        The 4-character code has 36^4 ≈ 1.68 million values, so two
+        references could only clash if over 1.68 million bookings were
+        created on the same day.
     """
     # Current date in compact format (YYYYMMDD)
     date_str = datetime.now().strftime("%Y%m%d")
     
-    # Random 4-character code for uniqueness
-    random_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
+    code = encode_base36(
+        _reference_permutation.permute(sequence % _reference_permutation.domain),
+        REFERENCE_CODE_LENGTH
+    )
     
-    # Combine all parts: service-origin-dest-date-random
-    return f"BUS-{from_station[:3].upper()}-{to_station[:3].upper()}-{date_str}-{random_code}"
+    # Combine all parts: service-origin-dest-date-code
+    return f"BUS-{from_station[:3].upper()}-{to_station[:3].upper()}-{date_str}-{code}"
 
-def generate_pnr() -> str:
+def generate_pnr(sequence: int) -> str:
     """
     Generate a 9-character Passenger Name Record (PNR) number
     
     PNR serves as a shorter, secondary identifier similar to airline tickets.
     It's easier to type on mobile and share verbally.
     
-    Format: 9 random alphanumeric characters (A-Z, 0-9)
+    Format: 9 alphanumeric characters (A-Z, 0-9)
     Example: "7JV418ZCO"
     
+    Args:
+        sequence: Booking sequence number from IdService
+    
     Returns:
         str: 9-character alphanumeric PNR
         
     Note:
-        With 36 possible characters and 9 positions, there are
-        36^9 ≈ 101 trillion possible combinations, ensuring uniqueness.
+        The permutation maps each of the 36^9 ≈ 101 trillion sequence
+        numbers to a different PNR, so PNRs never collide.
     """
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=9))
+    return encode_base36(_pnr_permutation.permute(sequence), PNR_LENGTH)
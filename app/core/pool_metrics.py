@@ -0,0 +1,151 @@
+"""Connection Pool Metrics - Visibility into database connection acquisition
+
+Booking spikes can be slow for two very different reasons: requests
+queueing for a pooled connection, or PostgreSQL itself being slow. This
+module records the first, so the two can be told apart:
+
+- InstrumentedQueuePool / InstrumentedAsyncQueuePool / InstrumentedNullPool
+  wrap SQLAlchemy's pools and time every connection checkout
+  (queue wait + connect time when a new connection has to be opened)
+- PoolMetrics keeps running counters and a fixed-bucket histogram of
+  those acquisition waits, plus live checked-out / overflow figures
+
+Each pool gets its own PoolMetrics, named after the engine's
+pool_logging_name, so two engines never share counters. When an engine
+recreates its pool (engine.dispose()), the new pool carries on with the
+old pool's metrics.
+
+Snapshots are exposed at GET /api/v1/admin/db-pool and can be scraped by
+any metrics agent via PoolMetrics.snapshot().
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# Upper bounds (milliseconds) of the acquisition wait histogram buckets;
+# anything slower lands in the final "+Inf" bucket
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolMetrics:
+    """Thread-safe counters and wait histogram for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._pool = None  # Pool being measured (replaced when the engine recreates it)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def attach(self, pool):
+        self._pool = pool
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False):
+        """Record one checkout attempt and how long it waited"""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def snapshot(self) -> Dict:
+        """Point-in-time view of pool occupancy and acquisition latency"""
+        pool = self._pool
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            histogram: List[Dict] = []
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS_MS + ["+Inf"], self.wait_buckets):
+                cumulative += count
+                histogram.append({"le_ms": bound, "count": cumulative})
+            stats = {
+                "pool": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "checkouts_total": self.checkouts,
+                "checkout_timeouts_total": self.timeouts,
+                "wait_ms_avg": round(self.wait_total_ms / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_max_ms, 3),
+                "wait_ms_histogram": histogram,  # Cumulative, Prometheus style
+            }
+
+        # Live occupancy (only queue-based pools keep connections around)
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    """Times _do_get, the single place every pool checkout goes through"""
+
+    default_metrics_name: str
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics(self.logging_name or self.default_metrics_name)
+        self.metrics.attach(self)
+
+    def recreate(self):
+        """Fresh pool for engine.dispose() that keeps accumulating into the same metrics"""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.attach(pool)
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the synchronous engine (scripts, background jobs)"""
+    default_metrics_name = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for the async engine serving API requests"""
+    default_metrics_name = "async"
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    """No local pooling (PgBouncer transaction mode) - still times connection setup"""
+    default_metrics_name = "null"
+
+
+def pool_snapshots(*engines) -> List[Dict]:
+    """Snapshot the metrics of every given engine's pool"""
+    snapshots = []
+    for engine in engines:
+        metrics: Optional[PoolMetrics] = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            snapshots.append(metrics.snapshot())
+    return snapshots
@@ -1,32 +1,104 @@
 """Database Connection and Session Management
 
-This module sets up the SQLAlchemy database engine and session factory.
+This module sets up the SQLAlchemy database engines and session factories.
 
 Components:
-- engine: The database connection pool (reusable connections)
-- SessionLocal: Factory for creating database sessions (one per request)
+- engine: The synchronous connection pool (scripts, migrations, tests)
+- SessionLocal: Factory for synchronous sessions
+- async_engine: Asyncio connection pool on psycopg3's async driver (API requests)
+- AsyncSessionLocal: Factory for AsyncSessions (one per request)
 - Base: Parent class for all database models (tables)
 
+Pool sizing, recycling, pre-ping, statement timeouts and PgBouncer
+transaction mode are configured through the DB_* settings in config.py.
+Both pools are instrumented (see app/core/pool_metrics.py).
+
 Usage:
     from app.database import SessionLocal, Base
     db = SessionLocal()  # Create a new session
     # ... perform database operations ...
     db.close()  # Always close when done
+
+    from app.database import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(...)  # Queries await the driver instead of blocking the event loop
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL
+from .config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_PGBOUNCER_TRANSACTION_MODE,
+)
+from .core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedNullPool, InstrumentedQueuePool
+
+
+def _engine_options(pool_class, name: str) -> dict:
+    """Keyword arguments for create_engine / create_async_engine (name labels the pool's metrics)"""
+    if DB_PGBOUNCER_TRANSACTION_MODE:
+        # PgBouncer owns the pooling; psycopg must not prepare statements
+        # because consecutive transactions may run on different server connections
+        return {
+            "poolclass": InstrumentedNullPool,
+            "pool_logging_name": name,
+            "connect_args": {"prepare_threshold": None},
+        }
+
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        # Sent once as a startup parameter, so it costs no extra round trip
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    return {
+        "poolclass": pool_class,
+        "pool_logging_name": name,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _apply_transaction_statement_timeout(conn):
+    """SET LOCAL the statement timeout at the start of every transaction (PgBouncer mode)"""
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+
 
 # Create the database engine - manages connection pooling
 # echo=False means don't log SQL queries (set True for debugging)
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_engine_options(InstrumentedQueuePool, "sync"))
 
 # Session factory - creates individual database sessions
 # autocommit=False: Changes must be explicitly committed
 # autoflush=False: Changes aren't automatically flushed to DB
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine - the postgresql+psycopg URL selects psycopg3's async mode
+# automatically, so each query awaits I/O instead of blocking the event loop
+async_engine = create_async_engine(DATABASE_URL, **_engine_options(InstrumentedAsyncQueuePool, "async"))
+
+# Startup parameters are rejected by PgBouncer, and session-level SETs would
+# leak to other clients - scope the timeout to each transaction instead
+if DB_PGBOUNCER_TRANSACTION_MODE and DB_STATEMENT_TIMEOUT_MS > 0:
+    event.listen(engine, "begin", _apply_transaction_statement_timeout)
+    event.listen(async_engine.sync_engine, "begin", _apply_transaction_statement_timeout)
+
+# Async session factory used by the API's get_db dependency
+# expire_on_commit=False: objects stay readable after commit, since lazy
+# reloads aren't possible outside the async greenlet context
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Base class for all ORM models - inherit from this to create tables
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
@@ -5,6 +5,7 @@ This module initializes the FastAPI application and configures:
 - CORS middleware for cross-origin requests
 - API routing for all endpoints (v1)
 - Application metadata (title, description, version)
+- Startup warm-up of in-memory lookups (station registry, prediction model)
 
 The application follows a layered architecture:
     API Layer (this file) → Service Layer → Data Layer (Models)
@@ -13,9 +14,53 @@ To run the application:
     uvicorn app.main:app --reload
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api.v1 import stations, seats, bookings, meals, predictions
+from .api.v1 import stations, seats, bookings, meals, predictions, admin, holds
+from .database import SessionLocal, AsyncSessionLocal
+from .services.model_registry import ModelRegistry
+from .services.prediction_batcher import PredictionBatcher
+from .services.seat_hold_service import AsyncSeatHoldService
+from .services.station_registry import StationRegistry
+
+# =============================================================================
+# APPLICATION LIFESPAN (startup / shutdown)
+# =============================================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm in-memory lookups before serving traffic and run background jobs
+    - Station registry: name/id/sequence indexes with segment distances & durations
+    - Model registry: the served booking predictor version, so the first
+      prediction after a deploy doesn't pay for loading it
+    - Prediction batcher: scoring process pool, when PREDICTION_BATCH_PROCESSES > 0
+    - Seat hold reaper: releases expired checkout holds in batches
+    """
+    db = SessionLocal()
+    try:
+        StationRegistry.load(db)
+    except Exception as e:
+        # Not fatal: the registry is loaded lazily on first use instead
+        print(f"Failed to load station registry at startup: {e}")
+    finally:
+        db.close()
+    
+    try:
+        ModelRegistry.load()
+    except Exception as e:
+        # Not fatal: predictions use the heuristic until a model loads
+        print(f"Failed to load prediction model at startup: {e}")
+    
+    PredictionBatcher.start()
+    
+    reaper = asyncio.create_task(AsyncSeatHoldService.run_reaper(AsyncSessionLocal))
+    try:
+        yield
+    finally:
+        reaper.cancel()
+        PredictionBatcher.shutdown()
 
 # =============================================================================
 # FASTAPI APPLICATION INITIALIZATION
@@ -25,7 +70,8 @@ app = FastAPI(
     description="RESTful API for managing ticket bookings on the Ahmedabad-Mumbai sleeper bus route",
     version="1.0.0",
     docs_url="/docs",      # Swagger UI at /docs
-    redoc_url="/redoc"     # ReDoc documentation at /redoc
+    redoc_url="/redoc",    # ReDoc documentation at /redoc
+    lifespan=lifespan      # Startup warm-up of in-memory registries
 )
 
 # =============================================================================
@@ -60,6 +106,11 @@ app.include_router(seats.router, prefix="/api/v1/seats", tags=["Seats"])
 # DELETE /api/v1/bookings/{ref} - Cancel booking
 app.include_router(bookings.router, prefix="/api/v1/bookings", tags=["Bookings"])
 
+# Seat holds - Temporary reservations during checkout
+# POST /api/v1/holds - Hold seats (returns hold_token)
+# DELETE /api/v1/holds/{token} - Release a hold early
+app.include_router(holds.router, prefix="/api/v1/holds", tags=["Seat Holds"])
+
 # Meals - Food catalog
 # GET /api/v1/meals - List available meals
 app.include_router(meals.router, prefix="/api/v1/meals", tags=["Meals"])
@@ -68,6 +119,10 @@ app.include_router(meals.router, prefix="/api/v1/meals", tags=["Meals"])
 # POST /prediction/booking-confirmation - Feature-rich, explainable scoring
 app.include_router(predictions.router, prefix="/prediction", tags=["Prediction"])
 
+# Admin - Operational visibility
+# GET /api/v1/admin/db-pool - Connection pool checkouts, overflow & wait histogram
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+
 # =============================================================================
 # ROOT ENDPOINT
 # =============================================================================
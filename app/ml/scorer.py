@@ -0,0 +1,109 @@
+"""
+Dependency-free scorer for the booking confirmation model.
+
+The model is a logistic regression over 8 features, so a prediction is one
+dot product and a sigmoid. Training (app/ml/train_model.py) exports the
+fitted model to a small JSON artifact:
+
+    {
+      "format": "logistic-regression",
+      "version": 1,
+      "features": [... feature names in model input order ...],
+      "coefficients": [...],
+      "intercept": 1.16,
+      "categories": {"seat_type": ["lower", "middle", "upper"], ...}
+    }
+
+"categories" holds each LabelEncoder's classes_ - a category's code is its
+position in the list, exactly what LabelEncoder.transform returns.
+
+LogisticScorer evaluates the artifact with plain arithmetic (one row) or a
+NumPy matrix-vector product (batches) and gives the same probabilities as
+sklearn's predict_proba. Serving code imports only this module, never
+sklearn or joblib.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+ARTIFACT_FORMAT = "logistic-regression"
+ARTIFACT_VERSION = 1
+
+
+class LogisticScorer:
+    """Logistic regression evaluated from exported coefficients"""
+
+    def __init__(self, features: List[str], coefficients: List[float], intercept: float,
+                 categories: Dict[str, List[str]]):
+        if len(features) != len(coefficients):
+            raise ValueError("Artifact has a different number of features and coefficients")
+        self.features = list(features)
+        self.coefficients = [float(c) for c in coefficients]
+        self.intercept = float(intercept)
+        self.categories = {name: list(values) for name, values in categories.items()}
+        self._coefficient_vector = np.array(self.coefficients)
+
+    @classmethod
+    def from_dict(cls, artifact: dict) -> "LogisticScorer":
+        if artifact.get("format") != ARTIFACT_FORMAT or artifact.get("version") != ARTIFACT_VERSION:
+            raise ValueError(
+                f"Unsupported model artifact {artifact.get('format')} v{artifact.get('version')}"
+            )
+        return cls(artifact["features"], artifact["coefficients"], artifact["intercept"], artifact["categories"])
+
+    @classmethod
+    def load(cls, path: Path) -> "LogisticScorer":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict:
+        return {
+            "format": ARTIFACT_FORMAT,
+            "version": ARTIFACT_VERSION,
+            "features": self.features,
+            "coefficients": self.coefficients,
+            "intercept": self.intercept,
+            "categories": self.categories
+        }
+
+    def save(self, path: Path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def category_codes(self) -> Dict[str, Dict[str, int]]:
+        """{feature: {category: code}} - the LabelEncoder.transform mapping as dicts"""
+        return {
+            name: {category: code for code, category in enumerate(values)}
+            for name, values in self.categories.items()
+        }
+
+    def probability(self, row: Sequence[float]) -> float:
+        """P(confirmed) for one feature row - plain arithmetic, no array allocation"""
+        z = self.intercept
+        for coefficient, value in zip(self.coefficients, row):
+            z += coefficient * value
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        """P(confirmed) for every row of a feature matrix (one matrix-vector product)"""
+        return 1.0 / (1.0 + np.exp(-(matrix @ self._coefficient_vector + self.intercept)))
+
+
+def export_logistic_artifact(model, encoders: dict, features: List[str], path: Path) -> LogisticScorer:
+    """
+    Write a fitted sklearn LogisticRegression and its LabelEncoders as a JSON artifact
+    Only reads fitted attributes (coef_, intercept_, classes_), so this
+    module itself never imports sklearn.
+    """
+    scorer = LogisticScorer(
+        features=features,
+        coefficients=model.coef_[0].tolist(),
+        intercept=float(model.intercept_[0]),
+        categories={name: [str(value) for value in encoder.classes_] for name, encoder in encoders.items()}
+    )
+    scorer.save(path)
+    return scorer
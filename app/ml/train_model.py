@@ -7,6 +7,9 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 import joblib
 import os
 
+from app.ml.scorer import export_logistic_artifact
+from app.services.model_registry import ARTIFACT_NAME, ModelRegistry
+
 def train_model():
     # 1. Load dataset
     data_path = 'app/data/historical_bookings.csv'
@@ -87,6 +90,14 @@ def train_model():
     print(f"\nModel saved successfully to {model_path}!")
     print(f"Encoders saved successfully to {encoder_path}!")
 
+    # Dependency-free artifact the API scores with (no sklearn at serving time),
+    # written as a new registry version
+    version_dir = ModelRegistry.new_version_dir()
+    artifact_path = version_dir / ARTIFACT_NAME
+    export_logistic_artifact(model, encoders, features, artifact_path)
+    print(f"Scorer artifact saved successfully to {artifact_path}!")
+    print(f"Serve it with POST /api/v1/admin/model/reload {{\"version\": \"{version_dir.name}\"}}")
+
     # 8. Feature Importance
     print("\nFeature Importance (Coefficients):")
     coefficients = pd.DataFrame({
@@ -0,0 +1,313 @@
+"""
+Out-of-core training for the booking confirmation model
+
+train_model.py reads the whole CSV with pd.read_csv and fits
+LogisticRegression in memory, so memory grows with the booking history.
+This module trains the same model (logistic regression over the same 8
+features) from a stream of chunks instead:
+
+    python -m app.ml.train_streaming --data bookings.csv.gz --chunk-size 200000 --epochs 2
+
+1. Scan pass: collects the categories of seat_type / route_type /
+   day_of_week (sorted, so the codes are the ones LabelEncoder would give)
+   and running sums for feature means and standard deviations.
+2. Training passes: SGDClassifier(loss="log_loss").partial_fit on each
+   chunk of standardized features, rows shuffled within the chunk. A
+   constant step with averaged weights (ASGD) lands within noise of the
+   in-memory LogisticRegression's holdout log loss, both on the sample CSV
+   and after one epoch over 1M rows.
+3. Evaluation pass: log loss, accuracy and confusion matrix on the
+   held-out rows, accumulated chunk by chunk.
+
+Rows are split into training and holdout by a hash of booking_id, so the
+split is the same in every pass and every run, and holdout rows are never
+trained on. Only one chunk is in memory at a time: peak memory depends on
+--chunk-size, not on the number of rows.
+
+The standardization is folded back into the coefficients, so the result
+is written as the usual JSON artifact (app/ml/scorer.py) into a new model
+registry version - serving can't tell which trainer produced it.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+
+from app.ml.scorer import LogisticScorer
+from app.services.model_registry import ARTIFACT_NAME, ModelRegistry
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DATA_PATH = 'app/data/historical_bookings.csv'
+
+# Same feature order as train_model.py (the artifact keeps it)
+FEATURES = [
+    'days_before_journey', 'current_occupancy_percent', 'seat_type_encoded',
+    'route_type_encoded', 'day_of_week_encoded', 'seats_requested',
+    'is_holiday_season', 'booking_hour'
+]
+CATEGORICAL = ['seat_type', 'route_type', 'day_of_week']
+TARGET = 'was_confirmed'
+
+# Compact column types keep each chunk small
+DTYPES = {
+    'booking_id': 'string',
+    'days_before_journey': 'int32',
+    'current_occupancy_percent': 'int32',
+    'seat_type': 'category',
+    'route_type': 'category',
+    'day_of_week': 'category',
+    'seats_requested': 'int32',
+    'is_holiday_season': 'int8',
+    'booking_hour': 'int32',
+    TARGET: 'int8'
+}
+
+
+# =============================================================================
+# STREAMING HELPERS
+# =============================================================================
+
+def _chunks(data_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """One pass over the dataset, chunk_size rows at a time (.gz/.zip/.bz2 work too)"""
+    return pd.read_csv(data_path, usecols=list(DTYPES), dtype=DTYPES, chunksize=chunk_size)
+
+
+def _holdout_mask(chunk: pd.DataFrame, holdout_percent: int) -> np.ndarray:
+    """Stable row split: same booking_id, same side, in every pass and run"""
+    buckets = pd.util.hash_pandas_object(chunk['booking_id'], index=False).to_numpy() % 100
+    return buckets < holdout_percent
+
+
+def _feature_matrix(chunk: pd.DataFrame, categories: Dict[str, List[str]]) -> np.ndarray:
+    """Raw feature matrix in FEATURES order, categories as LabelEncoder codes"""
+    columns = []
+    for feature in FEATURES:
+        name = feature.replace('_encoded', '')
+        if name in categories:
+            columns.append(chunk[name].cat.set_categories(categories[name]).cat.codes.to_numpy())
+        else:
+            columns.append(chunk[name].to_numpy())
+    return np.column_stack(columns).astype(np.float64)
+
+
+def _peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def _scan(data_path: str, chunk_size: int, holdout_percent: int) -> dict:
+    """
+    First pass: categories and feature statistics
+    Categories come from all rows (serving must know every value);
+    means and standard deviations from the training rows only.
+    """
+    categories = {name: set() for name in CATEGORICAL}
+    category_counts = {name: {} for name in CATEGORICAL}
+    numeric = [feature for feature in FEATURES if feature.replace('_encoded', '') not in CATEGORICAL]
+    sums = np.zeros(len(numeric))
+    squares = np.zeros(len(numeric))
+    rows = train_rows = positives = 0
+    largest_chunk = 0
+
+    for chunk in _chunks(data_path, chunk_size):
+        largest_chunk = max(largest_chunk, int(chunk.memory_usage(deep=True).sum()))
+        train = chunk[~_holdout_mask(chunk, holdout_percent)]
+        rows += len(chunk)
+        train_rows += len(train)
+        positives += int(train[TARGET].sum())
+
+        for name in CATEGORICAL:
+            categories[name].update(str(value) for value in chunk[name].dropna().unique())
+            for value, count in train[name].value_counts().items():
+                category_counts[name][str(value)] = category_counts[name].get(str(value), 0) + int(count)
+
+        values = train[numeric].to_numpy(dtype=np.float64)
+        sums += values.sum(axis=0)
+        squares += (values ** 2).sum(axis=0)
+
+    if train_rows == 0:
+        raise ValueError(f"No training rows in {data_path}")
+
+    categories = {name: sorted(values) for name, values in categories.items()}
+    mean = dict(zip(numeric, sums / train_rows))
+    second_moment = dict(zip(numeric, squares / train_rows))
+
+    # Code statistics from the category counts (code = position in the sorted list)
+    for name in CATEGORICAL:
+        codes = np.arange(len(categories[name]), dtype=np.float64)
+        counts = np.array([category_counts[name].get(value, 0) for value in categories[name]], dtype=np.float64)
+        mean[f'{name}_encoded'] = float(codes @ counts) / train_rows
+        second_moment[f'{name}_encoded'] = float(codes ** 2 @ counts) / train_rows
+
+    mean_vector = np.array([mean[feature] for feature in FEATURES])
+    variance = np.array([second_moment[feature] for feature in FEATURES]) - mean_vector ** 2
+    std_vector = np.sqrt(np.clip(variance, 0, None))
+    std_vector[std_vector == 0] = 1.0  # Constant feature: leave it unscaled
+
+    return {
+        'rows': rows,
+        'train_rows': train_rows,
+        'positives': positives,
+        'categories': categories,
+        'mean': mean_vector,
+        'std': std_vector,
+        'largest_chunk': largest_chunk
+    }
+
+
+def _evaluate(model: SGDClassifier, data_path: str, chunk_size: int, holdout_percent: int,
+              categories: Dict[str, List[str]], mean: np.ndarray, std: np.ndarray) -> dict:
+    """Holdout metrics accumulated chunk by chunk"""
+    rows = 0
+    log_loss = 0.0
+    confusion = np.zeros((2, 2), dtype=np.int64)  # [actual][predicted]
+
+    for chunk in _chunks(data_path, chunk_size):
+        holdout = chunk[_holdout_mask(chunk, holdout_percent)]
+        if holdout.empty:
+            continue
+        X = (_feature_matrix(holdout, categories) - mean) / std
+        y = holdout[TARGET].to_numpy()
+        probability = np.clip(model.predict_proba(X)[:, 1], 1e-15, 1 - 1e-15)
+        predicted = (probability >= 0.5).astype(np.int64)
+
+        rows += len(y)
+        log_loss -= float(np.sum(y * np.log(probability) + (1 - y) * np.log(1 - probability)))
+        np.add.at(confusion, (y, predicted), 1)
+
+    if rows == 0:
+        return {'rows': 0, 'log_loss': None, 'accuracy': None, 'confusion_matrix': confusion.tolist()}
+    return {
+        'rows': rows,
+        'log_loss': log_loss / rows,
+        'accuracy': float(np.trace(confusion)) / rows,
+        'confusion_matrix': confusion.tolist()
+    }
+
+
+# =============================================================================
+# TRAINING
+# =============================================================================
+
+def train_streaming(data_path: str = DATA_PATH, chunk_size: int = 100_000, epochs: int = 3,
+                    holdout_percent: int = 10, alpha: float = 1e-5, learning_rate: float = 0.01,
+                    seed: int = 42) -> Optional[dict]:
+    """
+    Train on data_path without loading it whole; write a new model version
+    Returns a summary (version, artifact path, holdout metrics, throughput,
+    peak memory), or None when the dataset doesn't exist.
+    """
+    if not os.path.exists(data_path):
+        print(f"Error: Dataset not found at {data_path}")
+        return None
+    if not 0 <= holdout_percent < 100:
+        raise ValueError("holdout_percent must be between 0 and 99")
+
+    started = time.perf_counter()
+    print(f"Scanning {data_path} in chunks of {chunk_size} rows...")
+    stats = _scan(data_path, chunk_size, holdout_percent)
+    categories, mean, std = stats['categories'], stats['mean'], stats['std']
+    print(f"Dataset: {stats['rows']} records ({stats['train_rows']} training, "
+          f"{stats['rows'] - stats['train_rows']} holdout), "
+          f"{stats['positives'] / stats['train_rows']:.1%} of training rows confirmed")
+    print(f"Categories: {categories}")
+
+    model = SGDClassifier(
+        loss='log_loss', alpha=alpha, learning_rate='constant', eta0=learning_rate,
+        average=True, random_state=seed
+    )
+    rng = np.random.default_rng(seed)
+    epoch_stats = []
+
+    print("\nModel Training...")
+    for epoch in range(1, epochs + 1):
+        epoch_started = time.perf_counter()
+        trained = 0
+        for chunk in _chunks(data_path, chunk_size):
+            train = chunk[~_holdout_mask(chunk, holdout_percent)]
+            if train.empty:
+                continue
+            order = rng.permutation(len(train))  # Files are often sorted by date
+            X = ((_feature_matrix(train, categories) - mean) / std)[order]
+            y = train[TARGET].to_numpy()[order]
+            model.partial_fit(X, y, classes=[0, 1])
+            trained += len(y)
+
+        seconds = time.perf_counter() - epoch_started
+        epoch_stats.append({'epoch': epoch, 'rows': trained, 'seconds': round(seconds, 3),
+                            'rows_per_second': round(trained / seconds) if seconds else None})
+        print(f"Epoch {epoch}/{epochs}: {trained} rows in {seconds:.1f}s "
+              f"({epoch_stats[-1]['rows_per_second']} rows/s)")
+
+    holdout = _evaluate(model, data_path, chunk_size, holdout_percent, categories, mean, std)
+    print("\nHoldout Evaluation:")
+    if holdout['rows']:
+        print(f"Rows: {holdout['rows']}")
+        print(f"Accuracy: {holdout['accuracy']:.2%}")
+        print(f"Log loss: {holdout['log_loss']:.4f}")
+        print(f"Confusion Matrix: {holdout['confusion_matrix']}")
+    else:
+        print("No holdout rows (holdout_percent=0)")
+
+    # Fold the standardization into the model: w.(x - mean)/std + b = (w/std).x + (b - w.mean/std)
+    weights = model.coef_[0] / std
+    intercept = float(model.intercept_[0] - weights @ mean)
+
+    version_dir = ModelRegistry.new_version_dir()
+    artifact_path = version_dir / ARTIFACT_NAME
+    LogisticScorer(FEATURES, weights.tolist(), intercept, categories).save(artifact_path)
+    print(f"\nScorer artifact saved successfully to {artifact_path}!")
+    print(f"Serve it with POST /api/v1/admin/model/reload {{\"version\": \"{version_dir.name}\"}}")
+
+    total_seconds = time.perf_counter() - started
+    summary = {
+        'version': version_dir.name,
+        'path': str(artifact_path),
+        'rows': stats['rows'],
+        'train_rows': stats['train_rows'],
+        'epochs': epoch_stats,
+        'holdout': holdout,
+        'total_seconds': round(total_seconds, 3),
+        'largest_chunk_mb': round(stats['largest_chunk'] / (1024 * 1024), 2),
+        'peak_memory_mb': _peak_memory_mb()
+    }
+    print(f"\nTotal time: {total_seconds:.1f}s")
+    print(f"Largest chunk in memory: {summary['largest_chunk_mb']} MB")
+    if summary['peak_memory_mb'] is not None:
+        print(f"Peak process memory: {summary['peak_memory_mb']:.1f} MB")
+
+    print("\nFeature Importance (Coefficients, raw feature scale):")
+    for feature, coefficient in sorted(zip(FEATURES, weights), key=lambda item: item[1], reverse=True):
+        print(f"  {feature:<28} {coefficient: .6f}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the booking predictor from a stream of CSV chunks")
+    parser.add_argument('--data', default=DATA_PATH, help="CSV file (optionally compressed)")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per chunk (bounds memory)")
+    parser.add_argument('--epochs', type=int, default=3, help="Passes over the training rows")
+    parser.add_argument('--holdout-percent', type=int, default=10, help="Share of rows held out for evaluation")
+    parser.add_argument('--alpha', type=float, default=1e-5, help="L2 regularization strength")
+    parser.add_argument('--learning-rate', type=float, default=0.01, help="SGD step size (eta0)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    train_streaming(args.data, args.chunk_size, args.epochs, args.holdout_percent, args.alpha,
+                    args.learning_rate, args.seed)
+
+
+if __name__ == "__main__":
+    main()
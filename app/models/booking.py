@@ -1,6 +1,6 @@
 """Database Models for Booking Management"""
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -20,7 +20,7 @@ class Booking(Base):
     to_station_id = Column(Integer, ForeignKey('stations.id'))  # Destination
     booking_date = Column(String)  # When booking was made
     journey_date = Column(String)  # When travel will occur
-    status = Column(String, default="CONFIRMED")  # CONFIRMED, CANCELLED, PENDING
+    status = Column(String, default="CONFIRMED")  # CONFIRMED, CANCELLED, PENDING, WAITLISTED
     total_amount = Column(Integer)  # Total fare (seats + meals)
     refund_amount = Column(Integer, default=0)  # Amount refunded if cancelled
     confirmation_probability = Column(Float, default=0.0)  # ML prediction score
@@ -29,6 +29,16 @@ class Booking(Base):
 
     # Relationship: One booking can have multiple meals
     meals = relationship("BookingMeal", back_populates="booking")
+    # Relationship: Seat segments blocked by this booking (read-only; rows are
+    # written with bulk INSERTs by SeatService.block_seats)
+    seat_blocks = relationship("SeatAvailability", viewonly=True)
+
+    __table_args__ = (
+        # Booking history walks one email's bookings newest first; keyset
+        # pagination on (created_at, id) reads straight off this index, so
+        # every page costs the same no matter how deep it is
+        Index("ix_bookings_email_created_at_id", email, created_at.desc(), id.desc()),
+    )
 
 
 class BookingMeal(Base):
@@ -0,0 +1,14 @@
+"""Database Model for Leased Identifier Blocks"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+from datetime import datetime
+from ..database import Base
+
+
+class IdBlock(Base):
+    """High-water mark of a number sequence that workers lease in blocks"""
+    __tablename__ = "id_blocks"
+    
+    name = Column(String(32), primary_key=True)  # Sequence name (e.g. "booking")
+    next_value = Column(BigInteger, nullable=False)  # First number not yet leased to any worker
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
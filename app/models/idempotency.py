@@ -0,0 +1,16 @@
+"""Database Model for Idempotent Request Replay"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from datetime import datetime
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """Client-supplied Idempotency-Key of a booking request and its stored outcome"""
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)  # Value of the Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request body (detects key reuse)
+    booking_id = Column(Integer, ForeignKey('bookings.id'), nullable=False)  # Booking created by the first request
+    response_body = Column(Text, nullable=True)  # Serialized BookingResponse (filled right after the booking commits)
+    created_at = Column(DateTime, default=datetime.utcnow)
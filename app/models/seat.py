@@ -1,6 +1,8 @@
 """Database Models for Seat Management and Availability Tracking"""
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Date, DDL, event, func
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
@@ -26,8 +28,40 @@ class SeatAvailability(Base):
     seat_id = Column(Integer, ForeignKey('seats.id'))  # Which seat is booked
     from_station_id = Column(Integer, ForeignKey('stations.id'))  # Boarding station
     to_station_id = Column(Integer, ForeignKey('stations.id'))  # Alighting station
+    from_sequence = Column(Integer)  # Boarding station's route position (segment range start)
+    to_sequence = Column(Integer)  # Alighting station's route position (segment range end, exclusive)
     journey_date = Column(Date)  # Date of travel
     is_booked = Column(Boolean, default=False)  # Booking status for this segment
     booked_by = Column(Integer, ForeignKey('bookings.id'), nullable=True)  # Link to booking
+    # Temporary checkout hold: booked_by is NULL until the hold becomes a booking.
+    # Held rows are is_booked=True so the overlap constraint covers them too.
+    hold_token = Column(String(64), nullable=True, index=True)  # Returned to the client placing the hold
+    hold_expires_at = Column(DateTime, nullable=True, index=True)  # Reaper deletes the hold after this
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship: The physical seat this segment block belongs to
+    seat = relationship("Seat", viewonly=True)
+
+    __table_args__ = (
+        # PostgreSQL guarantees no two booked rows for the same seat and date
+        # have overlapping [from_sequence, to_sequence) ranges, even when
+        # concurrent requests both pass the in-memory availability check.
+        ExcludeConstraint(
+            (seat_id, "="),
+            (journey_date, "="),
+            (func.int4range(from_sequence, to_sequence), "&&"),
+            name="ex_seat_availability_segment_overlap",
+            using="gist",
+            where="is_booked",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# The exclusion constraint mixes scalar equality with range overlap in one
+# GiST index, which needs the btree_gist extension on PostgreSQL.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
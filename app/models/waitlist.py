@@ -0,0 +1,32 @@
+"""Database Model for the Booking Waitlist"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Date, Index
+from datetime import datetime
+from ..database import Base
+
+
+class WaitlistEntry(Base):
+    """A WAITLISTED booking waiting for seats on its route segment and date"""
+    __tablename__ = "waitlist_entries"
+    
+    id = Column(Integer, primary_key=True, index=True)  # Also the queue position (lower = earlier)
+    booking_id = Column(Integer, ForeignKey('bookings.id'), unique=True)  # The WAITLISTED booking
+    journey_date = Column(Date, index=True)  # Date of travel
+    from_sequence = Column(Integer)  # Boarding station's route position
+    to_sequence = Column(Integer)  # Alighting station's route position
+    seat_count = Column(Integer)  # Seats needed (all-or-nothing)
+    berth_type = Column(String, nullable=True)  # Optional "lower"/"upper" restriction
+    adjacent = Column(Boolean, default=False)  # Prefer neighbouring seats when promoted
+    created_at = Column(DateTime, default=datetime.utcnow)
+    promoted_at = Column(DateTime, nullable=True)  # Set when seats were assigned (NULL = still waiting)
+
+    __table_args__ = (
+        # Promotion reads the head of one (date, segment) queue with
+        # ORDER BY id LIMIT 1 - a short range scan over pending entries only
+        Index(
+            "ix_waitlist_entries_pending",
+            journey_date, from_sequence, to_sequence, id,
+            postgresql_where=promoted_at.is_(None),
+            sqlite_where=promoted_at.is_(None)
+        ),
+    )
@@ -2,7 +2,8 @@
 
 from pydantic import BaseModel, Field, EmailStr, validator
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Dict, Optional, List
+from ..config import TRIP_CANCELLATION_MAX_DAYS
 
 # =============================================================================
 # STATION SCHEMAS
@@ -83,9 +84,15 @@ class BookingCreate(BaseModel):
     from_station: str  # Station name (e.g., "Ahmedabad")
     to_station: str  # Station name (e.g., "Mumbai")
     travel_date: date  # Journey date
-    seats: List[str] = Field(..., min_items=1, max_items=5, description="List of seat numbers (e.g., ['S02', 'S10'])")  # 1-5 seats
+    seats: Optional[List[str]] = Field(None, min_items=1, max_items=5, description="List of seat numbers (e.g., ['S02', 'S10'])")  # 1-5 seats
+    # Automatic allocation (instead of seats): the server picks the best-fitting seats
+    seat_count: Optional[int] = Field(None, ge=1, le=5, description="Number of seats to allocate automatically")
+    berth_type: Optional[str] = Field(None, pattern='^(lower|upper)$')  # Allocation: only this berth type
+    adjacent: bool = False  # Allocation: prefer neighbouring seats on one deck
+    waitlist_if_full: bool = False  # Allocation: join the waitlist instead of failing when sold out
     passenger_details: PassengerDetails
     meals: Optional[List[MealItem]] = []  # Optional meal selection
+    hold_token: Optional[str] = None  # From POST /api/v1/holds - books the held seats
 
     @validator('travel_date')
     def validate_future_date(cls, v):
@@ -94,6 +101,43 @@ class BookingCreate(BaseModel):
             raise ValueError('Travel date must be in the future')
         return v
 
+    @validator('hold_token', always=True)
+    def validate_seat_selection(cls, v, values):
+        """Either name the seats or ask for seat_count - not both, not neither"""
+        if bool(values.get('seats')) == bool(values.get('seat_count')):
+            raise ValueError('Provide either seats or seat_count')
+        if v and not values.get('seats'):
+            raise ValueError('Booking a hold requires the held seat numbers')
+        if values.get('waitlist_if_full') and not values.get('seat_count'):
+            raise ValueError('Only seat_count bookings can join the waitlist')
+        return v
+
+# =============================================================================
+# SEAT HOLD SCHEMAS
+# =============================================================================
+
+class SeatHoldCreate(BaseModel):
+    """Request payload for temporarily holding seats during checkout"""
+    from_station: str
+    to_station: str
+    travel_date: date
+    seats: List[str] = Field(..., min_items=1, max_items=5)
+
+    @validator('travel_date')
+    def validate_future_date(cls, v):
+        """Ensure travel date is not in the past"""
+        if v < date.today():
+            raise ValueError('Travel date must be in the future')
+        return v
+
+class SeatHoldResponse(BaseModel):
+    hold_token: str  # Pass as hold_token when creating the booking
+    seats: List[str]
+    from_station: str
+    to_station: str
+    travel_date: date
+    expires_at: datetime  # UTC; seats are released after this
+
 # =============================================================================
 # BOOKING RESPONSE SCHEMAS
 # =============================================================================
@@ -117,12 +161,69 @@ class BookingResponse(BaseModel):
     passenger_details: PassengerDetails
     created_at: datetime
 
+class BookingSummary(BaseModel):
+    """Slim booking history entry (no seats, meals or passenger details)"""
+    booking_id: str
+    pnr: str
+    from_station: str
+    to_station: str
+    journey_date: date
+    status: str
+    total_amount: float
+    created_at: datetime
+
+class BookingHistoryPage(BaseModel):
+    """One page of booking history; pass next_cursor back to fetch the next page"""
+    bookings: List[BookingSummary]
+    next_cursor: Optional[str] = None  # None on the last page
+
 class BookingCancellation(BaseModel):
     booking_reference: str
     refund_amount: int
     refund_percentage: int
     refund_status: str
 
+class BookingModification(BaseModel):
+    """In-place change to a confirmed booking (only the differences are written)"""
+    drop_seats: List[str] = []  # Seats to give up (at least one seat must remain)
+    swap_seats: Dict[str, str] = {}  # Current seat number -> new seat number
+    from_station: Optional[str] = None  # New boarding station
+    to_station: Optional[str] = None  # New alighting station
+
+    @validator('to_station', always=True)
+    def validate_has_change(cls, v, values):
+        """Reject empty modifications"""
+        if not (v or values.get('from_station') or values.get('drop_seats') or values.get('swap_seats')):
+            raise ValueError('Nothing to modify')
+        return v
+
+class BookingModificationResponse(BaseModel):
+    booking: BookingResponse
+    additional_charge: int  # Fare added by the change (extended journey, pricier seat)
+    refund_amount: int  # Refund for the removed portion under the cancellation policy
+    refund_percentage: int
+    refund_status: str
+
+class TripCancellationRequest(BaseModel):
+    """Admin request to cancel every booking on one journey date or a date range"""
+    journey_date: date  # First (or only) journey date to cancel
+    end_date: Optional[date] = None  # Last journey date, inclusive
+    refund_percentage: int = Field(100, ge=0, le=100)  # Operator cancellations refund in full by default
+
+    @validator('end_date')
+    def validate_date_range(cls, v, values):
+        """End date can't come before the start date or lie too far after it"""
+        if v and 'journey_date' in values:
+            if v < values['journey_date']:
+                raise ValueError('end_date must be on or after journey_date')
+            if (v - values['journey_date']).days >= TRIP_CANCELLATION_MAX_DAYS:
+                raise ValueError(f'At most {TRIP_CANCELLATION_MAX_DAYS} journey dates can be cancelled at once')
+        return v
+
+class ModelReloadRequest(BaseModel):
+    """Admin request to serve another booking predictor version"""
+    version: Optional[str] = Field(None, pattern=r'^v\d+$')  # e.g. "v2"; newest version when omitted
+
 class PredictionRequest(BaseModel):
     # Backward-compatible metadata (optional)
     booking_reference: Optional[str] = None
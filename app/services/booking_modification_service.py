@@ -0,0 +1,281 @@
+"""Booking Modification Service - Change a confirmed booking in place
+
+Dropping a seat, moving the boarding/alighting station or swapping seats
+used to mean cancelling the whole booking and rebooking, which rewrote
+every seat_availability row and issued a new reference and PNR.
+
+modify_booking() instead diffs the requested booking against its current
+seat blocks and writes only the difference, in one transaction:
+- dropped seats: one DELETE for their rows
+- re-segmented or swapped seats: one executemany UPDATE by primary key
+- unchanged seats: not touched
+Fares are re-priced through the fare matrix. The part of the fare that is
+removed (dropped seats, a shorter journey) is refunded under the normal
+cancellation policy; any increase is added to the booking total. Only the
+refund leaves the total - the part of the removed fare the policy retains
+stays paid, just as a cancelled booking keeps its total.
+Segments freed by the change are offered to the waitlist in the same
+transaction, like a cancellation.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.common import (
+    BookingNotFoundException,
+    CancellationNotAllowedException,
+    DoubleBookingException,
+    InvalidBookingException,
+    InvalidStationException,
+    SeatNotAvailableException,
+    is_segment_conflict
+)
+from ..models.booking import Booking
+from ..models.seat import Seat, SeatAvailability
+from ..utils.utils import calculate_refund_amount, validate_station_combination
+from .seat_inventory import SeatInventory
+from .seat_service import SeatService
+from .station_registry import StationRegistry
+from .waitlist_service import WaitlistService
+
+Segment = Tuple[int, int, int]  # (seat_id, from_seq, to_seq)
+
+
+def segment_difference(from_seq: int, to_seq: int, keep_from: int, keep_to: int) -> List[Tuple[int, int]]:
+    """Pieces of [from_seq, to_seq) that lie outside [keep_from, keep_to)"""
+    pieces = []
+    if from_seq < min(keep_from, to_seq):
+        pieces.append((from_seq, min(keep_from, to_seq)))
+    if max(keep_to, from_seq) < to_seq:
+        pieces.append((max(keep_to, from_seq), to_seq))
+    return pieces
+
+
+class BookingModificationService:
+    """Applies seat drops, station changes and seat swaps as a minimal diff"""
+
+    @staticmethod
+    def _current_blocks(db: Session, booking_id: int) -> Dict[str, tuple]:
+        """This booking's seat blocks keyed by seat number (plain rows, not ORM objects)"""
+        rows = db.query(
+            SeatAvailability.id,
+            SeatAvailability.seat_id,
+            SeatAvailability.from_sequence,
+            SeatAvailability.to_sequence,
+            SeatAvailability.from_station_id,
+            SeatAvailability.to_station_id,
+            Seat.seat_number
+        ).join(
+            Seat, Seat.id == SeatAvailability.seat_id
+        ).filter(
+            SeatAvailability.booked_by == booking_id
+        ).all()
+        return {row.seat_number: row for row in rows}
+
+    @staticmethod
+    def modify_booking(db: Session, booking_reference: str, modification) -> dict:
+        """
+        Drop seats, change stations and/or swap seats on an existing booking
+        Returns the fare change and the refund owed for the removed portion.
+        """
+        booking = db.query(Booking).filter(
+            Booking.booking_reference == booking_reference
+        ).first()
+        if not booking:
+            raise BookingNotFoundException("Booking not found")
+        if booking.status != "CONFIRMED":
+            raise InvalidBookingException("Only confirmed bookings can be modified")
+
+        journey_datetime = datetime.strptime(booking.journey_date, "%Y-%m-%d")
+        journey_date = journey_datetime.date()
+        if journey_datetime < datetime.now():
+            raise CancellationNotAllowedException("Journey has already started")
+
+        # ---------------------------------------------------------------------
+        # Target booking: stations, seats
+        # ---------------------------------------------------------------------
+        stations = StationRegistry.current(db)
+        old_from = stations.by_id(booking.from_station_id)
+        old_to = stations.by_id(booking.to_station_id)
+        new_from = stations.by_name(modification.from_station) if modification.from_station else old_from
+        new_to = stations.by_name(modification.to_station) if modification.to_station else old_to
+        if not new_from or not new_to:
+            raise InvalidStationException("One or both stations not found")
+        if not validate_station_combination(new_from.sequence, new_to.sequence):
+            raise InvalidStationException("From station must come before to station in the route")
+
+        blocks = BookingModificationService._current_blocks(db, booking.id)
+        drop = set(modification.drop_seats)
+        swap = dict(modification.swap_seats)
+
+        unknown = sorted((drop | set(swap)) - set(blocks))
+        if unknown:
+            raise InvalidBookingException(f"Seats are not part of this booking: {', '.join(unknown)}")
+        if drop & set(swap):
+            raise InvalidBookingException("A seat can't be dropped and swapped at the same time")
+        if len(drop) >= len(blocks):
+            raise InvalidBookingException("Cannot drop every seat - cancel the booking instead")
+        if len(set(swap.values())) != len(swap) or set(swap.values()) & set(blocks):
+            raise InvalidBookingException("Each new seat must be different and not already in this booking")
+
+        new_seats = {}
+        if swap:
+            new_seats = {
+                seat.seat_number: seat
+                for seat in db.query(Seat).filter(Seat.seat_number.in_(swap.values())).all()
+            }
+            unavailable = [
+                number for number in swap.values()
+                if number not in new_seats or not new_seats[number].is_available
+            ]
+            if unavailable:
+                raise SeatNotAvailableException(
+                    f"Seats do not exist or are not available: {', '.join(unavailable)}"
+                )
+
+        # ---------------------------------------------------------------------
+        # Diff against the current blocks
+        # ---------------------------------------------------------------------
+        new_seq = (new_from.sequence, new_to.sequence)
+        released: List[Segment] = []
+        claimed: List[Segment] = []
+        dropped_ids = []
+        changed_rows = []
+        targets = {}  # seat number -> seat ID it ends up on
+
+        for number, block in blocks.items():
+            old_seq = (
+                block.from_sequence or SeatInventory.station_sequence(db, block.from_station_id),
+                block.to_sequence or SeatInventory.station_sequence(db, block.to_station_id)
+            )
+            if number in drop:
+                dropped_ids.append(block.id)
+                released.append((block.seat_id, *old_seq))
+                continue
+
+            seat_id = new_seats[swap[number]].id if number in swap else block.seat_id
+            targets[number] = seat_id
+            if seat_id == block.seat_id and old_seq == new_seq:
+                continue  # Unchanged - not written
+
+            changed_rows.append({
+                "id": block.id,
+                "seat_id": seat_id,
+                "from_station_id": new_from.id,
+                "to_station_id": new_to.id,
+                "from_sequence": new_from.sequence,
+                "to_sequence": new_to.sequence
+            })
+            if seat_id == block.seat_id:
+                released.extend((seat_id, *piece) for piece in segment_difference(*old_seq, *new_seq))
+                claimed.extend((seat_id, *piece) for piece in segment_difference(*new_seq, *old_seq))
+            else:
+                released.append((block.seat_id, *old_seq))
+                claimed.append((seat_id, *new_seq))
+
+        # Claimed segments must be free once this booking's own blocks are set aside.
+        # A cached conflict is re-checked against the database before rejecting
+        # (the release may have been committed by another worker).
+        seat_numbers = {block.seat_id: number for number, block in blocks.items()}
+        seat_numbers.update({seat.id: number for number, seat in new_seats.items()})
+        for refreshed in (False, True):
+            if refreshed:
+                SeatInventory.refresh(db, journey_date)
+            masks = SeatInventory.seat_masks(db, journey_date)
+            for seat_id, from_seq, to_seq in released:
+                masks[seat_id] = masks.get(seat_id, 0) & ~SeatInventory.segment_mask(from_seq, to_seq)
+            conflicts = sorted({
+                seat_numbers[seat_id]
+                for seat_id, from_seq, to_seq in claimed
+                if masks.get(seat_id, 0) & SeatInventory.segment_mask(from_seq, to_seq)
+            })
+            if not conflicts:
+                break
+        if conflicts:
+            raise DoubleBookingException(
+                f"Seats already booked for overlapping route segment: {', '.join(conflicts)}"
+            )
+
+        # ---------------------------------------------------------------------
+        # Re-price: refund what was removed, charge what was added
+        # ---------------------------------------------------------------------
+        old_fares = SeatService.calculate_seat_prices(
+            db, [block.seat_id for block in blocks.values()], old_from, old_to
+        )
+        new_fares = SeatService.calculate_seat_prices(db, list(targets.values()), new_from, new_to)
+        removed_value = added_value = 0
+        for number, block in blocks.items():
+            old_fare = old_fares[block.seat_id]
+            new_fare = new_fares[targets[number]] if number in targets else 0
+            removed_value += max(old_fare - new_fare, 0)
+            added_value += max(new_fare - old_fare, 0)
+
+        if removed_value:
+            refund_info = calculate_refund_amount(removed_value, journey_datetime, datetime.now())
+        else:
+            refund_info = {"refund_amount": 0, "refund_percentage": 0, "status": "NO_REFUND"}
+
+        # ---------------------------------------------------------------------
+        # Write the diff (one transaction)
+        # ---------------------------------------------------------------------
+        promotions = []
+        try:
+            if dropped_ids:
+                db.execute(delete(SeatAvailability).where(SeatAvailability.id.in_(dropped_ids)))
+            if changed_rows:
+                # ORM bulk UPDATE by primary key: one executemany for all changed rows
+                db.execute(update(SeatAvailability), changed_rows)
+
+            booking.from_station_id = new_from.id
+            booking.to_station_id = new_to.id
+            # The retained part of removed_value (removed_value - refund) stays in the total
+            booking.total_amount = booking.total_amount - refund_info["refund_amount"] + added_value
+            booking.refund_amount = (booking.refund_amount or 0) + refund_info["refund_amount"]
+
+            if released:
+                db.flush()
+                promotions = WaitlistService.promote(db, journey_date, released, claimed)
+
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not is_segment_conflict(e):
+                raise
+            SeatInventory.invalidate(journey_date)
+            raise DoubleBookingException(
+                "Seats were just booked by another request for an overlapping route segment"
+            )
+        except Exception:
+            db.rollback()
+            raise
+
+        # Bring the in-memory inventory in step with the committed diff
+        for seat_id, from_seq, to_seq in released:
+            SeatInventory.mark_released(seat_id, journey_date, from_seq, to_seq)
+        for seat_id, from_seq, to_seq in claimed:
+            SeatInventory.mark_booked(seat_id, journey_date, from_seq, to_seq)
+        WaitlistService.promotions_committed(promotions)
+
+        return {
+            "booking_id": booking.id,
+            "additional_charge": added_value,
+            "refund_amount": refund_info["refund_amount"],
+            "refund_percentage": refund_info["refund_percentage"],
+            "refund_status": refund_info["status"]
+        }
+
+
+class AsyncBookingModificationService:
+    """
+    Async facade over BookingModificationService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync.
+    """
+
+    @staticmethod
+    async def modify_booking(db: AsyncSession, booking_reference: str, modification) -> dict:
+        return await db.run_sync(BookingModificationService.modify_booking, booking_reference, modification)
@@ -1,14 +1,21 @@
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import delete, func, insert, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
 from ..models.booking import Booking, BookingMeal
-from ..models.seat import Seat
-from ..models.station import Station
+from ..models.idempotency import IdempotencyKey
+from ..models.seat import Seat, SeatAvailability
+from ..models.waitlist import WaitlistEntry
 from ..models.meal import Meal
+from ..config import SEAT_ALLOCATION_ATTEMPTS
 from ..core.common import (
     BookingNotFoundException,
+    DoubleBookingException,
     InvalidStationException,
     CancellationNotAllowedException,
     InvalidBookingException,
+    SeatNotAvailableException,
     generate_booking_reference,
     generate_pnr
 )
@@ -16,9 +23,18 @@ from ..utils.utils import (
     validate_email,
     validate_phone,
     validate_station_combination,
-    calculate_refund_amount
+    calculate_refund_amount,
+    encode_history_cursor,
+    decode_history_cursor
 )
+from .fare_matrix import FareMatrix
+from .id_service import IdService
 from .seat_service import SeatService
+from .seat_hold_service import SeatHoldService
+from .seat_allocator import SeatAllocator
+from .waitlist_service import WaitlistService
+from .seat_inventory import SeatInventory
+from .station_registry import StationRegistry
 
 
 class BookingService:
@@ -27,16 +43,43 @@ class BookingService:
     @staticmethod
     def create_booking(
         db: Session,
-        booking_data
-    ) -> Booking:
+        booking_data,
+        idempotency_key: Optional[str] = None,
+        request_hash: Optional[str] = None
+    ) -> Tuple[Booking, List[str]]:
         """
         Create a new booking with validation
+        Returns the committed booking row and its seat numbers (the allocated
+        ones for seat-count bookings, none while waitlisted). The request
+        model is left as the caller sent it.
+        When an idempotency key is given it is recorded in the same transaction,
+        so a key exists in the database if and only if its booking does.
+        Seat-count bookings whose allocated seats are taken by a concurrent
+        request are re-allocated (up to SEAT_ALLOCATION_ATTEMPTS times) instead
+        of surfacing the conflict to the client.
         """
+        attempts = 1 if booking_data.seats else SEAT_ALLOCATION_ATTEMPTS
+        for attempt in range(attempts):
+            try:
+                return BookingService._create_booking(db, booking_data, idempotency_key, request_hash)
+            except DoubleBookingException:
+                if attempt == attempts - 1:
+                    raise
+    
+    @staticmethod
+    def _create_booking(
+        db: Session,
+        booking_data,
+        idempotency_key: Optional[str],
+        request_hash: Optional[str]
+    ) -> Tuple[Booking, List[str]]:
+        """Single attempt of create_booking (one transaction)"""
         # Validate input (Pydantic does most, but we check logic)
         
-        # Get stations
-        from_station = db.query(Station).filter(Station.name == booking_data.from_station).first()
-        to_station = db.query(Station).filter(Station.name == booking_data.to_station).first()
+        # Get stations (in-memory registry, no queries)
+        stations = StationRegistry.current(db)
+        from_station = stations.by_name(booking_data.from_station)
+        to_station = stations.by_name(booking_data.to_station)
         
         if not from_station or not to_station:
             raise InvalidStationException("One or both stations not found")
@@ -49,93 +92,179 @@ class BookingService:
         
         journey_date_str = booking_data.travel_date.strftime("%Y-%m-%d")
 
-        # Check availability for ALL seats
-        for seat_number in booking_data.seats:
-            SeatService.check_seat_availability(
-                db, seat_number, from_station.id, to_station.id, journey_date_str
+        # Duplicate seat numbers would block the same seat twice
+        if booking_data.seats and len(set(booking_data.seats)) != len(booking_data.seats):
+            raise InvalidBookingException("Each seat can only be requested once per booking")
+
+        hold_token = getattr(booking_data, "hold_token", None)
+        if hold_token:
+            # Seats were reserved at checkout - verify the hold instead of
+            # re-checking availability (the held rows would show as occupied)
+            seats = SeatHoldService.held_seats(
+                db, hold_token, booking_data.seats, from_station, to_station, booking_data.travel_date
             )
-        
-        # Calculate price
-        total_seat_price = 0
-        for seat_number in booking_data.seats:
-            # Get seat ID from seat number for price calculation
-            seat = db.query(Seat).filter(Seat.seat_number == seat_number).first()
-            if seat:
-                total_seat_price += SeatService.calculate_seat_price(
-                    db, seat.id, from_station.id, to_station.id
+        elif booking_data.seats:
+            # Check availability for ALL seats in one pass (reports every conflict)
+            seats = SeatService.check_seats_availability(
+                db, booking_data.seats, from_station, to_station, journey_date_str
+            )
+        else:
+            # "Any N seats": best-fit allocation from the segment bitmaps
+            try:
+                seats = SeatAllocator.allocate(
+                    db,
+                    booking_data.seat_count,
+                    from_station.sequence,
+                    to_station.sequence,
+                    booking_data.travel_date,
+                    berth_type=booking_data.berth_type,
+                    adjacent=booking_data.adjacent
                 )
+            except SeatNotAvailableException:
+                if not booking_data.waitlist_if_full:
+                    raise
+                seats = []  # Sold out - the booking joins the waitlist instead
+        
+        # No seats means WAITLISTED: only meals are charged until promotion
+        waitlisted = not seats
+        
+        # Calculate price from the fare matrix for the already-resolved seats
+        seat_prices = SeatService.calculate_seat_prices(
+            db, [seat.id for seat in seats], from_station, to_station
+        )
+        total_seat_price = sum(seat_prices.values())
         
-        # Calculate meal price
+        # Calculate meal price (all meals fetched in one query)
         total_meal_price = 0
         if booking_data.meals:
+            meal_ids = {meal_item.meal_id for meal_item in booking_data.meals}
+            meal_prices = dict(
+                db.query(Meal.id, Meal.price).filter(Meal.id.in_(meal_ids)).all()
+            )
             for meal_item in booking_data.meals:
-                meal = db.query(Meal).filter(Meal.id == meal_item.meal_id).first()
-                if meal:
-                    total_meal_price += (meal.price * meal_item.quantity)
+                if meal_item.meal_id in meal_prices:
+                    total_meal_price += (meal_prices[meal_item.meal_id] * meal_item.quantity)
         
         total_amount = total_seat_price + total_meal_price
 
-        # Generate booking reference
+        # Generate booking reference and PNR from one leased sequence number
+        # (unique by construction - no collision check or retry needed)
+        sequence = IdService.next_id(db)
         booking_reference = generate_booking_reference(
-            from_station.name, to_station.name
+            from_station.name, to_station.name, sequence
         )
-        pnr = generate_pnr()
+        pnr = generate_pnr(sequence)
 
         from ..services.prediction_service import PredictionService
         
         booking_date_obj = datetime.now().date()
         journey_date_obj = booking_data.travel_date
         
+        # Capture plain values before writing - nothing below should trigger
+        # a lazy reload of the Seat rows mid-transaction
+        seat_ids = [seat.id for seat in seats]
+        seat_numbers = [seat.seat_number for seat in seats]
+        seat_types = [seat.seat_type for seat in seats]
+        from_seq, to_seq = from_station.sequence, to_station.sequence
+        
+        # Model inputs from the in-memory inventory (no extra queries):
+        # seats taken on this journey's busiest segment, berth and route profile
+        occupied = SeatInventory.segment_occupancy(db, journey_date_obj, from_seq, to_seq)
+        if hold_token:
+            occupied -= len(seat_ids)  # Held seats already count as occupied
+        seat_total = FareMatrix.seat_count(db)
+        occupancy_percent = min(100, round(occupied * 100 / seat_total)) if seat_total else 0
+        if seat_types:
+            seat_type = max(seat_types, key=seat_types.count)
+        else:
+            seat_type = booking_data.berth_type or "lower"
+        route = stations.stations
+        route_type = (
+            "full" if from_seq == route[0].sequence and to_seq == route[-1].sequence else "partial"
+        )
+        
         confirmation_probability = PredictionService.predict_confirmation_probability(
             booking_date_obj,
             journey_date_obj,
-            len(booking_data.seats)
+            len(seats) or booking_data.seat_count,
+            occupancy_percent=occupancy_percent,
+            seat_type=seat_type,
+            route_type=route_type
         )
         
-        # Create booking
-        booking = Booking(
-            booking_reference=booking_reference,
-            pnr=pnr,
-            user_name=booking_data.passenger_details.name,
-            email=booking_data.passenger_details.email,
-            phone=booking_data.passenger_details.contact,
-            from_station_id=from_station.id,
-            to_station_id=to_station.id,
-            # seat_id removed
-            booking_date=datetime.now().strftime("%Y-%m-%d"),
-            journey_date=journey_date_str,
-            status="CONFIRMED",
-            total_amount=total_amount,
-            confirmation_probability=confirmation_probability
-        )
-        
-        db.add(booking)
-        db.flush()  # Get booking ID
-        
-        # Block ALL seats
-        for seat_number in booking_data.seats:
-            SeatService.block_seat(
-                db, seat_number, from_station.id, to_station.id, journey_date_str, booking.id
-            )
-        
-        # Add meals
-        if booking_data.meals:
-            for meal_item in booking_data.meals:
-                meal_id = meal_item.meal_id
-                quantity = meal_item.quantity
-                
-                # Verify meal exists again just to be safe or skip
-                booking_meal = BookingMeal(
-                    booking_id=booking.id,
-                    meal_id=meal_id,
-                    quantity=quantity
+        # Everything from here to the commit is ONE transaction: the booking,
+        # all seat blocks and all meals land together or not at all.
+        try:
+            # Create booking - RETURNING hands back the generated ID and
+            # defaults in the same round trip as the INSERT
+            booking = db.scalars(
+                insert(Booking).returning(Booking),
+                [{
+                    "booking_reference": booking_reference,
+                    "pnr": pnr,
+                    "user_name": booking_data.passenger_details.name,
+                    "email": booking_data.passenger_details.email,
+                    "phone": booking_data.passenger_details.contact,
+                    "from_station_id": from_station.id,
+                    "to_station_id": to_station.id,
+                    "booking_date": datetime.now().strftime("%Y-%m-%d"),
+                    "journey_date": journey_date_str,
+                    "status": "WAITLISTED" if waitlisted else "CONFIRMED",
+                    "total_amount": total_amount,
+                    "confirmation_probability": confirmation_probability
+                }]
+            ).one()
+            
+            if waitlisted:
+                # Queue for the next cancellation that frees this segment
+                WaitlistService.add_entry(
+                    db,
+                    booking.id,
+                    booking_data.travel_date,
+                    from_seq,
+                    to_seq,
+                    booking_data.seat_count,
+                    booking_data.berth_type,
+                    booking_data.adjacent
                 )
-                db.add(booking_meal)
+            elif hold_token:
+                # Turn the held rows into this booking's seats (one UPDATE, no commit)
+                SeatHoldService.convert_hold(db, hold_token, booking.id, len(seat_ids))
+            else:
+                # Block ALL seats (one multi-row INSERT, no commit)
+                SeatService.block_seats(
+                    db, seat_ids, from_station, to_station, journey_date_str, booking.id
+                )
+            
+            # Add meals (one multi-row INSERT)
+            if booking_data.meals:
+                db.execute(insert(BookingMeal), [
+                    {
+                        "booking_id": booking.id,
+                        "meal_id": meal_item.meal_id,
+                        "quantity": meal_item.quantity
+                    }
+                    for meal_item in booking_data.meals
+                ])
+            
+            # Claim the idempotency key (primary key - a concurrent duplicate fails here)
+            if idempotency_key:
+                db.execute(insert(IdempotencyKey), [{
+                    "key": idempotency_key,
+                    "request_hash": request_hash,
+                    "booking_id": booking.id
+                }])
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         
-        db.commit()
-        db.refresh(booking)
+        # Only now that the commit succeeded do the seats count as occupied in memory
+        for seat_id in seat_ids:
+            SeatInventory.mark_booked(seat_id, booking_data.travel_date, from_seq, to_seq)
         
-        return booking
+        return booking, seat_numbers
     
     @staticmethod
     def get_booking_details(db: Session, booking_reference: str) -> Booking:
@@ -150,10 +279,76 @@ class BookingService:
         return booking
     
     @staticmethod
-    def get_booking_history(db: Session, email: str) -> list:
-        """Get all bookings for a user"""
-        bookings = db.query(Booking).filter(Booking.email == email).all()
-        return bookings
+    def get_booking_history(
+        db: Session,
+        email: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> dict:
+        """
+        One page of a user's bookings, newest first
+        Keyset pagination: the cursor is the (created_at, id) of the last row
+        already returned, so the next page is an index range scan on
+        (email, created_at DESC, id DESC) instead of an ever-growing OFFSET.
+        Only the summary columns are selected.
+        """
+        query = db.query(
+            Booking.id,
+            Booking.booking_reference,
+            Booking.pnr,
+            Booking.from_station_id,
+            Booking.to_station_id,
+            Booking.journey_date,
+            Booking.status,
+            Booking.total_amount,
+            Booking.created_at
+        ).filter(Booking.email == email)
+        
+        if cursor:
+            position = decode_history_cursor(cursor)
+            if position is None:
+                raise InvalidBookingException("Invalid pagination cursor")
+            query = query.filter(tuple_(Booking.created_at, Booking.id) < position)
+        if status:
+            query = query.filter(Booking.status == status)
+        # journey_date is stored as YYYY-MM-DD text, which sorts chronologically
+        if date_from:
+            query = query.filter(Booking.journey_date >= date_from.strftime("%Y-%m-%d"))
+        if date_to:
+            query = query.filter(Booking.journey_date <= date_to.strftime("%Y-%m-%d"))
+        
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(
+            Booking.created_at.desc(), Booking.id.desc()
+        ).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        stations = StationRegistry.current(db)
+        bookings = []
+        for row in rows:
+            from_st = stations.by_id(row.from_station_id)
+            to_st = stations.by_id(row.to_station_id)
+            bookings.append({
+                "booking_id": row.booking_reference,
+                "pnr": row.pnr,
+                "from_station": from_st.name if from_st else "Unknown",
+                "to_station": to_st.name if to_st else "Unknown",
+                "journey_date": datetime.strptime(row.journey_date, "%Y-%m-%d").date(),
+                "status": row.status,
+                "total_amount": row.total_amount,
+                "created_at": row.created_at
+            })
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_history_cursor(last.created_at, last.id)
+        
+        return {"bookings": bookings, "next_cursor": next_cursor}
     
     @staticmethod
     def cancel_booking(db: Session, booking_reference: str) -> dict:
@@ -188,8 +383,10 @@ class BookingService:
             )
         
         # Update booking
+        was_waitlisted = booking.status == "WAITLISTED"
         booking.status = "CANCELLED"
-        booking.refund_amount = refund_info["refund_amount"]
+        # Added to any refund already recorded when the booking was modified
+        booking.refund_amount = (booking.refund_amount or 0) + refund_info["refund_amount"]
         booking.cancelled_at = datetime.utcnow()
         
         # Release ALL seat
@@ -199,10 +396,48 @@ class BookingService:
             SeatAvailability.booked_by == booking.id
         ).all()
         
+        released = [
+            (a.seat_id, a.journey_date, a.from_station_id, a.to_station_id)
+            for a in booked_availability
+        ]
         for availability in booked_availability:
             db.delete(availability)
         
-        db.commit()
+        promotions = []
+        try:
+            if was_waitlisted:
+                # Never got seats - just leave the queue
+                WaitlistService.remove_entry(db, booking.id)
+            elif released:
+                # Hand the freed seats to waitlisted bookings in this same transaction
+                db.flush()
+                promotions = WaitlistService.promote(
+                    db,
+                    journey_datetime.date(),
+                    [
+                        (
+                            seat_id,
+                            SeatInventory.station_sequence(db, from_station_id),
+                            SeatInventory.station_sequence(db, to_station_id)
+                        )
+                        for seat_id, _, from_station_id, to_station_id in released
+                    ]
+                )
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        # Free the segments in the in-memory inventory now that the delete is committed
+        for seat_id, journey_date, from_station_id, to_station_id in released:
+            SeatInventory.mark_released(
+                seat_id,
+                journey_date,
+                SeatInventory.station_sequence(db, from_station_id),
+                SeatInventory.station_sequence(db, to_station_id)
+            )
+        WaitlistService.promotions_committed(promotions)
         
         return {
             "booking_reference": booking.booking_reference,
@@ -211,6 +446,87 @@ class BookingService:
             "refund_status": refund_info["status"]
         }
     
+    @staticmethod
+    def cancel_trip(
+        db: Session,
+        journey_date: date,
+        end_date: Optional[date] = None,
+        refund_percentage: int = 100
+    ) -> dict:
+        """
+        Cancel every active booking on a journey date (or date range) at once
+        Used when the operator calls off a trip. The whole day is three
+        set-based statements in one transaction instead of a lookup, refund
+        and commit per booking:
+        - one UPDATE cancels the bookings and computes every refund in SQL,
+          RETURNING the rows for the refund report
+        - one DELETE frees all seat blocks and checkout holds on those dates
+        - one DELETE drops the dates' waitlist entries
+        """
+        end_date = end_date or journey_date
+        cancelled_at = datetime.utcnow()
+        
+        # This cancellation's refund per booking (total_amount is not changed by the UPDATE)
+        refund = Booking.total_amount * refund_percentage // 100
+        
+        try:
+            refunds = db.execute(
+                update(Booking).where(
+                    # journey_date is stored as YYYY-MM-DD text, which sorts chronologically
+                    Booking.journey_date.between(
+                        journey_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+                    ),
+                    Booking.status != "CANCELLED"
+                ).values(
+                    status="CANCELLED",
+                    # Added to any refund already recorded when the booking was modified
+                    refund_amount=func.coalesce(Booking.refund_amount, 0) + refund,
+                    cancelled_at=cancelled_at
+                ).returning(
+                    Booking.booking_reference,
+                    Booking.pnr,
+                    Booking.email,
+                    Booking.journey_date,
+                    Booking.total_amount,
+                    refund.label("refund_amount")
+                ).execution_options(synchronize_session=False)
+            ).all()
+            
+            released_seats = db.execute(
+                delete(SeatAvailability).where(
+                    SeatAvailability.journey_date.between(journey_date, end_date)
+                )
+            ).rowcount
+            
+            removed_entries = db.execute(
+                delete(WaitlistEntry).where(
+                    WaitlistEntry.journey_date.between(journey_date, end_date)
+                )
+            ).rowcount
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        # Those dates are empty now - reload them from the DB on next access
+        day = journey_date
+        while day <= end_date:
+            SeatInventory.invalidate(day)
+            day += timedelta(days=1)
+        
+        summary = {
+            "journey_date": journey_date,
+            "end_date": end_date,
+            "cancelled_bookings": len(refunds),
+            "released_seat_blocks": released_seats,
+            "removed_waitlist_entries": removed_entries,
+            "refund_percentage": refund_percentage,
+            "total_refund": sum(row.refund_amount for row in refunds),
+            "cancelled_at": cancelled_at
+        }
+        return {"summary": summary, "refunds": refunds}
+    
     @staticmethod
     def update_booking_meals(
         db: Session,
@@ -260,44 +576,27 @@ class BookingService:
         return booking
 
     @staticmethod
-    def get_booking_response_object(db: Session, booking_id: int) -> dict:
+    def build_booking_response(
+        db: Session,
+        booking: Booking,
+        seat_numbers: List[str],
+        meals: List[dict]
+    ) -> dict:
         """
         Construct a detailed dictionary matching BookingResponse schema
+        Stations come from the in-memory registry, so this never queries.
         """
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
-        if not booking:
-            raise BookingNotFoundException("Booking not found")
+        stations = StationRegistry.current(db)
+        from_st = stations.by_id(booking.from_station_id)
+        to_st = stations.by_id(booking.to_station_id)
         
-        from ..models.seat import SeatAvailability # Local import
-
-        # Get Stations
-        from_st = db.query(Station).filter(Station.id == booking.from_station_id).first()
-        to_st = db.query(Station).filter(Station.id == booking.to_station_id).first()
-        
-        # Get Seats
-        booked_availability = db.query(SeatAvailability).filter(
-            SeatAvailability.booked_by == booking.id
-        ).all()
-        
-        seat_ids = {ba.seat_id for ba in booked_availability}
-        seats = db.query(Seat).filter(Seat.id.in_(seat_ids)).all()
-        seat_names = sorted([s.seat_number for s in seats])
-        
-        # Get Meals
-        meals = []
-        for bm in booking.meals:
-            meals.append({
-                "meal_id": bm.meal_id,
-                "quantity": bm.quantity
-            })
-            
         return {
             "booking_id": booking.booking_reference,
             "pnr": booking.pnr,
             "status": booking.status,
             "total_amount": booking.total_amount,
             "confirmation_probability": booking.confirmation_probability,
-            "seats": seat_names,
+            "seats": sorted(seat_numbers),
             "meals": meals,
             "journey_details": {
                 "from_station": from_st.name,
@@ -305,7 +604,7 @@ class BookingService:
                 "date": datetime.strptime(booking.journey_date, "%Y-%m-%d").date(),
                 "departure_time": from_st.departure_time,
                 "arrival_time": to_st.arrival_time,
-                "duration": "TBD"
+                "duration": stations.duration_label(from_st.sequence, to_st.sequence)
             },
             "passenger_details": {
                 "name": booking.user_name,
@@ -314,3 +613,115 @@ class BookingService:
             },
             "created_at": booking.created_at
         }
+    
+    @staticmethod
+    def new_booking_response(db: Session, booking: Booking, seat_numbers: List[str], booking_data) -> dict:
+        """
+        Response for a booking create_booking just committed
+        Everything is already known: create_booking returned the row with its
+        generated values and the seat numbers, and the request names the
+        meals, so no re-query.
+        """
+        meals = [
+            {"meal_id": meal_item.meal_id, "quantity": meal_item.quantity}
+            for meal_item in booking_data.meals or []
+        ]
+        return BookingService.build_booking_response(db, booking, seat_numbers, meals)
+    
+    @staticmethod
+    def _load_booking_response(db: Session, *criteria) -> dict:
+        """Fetch a booking with its seats and meals in ONE joined query and format it"""
+        booking = db.query(Booking).options(
+            joinedload(Booking.seat_blocks).joinedload(SeatAvailability.seat),
+            joinedload(Booking.meals)
+        ).filter(*criteria).one_or_none()
+        
+        if not booking:
+            raise BookingNotFoundException("Booking not found")
+        
+        seat_numbers = [block.seat.seat_number for block in booking.seat_blocks if block.seat]
+        meals = [{"meal_id": bm.meal_id, "quantity": bm.quantity} for bm in booking.meals]
+        return BookingService.build_booking_response(db, booking, seat_numbers, meals)
+    
+    @staticmethod
+    def get_booking_response_object(db: Session, booking_id: int) -> dict:
+        """BookingResponse dictionary for a booking ID (single query)"""
+        return BookingService._load_booking_response(db, Booking.id == booking_id)
+    
+    @staticmethod
+    def get_booking_response_by_reference(db: Session, booking_reference: str) -> dict:
+        """BookingResponse dictionary for a booking reference (single query)"""
+        return BookingService._load_booking_response(
+            db, Booking.booking_reference == booking_reference
+        )
+
+
+class AsyncBookingService:
+    """
+    Async facade over BookingService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync,
+    so every query awaits the async driver instead of blocking the event loop.
+    """
+    
+    @staticmethod
+    async def create_booking(
+        db: AsyncSession,
+        booking_data,
+        idempotency_key: Optional[str] = None,
+        request_hash: Optional[str] = None
+    ) -> Tuple[Booking, List[str]]:
+        return await db.run_sync(
+            BookingService.create_booking, booking_data, idempotency_key, request_hash
+        )
+    
+    @staticmethod
+    async def get_booking_details(db: AsyncSession, booking_reference: str) -> Booking:
+        return await db.run_sync(BookingService.get_booking_details, booking_reference)
+    
+    @staticmethod
+    async def get_booking_history(
+        db: AsyncSession,
+        email: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> dict:
+        return await db.run_sync(
+            BookingService.get_booking_history, email, limit, cursor, status, date_from, date_to
+        )
+    
+    @staticmethod
+    async def cancel_booking(db: AsyncSession, booking_reference: str) -> dict:
+        return await db.run_sync(BookingService.cancel_booking, booking_reference)
+    
+    @staticmethod
+    async def cancel_trip(
+        db: AsyncSession,
+        journey_date: date,
+        end_date: Optional[date] = None,
+        refund_percentage: int = 100
+    ) -> dict:
+        return await db.run_sync(BookingService.cancel_trip, journey_date, end_date, refund_percentage)
+    
+    @staticmethod
+    async def update_booking_meals(db: AsyncSession, booking_reference: str, meal_ids: list) -> Booking:
+        return await db.run_sync(BookingService.update_booking_meals, booking_reference, meal_ids)
+    
+    @staticmethod
+    async def new_booking_response(
+        db: AsyncSession,
+        booking: Booking,
+        seat_numbers: List[str],
+        booking_data
+    ) -> dict:
+        return await db.run_sync(BookingService.new_booking_response, booking, seat_numbers, booking_data)
+    
+    @staticmethod
+    async def get_booking_response_object(db: AsyncSession, booking_id: int) -> dict:
+        return await db.run_sync(BookingService.get_booking_response_object, booking_id)
+    
+    @staticmethod
+    async def get_booking_response_by_reference(db: AsyncSession, booking_reference: str) -> dict:
+        return await db.run_sync(BookingService.get_booking_response_by_reference, booking_reference)
@@ -0,0 +1,138 @@
+"""Fare Matrix - Precomputed seat fares for every route segment
+
+Fares only depend on the seat (base price, berth type) and the two
+stations (distance between them), and there are just 40 seats and 5
+stations. Instead of fetching the Seat and both Stations and recomputing
+the multipliers for every price, the full matrix
+
+    (seat_id, from_sequence, to_sequence) -> fare
+
+is built once from the seats table (one query) and the station registry
+and held in memory, so pricing becomes a dict lookup.
+
+The matrix is dropped when a transaction that inserted, updated or
+deleted a Seat or Station row through the ORM commits (or rolls back -
+the session may have priced its own uncommitted rows) and is rebuilt
+lazily on the next lookup.
+
+The build queries run without holding a lock: under AsyncSession.run_sync
+a query yields to the event loop, and a second coroutine on the same
+thread waiting for a threading.Lock would block the loop for good.
+Concurrent cold lookups may each build the matrix; the lock only guards
+the swap, and a build that raced with an invalidation is discarded.
+"""
+
+import threading
+from itertools import chain
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.common import InvalidStationException
+from ..models.seat import Seat
+from ..models.station import Station
+from .station_registry import StationRegistry
+from ..utils.utils import calculate_distance_between_stations, get_distance_multiplier, get_seat_type_multiplier
+
+
+def compute_fare(base_price: int, seat_type: str, from_distance_km: int, to_distance_km: int) -> int:
+    """Dynamic price: Base Price × Distance Multiplier × Seat Type Multiplier"""
+    distance = calculate_distance_between_stations(from_distance_km, to_distance_km)
+    distance_multiplier = get_distance_multiplier(distance)
+    seat_type_multiplier = get_seat_type_multiplier(seat_type)
+    return int(base_price * distance_multiplier * seat_type_multiplier)
+
+
+class FareMatrix:
+    """Process-wide (seat_id, from_sequence, to_sequence) -> fare lookup table"""
+
+    _fares: Optional[Dict[Tuple[int, int, int], int]] = None
+    _seat_count: Optional[int] = None
+    # Bumped on every invalidation so a build that raced with a change is discarded
+    _generation = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _build(db: Session) -> Dict[Tuple[int, int, int], int]:
+        """Compute the fare for every seat on every forward segment of the route"""
+        seats = db.query(Seat.id, Seat.base_price, Seat.seat_type).all()
+        stations = StationRegistry.current(db).stations
+
+        fares = {}
+        for seat in seats:
+            for i, origin in enumerate(stations):
+                for destination in stations[i + 1:]:
+                    fares[(seat.id, origin.sequence, destination.sequence)] = compute_fare(
+                        seat.base_price, seat.seat_type, origin.distance_km, destination.distance_km
+                    )
+        return fares
+
+    @staticmethod
+    def _get(db: Session) -> Dict[Tuple[int, int, int], int]:
+        fares = FareMatrix._fares
+        if fares is None:
+            generation = FareMatrix._generation
+            fares = FareMatrix._build(db)  # No lock held: may yield to the event loop
+            with FareMatrix._lock:
+                if generation == FareMatrix._generation and FareMatrix._fares is None:
+                    FareMatrix._fares = fares
+        return fares
+
+    @staticmethod
+    def _check_segment(from_seq: int, to_seq: int):
+        """Only forward segments are priced - a same-station or reversed route is a bad request"""
+        if from_seq >= to_seq:
+            raise InvalidStationException("From station must come before to station in the route")
+
+    @staticmethod
+    def fare(db: Session, seat_id: int, from_seq: int, to_seq: int) -> int:
+        """Fare for one seat and segment"""
+        FareMatrix._check_segment(from_seq, to_seq)
+        return FareMatrix._get(db)[(seat_id, from_seq, to_seq)]
+
+    @staticmethod
+    def fares(db: Session, seat_ids: Iterable[int], from_seq: int, to_seq: int) -> Dict[int, int]:
+        """Fares for several seats on the same segment, keyed by seat ID"""
+        FareMatrix._check_segment(from_seq, to_seq)
+        fares = FareMatrix._get(db)
+        return {seat_id: fares[(seat_id, from_seq, to_seq)] for seat_id in seat_ids}
+
+    @staticmethod
+    def seat_count(db: Session) -> int:
+        """Number of seats on the bus (the seats the matrix prices)"""
+        count = FareMatrix._seat_count
+        if count is None:
+            generation = FareMatrix._generation
+            count = len({seat_id for seat_id, _, _ in FareMatrix._get(db)})
+            if generation == FareMatrix._generation:
+                FareMatrix._seat_count = count
+        return count
+
+    @staticmethod
+    def invalidate(*_args):
+        """Drop the matrix so the next lookup rebuilds it"""
+        with FareMatrix._lock:
+            FareMatrix._generation += 1
+            FareMatrix._fares = None
+            FareMatrix._seat_count = None
+
+
+# Seat prices/types and station distances feed the matrix. A flush only
+# marks the session; the matrix is dropped once the transaction ends, so a
+# concurrent rebuild can't keep data from before the commit (or from a
+# transaction that is rolled back).
+_DIRTY_KEY = "fare_matrix_dirty"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_fare_inputs_changed(session, _flush_context):
+    if any(isinstance(obj, (Seat, Station)) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_transaction(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        FareMatrix.invalidate()
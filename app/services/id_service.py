@@ -0,0 +1,96 @@
+"""ID Service - Collision-free booking sequence numbers leased in blocks
+
+Booking references and PNRs are derived from a per-booking sequence number
+(see generate_booking_reference / generate_pnr in core/common.py). Numbers
+come from the id_blocks table, but not one at a time: each worker process
+leases a block of ID_BLOCK_SIZE numbers with a single
+UPDATE ... RETURNING and then hands them out from memory.
+
+Leases run on their own connection and commit immediately, independent of
+the booking transaction. A rolled-back booking therefore never returns its
+block to the table, and two workers can never be given the same number.
+Unused numbers in a block are simply skipped when the worker exits.
+
+The lease runs without holding the lock: under AsyncSession.run_sync the
+UPDATE yields to the event loop, and a concurrent booking on the same
+thread waiting for a threading.Lock would block the loop forever. Callers
+that find no numbers left each lease a block; every leased block is
+queued and handed out, so a concurrent lease wastes nothing.
+"""
+
+import threading
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import ID_BLOCK_SIZE
+from ..models.id_block import IdBlock
+
+BOOKING_SEQUENCE = "booking"
+
+
+class IdService:
+    """Per-process cache of the current leased block for each sequence"""
+
+    # sequence name -> leased blocks, each [next number to hand out, end of block (exclusive)]
+    _blocks = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _lease_block(db: Session, name: str, size: int) -> int:
+        """Reserve `size` numbers in a separate committed transaction; returns the first"""
+        with db.get_bind().connect() as conn:
+            for _ in range(2):
+                end = conn.execute(
+                    update(IdBlock).where(
+                        IdBlock.name == name
+                    ).values(
+                        next_value=IdBlock.next_value + size
+                    ).returning(IdBlock.next_value)
+                ).scalar_one_or_none()
+                if end is not None:
+                    conn.commit()
+                    return end - size
+
+                # First lease ever for this sequence: numbers start at 1
+                try:
+                    conn.execute(insert(IdBlock).values(name=name, next_value=1 + size))
+                    conn.commit()
+                    return 1
+                except IntegrityError:
+                    # Another worker created the row first - lease from it instead
+                    conn.rollback()
+        raise RuntimeError(f"Could not lease an ID block for sequence '{name}'")
+
+    @staticmethod
+    def _take(name: str):
+        """Next number from the leased blocks, None when they are used up (caller holds the lock)"""
+        blocks = IdService._blocks.get(name)
+        while blocks:
+            block = blocks[0]
+            if block[0] < block[1]:
+                value = block[0]
+                block[0] += 1
+                return value
+            blocks.pop(0)
+        return None
+
+    @staticmethod
+    def next_id(db: Session, name: str = BOOKING_SEQUENCE) -> int:
+        """Next unused number of a sequence (a database round trip only once per block)"""
+        while True:
+            with IdService._lock:
+                value = IdService._take(name)
+            if value is not None:
+                return value
+
+            start = IdService._lease_block(db, name, ID_BLOCK_SIZE)  # No lock held: may yield
+            with IdService._lock:
+                IdService._blocks.setdefault(name, []).append([start, start + ID_BLOCK_SIZE])
+
+    @staticmethod
+    def reset():
+        """Forget leased blocks (the next call leases a fresh one)"""
+        with IdService._lock:
+            IdService._blocks.clear()
@@ -0,0 +1,145 @@
+"""Idempotency Service - Exactly-once booking creation for retried requests
+
+Mobile clients retry POST /api/v1/bookings on timeouts. Sending the same
+Idempotency-Key header with each retry makes the retries safe:
+
+1. In-memory LRU of recent keys -> stored response, no database access
+2. A request with the same key already running in this process -> wait
+   for its result instead of running the booking pipeline again
+3. idempotency_keys table -> keys older than the LRU, or created by
+   another worker process
+4. Otherwise create the booking; the key row is inserted in the booking's
+   own transaction (its primary key also stops cross-process duplicates)
+
+A key replayed with a different request body is rejected, since returning
+the stored booking would hand the client the wrong ticket.
+
+The LRU and in-flight table are only touched from the event loop thread.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import IDEMPOTENCY_CACHE_SIZE
+from ..core.common import IdempotencyKeyReusedException
+from ..models.idempotency import IdempotencyKey
+from .booking_service import AsyncBookingService, BookingService
+
+
+class IdempotencyService:
+    """Replays stored booking responses for repeated Idempotency-Keys"""
+
+    # key -> (request_hash, response) for the most recently used keys
+    _recent: "OrderedDict[str, Tuple[str, dict]]" = OrderedDict()
+    # key -> future resolved with (request_hash, response) by the first request
+    _inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def request_hash(booking_data) -> str:
+        """Stable SHA-256 fingerprint of a BookingCreate payload"""
+        payload = json.dumps(jsonable_encoder(booking_data), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _remember(key: str, request_hash: str, response: dict):
+        IdempotencyService._recent[key] = (request_hash, response)
+        IdempotencyService._recent.move_to_end(key)
+        while len(IdempotencyService._recent) > IDEMPOTENCY_CACHE_SIZE:
+            IdempotencyService._recent.popitem(last=False)
+
+    @staticmethod
+    def _checked(key: str, request_hash: str, stored: Tuple[str, dict]) -> dict:
+        stored_hash, response = stored
+        if stored_hash != request_hash:
+            raise IdempotencyKeyReusedException(
+                f"Idempotency-Key '{key}' was already used with a different request"
+            )
+        return response
+
+    @staticmethod
+    def load_stored(db: Session, key: str) -> Optional[Tuple[str, dict]]:
+        """(request_hash, response) recorded for a key, or None if the key is new"""
+        record = db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+        if record is None:
+            return None
+        if record.response_body:
+            return record.request_hash, json.loads(record.response_body)
+        # The booking committed but the worker stopped before storing its response
+        response = jsonable_encoder(BookingService.get_booking_response_object(db, record.booking_id))
+        return record.request_hash, response
+
+    @staticmethod
+    def store_response(db: Session, key: str, response: dict):
+        """Persist the serialized response next to the key"""
+        db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update(
+            {IdempotencyKey.response_body: json.dumps(response)},
+            synchronize_session=False
+        )
+        db.commit()
+
+    @staticmethod
+    async def create_booking(db: AsyncSession, key: str, booking_data) -> Tuple[dict, bool]:
+        """
+        Create a booking at most once per key
+        Returns (response, replayed) - replayed is True when the stored
+        response of an earlier request was returned.
+        """
+        request_hash = IdempotencyService.request_hash(booking_data)
+
+        stored = IdempotencyService._recent.get(key)
+        if stored is not None:
+            IdempotencyService._recent.move_to_end(key)
+            return IdempotencyService._checked(key, request_hash, stored), True
+
+        inflight = IdempotencyService._inflight.get(key)
+        if inflight is not None:
+            # Concurrent duplicate: share the first request's outcome
+            stored = await asyncio.shield(inflight)
+            return IdempotencyService._checked(key, request_hash, stored), True
+
+        future = asyncio.get_running_loop().create_future()
+        IdempotencyService._inflight[key] = future
+        try:
+            replayed = True
+            stored = await db.run_sync(IdempotencyService.load_stored, key)
+            if stored is None:
+                try:
+                    booking, seat_numbers = await AsyncBookingService.create_booking(
+                        db, booking_data, key, request_hash
+                    )
+                except (HTTPException, IntegrityError):
+                    # Another worker may have claimed the key (and the seats) first
+                    stored = await db.run_sync(IdempotencyService.load_stored, key)
+                    if stored is None:
+                        raise
+                else:
+                    response = jsonable_encoder(
+                        await AsyncBookingService.new_booking_response(db, booking, seat_numbers, booking_data)
+                    )
+                    await db.run_sync(IdempotencyService.store_response, key, response)
+                    stored, replayed = (request_hash, response), False
+
+            IdempotencyService._remember(key, *stored)
+            future.set_result(stored)
+            return IdempotencyService._checked(key, request_hash, stored), replayed
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            IdempotencyService._inflight.pop(key, None)
+
+    @staticmethod
+    def reset():
+        """Forget all cached keys (the database records are kept)"""
+        IdempotencyService._recent.clear()
+        IdempotencyService._inflight.clear()
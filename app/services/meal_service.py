@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models.meal import Meal
 from ..core.common import InvalidBookingException
@@ -65,3 +66,36 @@ class MealService:
         db.commit()
         db.refresh(meal)
         return meal
+
+
+class AsyncMealService:
+    """
+    Async facade over MealService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync.
+    """
+    
+    @staticmethod
+    async def get_available_meals(db: AsyncSession) -> list:
+        return await db.run_sync(MealService.get_available_meals)
+    
+    @staticmethod
+    async def get_meal_by_id(db: AsyncSession, meal_id: int) -> Meal:
+        return await db.run_sync(MealService.get_meal_by_id, meal_id)
+    
+    @staticmethod
+    async def get_meals_by_category(db: AsyncSession, category: str) -> list:
+        return await db.run_sync(MealService.get_meals_by_category, category)
+    
+    @staticmethod
+    async def create_meal(
+        db: AsyncSession,
+        name: str,
+        description: str,
+        price: int,
+        category: str
+    ) -> Meal:
+        return await db.run_sync(MealService.create_meal, name, description, price, category)
+    
+    @staticmethod
+    async def update_meal_availability(db: AsyncSession, meal_id: int, is_available: bool) -> Meal:
+        return await db.run_sync(MealService.update_meal_availability, meal_id, is_available)
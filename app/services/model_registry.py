@@ -0,0 +1,245 @@
+"""Model Registry - Versioned booking predictor artifacts, loaded once per worker
+
+PredictionService used to load the model lazily on the first prediction
+(so the first booking after a deploy paid for it), resolved the artifact
+relative to the working directory, and retried the load on every call
+when it failed.
+
+Artifacts now live in one directory per version under MODEL_REGISTRY_DIR
+(app/ml/saved_models by default, resolved from this package, not the cwd):
+
+    saved_models/
+        v1/booking_predictor.json
+        v2/booking_predictor.json
+        CURRENT                     <- optional: name of the version to serve
+
+The served version is the one named in CURRENT, or the highest vN when
+there is no pointer. The model is loaded in the application lifespan, so
+it is ready before the first request.
+
+A loaded model is an immutable LoadedModel snapshot. Reloading builds a
+new snapshot and swaps it in with a single assignment: in-flight
+predictions finish on the snapshot they started with. promote() (the admin
+reload endpoint) loads a version in the worker that handles the request
+and writes CURRENT; the other workers notice the pointer within
+MODEL_REFRESH_SECONDS and load it too - no restart needed.
+
+Failed loads are remembered per version for MODEL_LOAD_RETRY_SECONDS, so
+a missing or broken artifact costs one disk read per cool-down instead of
+one per prediction. Until a model loads, predictions use the heuristic.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import MODEL_LOAD_RETRY_SECONDS, MODEL_REFRESH_SECONDS, MODEL_REGISTRY_DIR
+from ..core.common import ModelUnavailableException
+from ..ml.scorer import LogisticScorer
+
+ARTIFACT_NAME = "booking_predictor.json"
+POINTER_NAME = "CURRENT"
+VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """One model version ready to score (safe to share between requests)"""
+    version: str
+    path: str
+    scorer: LogisticScorer
+    category_codes: Dict[str, Dict[str, int]]  # feature -> {category: code}, same codes as LabelEncoder.transform
+    coefficients: Dict[str, float]  # Keyed by feature name without "_encoded" (e.g. seat_type)
+    loaded_at: datetime
+
+    @staticmethod
+    def from_scorer(version: str, path: Path, scorer: LogisticScorer) -> "LoadedModel":
+        return LoadedModel(
+            version=version,
+            path=str(path),
+            scorer=scorer,
+            category_codes=scorer.category_codes(),
+            coefficients={
+                feature.replace('_encoded', ''): coefficient
+                for feature, coefficient in zip(scorer.features, scorer.coefficients)
+            },
+            loaded_at=datetime.now()
+        )
+
+
+class ModelRegistry:
+    """Process-wide holder of the served booking predictor"""
+
+    _current: Optional[LoadedModel] = None
+    _failures: Dict[str, Tuple[float, str]] = {}  # version -> (monotonic time of failure, error)
+    _next_check = 0.0  # Monotonic time after which current() looks at the disk again
+    _lock = threading.RLock()
+
+    # -------------------------------------------------------------------------
+    # Artifact layout
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def root() -> Path:
+        return Path(MODEL_REGISTRY_DIR)
+
+    @staticmethod
+    def versions() -> List[str]:
+        """Version directories that exist, oldest first (v2 before v10)"""
+        root = ModelRegistry.root()
+        if not root.is_dir():
+            return []
+        found = [
+            entry.name for entry in root.iterdir()
+            if entry.is_dir() and VERSION_PATTERN.match(entry.name)
+        ]
+        return sorted(found, key=lambda name: int(VERSION_PATTERN.match(name).group(1)))
+
+    @staticmethod
+    def pinned_version() -> Optional[str]:
+        """Version named by the CURRENT pointer (None if there is no pointer)"""
+        try:
+            version = (ModelRegistry.root() / POINTER_NAME).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    @staticmethod
+    def latest_version() -> Optional[str]:
+        """Newest version on disk, ignoring the pointer"""
+        versions = ModelRegistry.versions()
+        return versions[-1] if versions else None
+
+    @staticmethod
+    def resolve_version() -> Optional[str]:
+        """The version to serve: the pinned one, else the newest"""
+        return ModelRegistry.pinned_version() or ModelRegistry.latest_version()
+
+    @staticmethod
+    def new_version_dir() -> Path:
+        """Create and return the directory for the next version (used by training)"""
+        latest = ModelRegistry.latest_version()
+        number = int(VERSION_PATTERN.match(latest).group(1)) + 1 if latest else 1
+        path = ModelRegistry.root() / f"v{number}"
+        path.mkdir(parents=True)
+        return path
+
+    # -------------------------------------------------------------------------
+    # Loading and swapping
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def load(version: Optional[str] = None, force: bool = False) -> LoadedModel:
+        """
+        Load a version (default: the one to serve) and make it current
+        Raises ModelUnavailableException when it can't be loaded; the
+        previous model stays current. A version that failed within the last
+        MODEL_LOAD_RETRY_SECONDS is not read again unless force is set.
+        """
+        with ModelRegistry._lock:
+            now = time.monotonic()
+            ModelRegistry._next_check = now + MODEL_REFRESH_SECONDS
+
+            version = version or ModelRegistry.resolve_version()
+            if version is None:
+                raise ModelUnavailableException(f"No model versions found in {ModelRegistry.root()}")
+            if not VERSION_PATTERN.match(version):
+                raise ModelUnavailableException(f"Invalid model version: {version}")
+
+            failure = ModelRegistry._failures.get(version)
+            if failure and not force and now - failure[0] < MODEL_LOAD_RETRY_SECONDS:
+                raise ModelUnavailableException(f"Model {version} failed to load recently: {failure[1]}")
+
+            path = ModelRegistry.root() / version / ARTIFACT_NAME
+            try:
+                scorer = LogisticScorer.load(path)
+            except Exception as e:
+                ModelRegistry._failures[version] = (now, str(e))
+                raise ModelUnavailableException(f"Model {version} failed to load: {e}")
+
+            ModelRegistry._failures.pop(version, None)
+            model = LoadedModel.from_scorer(version, path, scorer)
+            ModelRegistry._current = model
+            return model
+
+    @staticmethod
+    def current() -> Optional[LoadedModel]:
+        """
+        The served model (None until one loads - callers fall back to the heuristic)
+        Between checks this is a plain attribute read. Every
+        MODEL_REFRESH_SECONDS one caller re-reads the CURRENT pointer and
+        loads the named version if it changed.
+        """
+        if time.monotonic() < ModelRegistry._next_check:
+            return ModelRegistry._current
+
+        with ModelRegistry._lock:
+            now = time.monotonic()
+            if now < ModelRegistry._next_check:
+                return ModelRegistry._current
+            ModelRegistry._next_check = now + MODEL_REFRESH_SECONDS
+
+            model = ModelRegistry._current
+            try:
+                # A loaded model only changes when the pointer moves; without
+                # one, keep looking for any version to load
+                target = ModelRegistry.pinned_version() if model else ModelRegistry.resolve_version()
+                failure = ModelRegistry._failures.get(target)
+                if target and (model is None or target != model.version) and not (
+                    failure and now - failure[0] < MODEL_LOAD_RETRY_SECONDS
+                ):
+                    ModelRegistry.load(target)
+            except Exception as e:
+                print(f"Failed to load model: {e}")
+            return ModelRegistry._current
+
+    @staticmethod
+    def promote(version: Optional[str] = None) -> LoadedModel:
+        """
+        Load a version here and point every worker at it (admin hot reload)
+        The version defaults to the newest one on disk. CURRENT is only
+        rewritten after the load succeeded, and atomically (rename).
+        """
+        with ModelRegistry._lock:
+            model = ModelRegistry.load(version or ModelRegistry.latest_version(), force=True)
+
+            root = ModelRegistry.root()
+            fd, tmp_path = tempfile.mkstemp(dir=root, prefix=f".{POINTER_NAME}.")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(model.version + "\n")
+                os.replace(tmp_path, root / POINTER_NAME)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            return model
+
+    @staticmethod
+    def status() -> dict:
+        """Served version plus what's on disk and recent load failures (admin view)"""
+        model = ModelRegistry._current
+        now = time.monotonic()
+        return {
+            "version": model.version if model else None,
+            "path": model.path if model else None,
+            "loaded_at": model.loaded_at.isoformat() if model else None,
+            "pinned_version": ModelRegistry.pinned_version(),
+            "available_versions": ModelRegistry.versions(),
+            "failures": {
+                version: {"error": error, "seconds_ago": round(now - failed_at, 1)}
+                for version, (failed_at, error) in ModelRegistry._failures.items()
+            }
+        }
+
+    @staticmethod
+    def reset():
+        """Forget the loaded model and cached failures (next access reloads)"""
+        with ModelRegistry._lock:
+            ModelRegistry._current = None
+            ModelRegistry._failures = {}
+            ModelRegistry._next_check = 0.0
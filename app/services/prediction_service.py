@@ -8,8 +8,11 @@ explainability without exposing internal model parameters.
 """
 
 from dataclasses import dataclass
-from typing import Dict
-from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .model_registry import LoadedModel, ModelRegistry
 
 
 @dataclass
@@ -21,46 +24,8 @@ class PredictionResult:
 
 
 class PredictionService:
-    _model = None
-    _encoders = None
-    _coefficients = None
-    
-    @staticmethod
-    def _load_model():
-        """Lazy load the trained model and encoders"""
-        if PredictionService._model is None:
-            try:
-                import joblib
-                MODEL_DIR = Path('app/ml/saved_models')
-                MODEL_PATH = MODEL_DIR / 'booking_predictor.pkl'
-                ENCODER_PATH = MODEL_DIR / 'encoders.pkl'
-                
-                if not MODEL_PATH.exists() or not ENCODER_PATH.exists():
-                    # Fallback to heuristic if model not found
-                    return False
-                    
-                PredictionService._model = joblib.load(MODEL_PATH)
-                PredictionService._encoders = joblib.load(ENCODER_PATH)
-                
-                # Extract coefficients for explanations
-                # Feature order: [days_before_journey, current_occupancy_percent, seat_type_encoded,
-                #                route_type_encoded, day_of_week_encoded, seats_requested,
-                #                is_holiday_season, booking_hour]
-                PredictionService._coefficients = {
-                    'days_before_journey': PredictionService._model.coef_[0][0],
-                    'current_occupancy_percent': PredictionService._model.coef_[0][1],
-                    'seat_type': PredictionService._model.coef_[0][2],
-                    'route_type': PredictionService._model.coef_[0][3],
-                    'day_of_week': PredictionService._model.coef_[0][4],
-                    'seats_requested': PredictionService._model.coef_[0][5],
-                    'is_holiday_season': PredictionService._model.coef_[0][6],
-                    'booking_hour': PredictionService._model.coef_[0][7]
-                }
-                return True
-            except Exception as e:
-                print(f"Failed to load model: {e}")
-                return False
-        return True
+    """Scores requests with the model registry's current model (heuristic fallback)"""
+    _factors: Optional[Tuple[LoadedModel, Dict[str, str]]] = None  # Explanations of the last model used
     
     @staticmethod
     def _explain_coefficient(coef: float) -> str:
@@ -80,10 +45,11 @@ class PredictionService:
         Apply ML model to estimate confirmation probability.
         Falls back to heuristic if model is not available.
         """
-        # Try to use ML model
-        if PredictionService._load_model():
+        # Try to use ML model (loaded at startup by the model registry)
+        model = ModelRegistry.current()
+        if model is not None:
             try:
-                return PredictionService._predict_ml(request_data)
+                return PredictionService._predict_ml(request_data, model)
             except Exception as e:
                 print(f"ML prediction failed: {e}, falling back to heuristic")
         
@@ -91,67 +57,96 @@ class PredictionService:
         return PredictionService._predict_heuristic(request_data)
     
     @staticmethod
-    def _predict_ml(request_data: dict) -> PredictionResult:
-        """ML-based prediction using trained logistic regression model"""
-        # Encode categorical features
-        seat_type = request_data.get('seat_type', 'lower')
-        route_type = request_data.get('route_type', 'full')
-        day_of_week = request_data.get('day_of_week', 'Monday')
+    def predict_batch(requests: List[dict]) -> List[PredictionResult]:
+        """
+        Score many requests at once, results in input order
+        The ML path encodes the whole batch into one feature matrix and scores
+        it in one NumPy call; the heuristic fallback scores row by row.
+        """
+        if not requests:
+            return []
         
-        try:
-            seat_encoded = PredictionService._encoders['seat_type'].transform([seat_type])[0]
-            route_encoded = PredictionService._encoders['route_type'].transform([route_type])[0]
-            day_encoded = PredictionService._encoders['day_of_week'].transform([day_of_week])[0]
-        except:
-            # If encoding fails, use defaults
-            seat_encoded = 0
-            route_encoded = 0
-            day_encoded = 0
+        model = ModelRegistry.current()
+        if model is not None:
+            try:
+                return PredictionService._predict_ml_batch(requests, model)
+            except Exception as e:
+                print(f"ML batch prediction failed: {e}, falling back to heuristic")
         
-        # Prepare features in exact order
-        features = [
-            request_data.get('days_before_journey', 7),
-            request_data.get('current_occupancy_percent', 50),
-            seat_encoded,
-            route_encoded,
-            day_encoded,
-            request_data.get('seats_requested', 1),
-            1 if request_data.get('is_holiday_season', False) else 0,
-            request_data.get('booking_hour', 12)
-        ]
+        return [PredictionService._predict_heuristic(request_data) for request_data in requests]
+    
+    @staticmethod
+    def _feature_matrix(requests: List[dict], codes: Dict[str, Dict[str, int]]) -> np.ndarray:
+        """
+        Model input rows for a batch of requests
+        Feature order: [days_before_journey, current_occupancy_percent, seat_type_encoded,
+                       route_type_encoded, day_of_week_encoded, seats_requested,
+                       is_holiday_season, booking_hour]
+        """
+        seat_codes = np.array([codes['seat_type'].get(r.get('seat_type', 'lower'), -1) for r in requests])
+        route_codes = np.array([codes['route_type'].get(r.get('route_type', 'full'), -1) for r in requests])
+        day_codes = np.array([codes['day_of_week'].get(r.get('day_of_week', 'Monday'), -1) for r in requests])
         
-        # Get probability from model
-        prob = PredictionService._model.predict_proba([features])[0][1]
-        probability = round(min(prob * 100, 95), 2)
+        # An unknown category falls back to 0 for all three encoded features
+        unknown = (seat_codes < 0) | (route_codes < 0) | (day_codes < 0)
+        seat_codes[unknown] = 0
+        route_codes[unknown] = 0
+        day_codes[unknown] = 0
         
-        # Build factor explanations based on coefficients
-        factors = {
-            "lead_time": PredictionService._explain_coefficient(
-                PredictionService._coefficients['days_before_journey']
-            ),
-            "occupancy": PredictionService._explain_coefficient(
-                PredictionService._coefficients['current_occupancy_percent']
-            ),
-            "seat_preference": PredictionService._explain_coefficient(
-                PredictionService._coefficients['seat_type']
-            ),
-            "holiday_season": PredictionService._explain_coefficient(
-                PredictionService._coefficients['is_holiday_season']
-            ),
-            "route_profile": PredictionService._explain_coefficient(
-                PredictionService._coefficients['route_type']
-            ),
-            "booking_time": PredictionService._explain_coefficient(
-                PredictionService._coefficients['booking_hour']
-            ),
-            "party_size": PredictionService._explain_coefficient(
-                PredictionService._coefficients['seats_requested']
-            )
-        }
+        return np.column_stack([
+            np.array([r.get('days_before_journey', 7) for r in requests], dtype=float),
+            np.array([r.get('current_occupancy_percent', 50) for r in requests], dtype=float),
+            seat_codes,
+            route_codes,
+            day_codes,
+            np.array([r.get('seats_requested', 1) for r in requests], dtype=float),
+            np.array([1 if r.get('is_holiday_season', False) else 0 for r in requests], dtype=float),
+            np.array([r.get('booking_hour', 12) for r in requests], dtype=float)
+        ]).astype(float)
+    
+    @staticmethod
+    def _ml_factors(model: LoadedModel) -> Dict[str, str]:
+        """
+        Factor explanations - they depend only on the model's coefficients,
+        so they are built once per loaded model (copy before handing out)
+        """
+        cached = PredictionService._factors
+        if cached is None or cached[0] is not model:
+            coefficients = model.coefficients
+            cached = (model, {
+                "lead_time": PredictionService._explain_coefficient(coefficients['days_before_journey']),
+                "occupancy": PredictionService._explain_coefficient(coefficients['current_occupancy_percent']),
+                "seat_preference": PredictionService._explain_coefficient(coefficients['seat_type']),
+                "holiday_season": PredictionService._explain_coefficient(coefficients['is_holiday_season']),
+                "route_profile": PredictionService._explain_coefficient(coefficients['route_type']),
+                "booking_time": PredictionService._explain_coefficient(coefficients['booking_hour']),
+                "party_size": PredictionService._explain_coefficient(coefficients['seats_requested'])
+            })
+            PredictionService._factors = cached
+        return cached[1]
+    
+    @staticmethod
+    def _round2(value: float) -> float:
+        """
+        Round to 2 decimals the way NumPy does (scale by 100, round half to
+        even, scale back) - identical to rounding the np.float64 values
+        sklearn's predict_proba returned, without the cost of NumPy scalars
+        """
+        return round(value * 100) / 100
+    
+    @staticmethod
+    def _confirmation_percent(prob: float) -> float:
+        """Model probability (0-1) -> confirmation percentage, capped at 95"""
+        return PredictionService._round2(min(float(prob) * 100, 95))
+    
+    @staticmethod
+    def _ml_result(prob: float, factors: Dict[str, str]) -> PredictionResult:
+        """Turn a model probability (0-1) into the API result"""
+        probability = PredictionService._confirmation_percent(prob)
         
         # Realistic cancellation risk (8-25% range)
         base_risk = 100 - probability
-        cancellation_risk = round(base_risk * 0.85, 2)
+        cancellation_risk = PredictionService._round2(base_risk * 0.85)
         cancellation_risk = max(8.0, min(25.0, cancellation_risk))
         
         # Recommendation
@@ -171,6 +166,59 @@ class PredictionService:
             factors=factors
         )
     
+    @staticmethod
+    def _predict_ml_batch(requests: List[dict], model: LoadedModel) -> List[PredictionResult]:
+        """ML-based prediction for a batch: one matrix-vector product for all rows"""
+        probabilities = model.scorer.predict_proba(
+            PredictionService._feature_matrix(requests, model.category_codes)
+        )
+        factors = dict(PredictionService._ml_factors(model))
+        return [PredictionService._ml_result(prob, factors) for prob in probabilities]
+    
+    @staticmethod
+    def _feature_row(request_data: dict, codes: Dict[str, Dict[str, int]]) -> List[float]:
+        """Model input row for one request (same encoding as _feature_matrix)"""
+        seat_encoded = codes['seat_type'].get(request_data.get('seat_type', 'lower'))
+        route_encoded = codes['route_type'].get(request_data.get('route_type', 'full'))
+        day_encoded = codes['day_of_week'].get(request_data.get('day_of_week', 'Monday'))
+        if seat_encoded is None or route_encoded is None or day_encoded is None:
+            # If encoding fails, use defaults
+            seat_encoded = route_encoded = day_encoded = 0
+        
+        return [
+            request_data.get('days_before_journey', 7),
+            request_data.get('current_occupancy_percent', 50),
+            seat_encoded,
+            route_encoded,
+            day_encoded,
+            request_data.get('seats_requested', 1),
+            1 if request_data.get('is_holiday_season', False) else 0,
+            request_data.get('booking_hour', 12)
+        ]
+    
+    @staticmethod
+    def _predict_ml(request_data: dict, model: LoadedModel) -> PredictionResult:
+        """ML-based prediction using the trained logistic regression coefficients"""
+        prob = model.scorer.probability(PredictionService._feature_row(request_data, model.category_codes))
+        return PredictionService._ml_result(prob, dict(PredictionService._ml_factors(model)))
+    
+    @staticmethod
+    def confirmation_probability(request_data: dict) -> float:
+        """
+        Confirmation percentage only (booking path)
+        Skips the explanations and recommendation predict() builds; same
+        number as predict(request_data).confirmation_probability.
+        """
+        model = ModelRegistry.current()
+        if model is not None:
+            try:
+                row = PredictionService._feature_row(request_data, model.category_codes)
+                return PredictionService._confirmation_percent(model.scorer.probability(row))
+            except Exception as e:
+                print(f"ML prediction failed: {e}, falling back to heuristic")
+        
+        return PredictionService._predict_heuristic(request_data).confirmation_probability
+    
     @staticmethod
     def _predict_heuristic(request_data: dict) -> PredictionResult:
         """Fallback heuristic-based prediction when ML model is unavailable"""
@@ -283,7 +331,10 @@ class PredictionService:
     def predict_confirmation_probability(
         booking_date,
         journey_date,
-        num_seats: int = 1
+        num_seats: int = 1,
+        occupancy_percent: int = 50,
+        seat_type: str = "lower",
+        route_type: str = "full"
     ) -> float:
         """
         Simplified prediction method for booking creation.
@@ -293,6 +344,9 @@ class PredictionService:
             booking_date: Date when booking is being made
             journey_date: Date of travel
             num_seats: Number of seats being booked
+            occupancy_percent: Seats taken on the journey's busiest segment (0-100)
+            seat_type: Berth type being booked ("lower" / "upper")
+            route_type: "full" for end-to-end journeys, "partial" otherwise
             
         Returns:
             Confirmation probability as a percentage (0-100)
@@ -308,16 +362,16 @@ class PredictionService:
         days_before = (journey_date - booking_date).days
         
         # Build minimal request data for the main predict method
+        now = datetime.now()
         request_data = {
             "days_before_journey": days_before,
             "seats_requested": num_seats,
-            "current_occupancy_percent": 50,
-            "seat_type": "lower",
+            "current_occupancy_percent": occupancy_percent,
+            "seat_type": seat_type,
             "is_holiday_season": False,
-            "route_type": "full",
-            "booking_hour": datetime.now().hour,
-            "day_of_week": datetime.now().strftime('%A')
+            "route_type": route_type,
+            "booking_hour": now.hour,
+            "day_of_week": now.strftime('%A')
         }
         
-        result = PredictionService.predict(request_data)
-        return result.confirmation_probability
+        return PredictionService.confirmation_probability(request_data)
@@ -0,0 +1,141 @@
+"""Seat Allocator - Best-fit seat selection for "any N seats" bookings
+
+Each seat's day on the route is a row of segments; existing bookings occupy
+some of them and leave free gaps in between. A booking for a partial route
+(e.g. Vadodara -> Surat) placed on an empty seat splits that seat's free
+run into short leftovers that are hard to sell, while the same booking on a
+seat already sold for Ahmedabad -> Vadodara fills a gap exactly.
+
+The allocator treats this as interval packing with a best-fit rule: among
+seats whose requested segments are free, it prefers the one whose
+enclosing free gap is the tightest fit, i.e. the fewest free segments
+left over around the booking (then the fewest leftover pieces). Fully empty
+seats are therefore kept for long-distance passengers.
+
+Everything runs on SeatInventory's cached segment bitmaps plus one query
+for the candidate seats.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.common import SeatNotAvailableException
+from ..models.seat import Seat
+from .seat_inventory import SeatInventory
+from .station_registry import StationRegistry
+
+
+def gap_leftover(occupied_mask: int, from_seq: int, to_seq: int, first_segment: int, last_segment: int) -> Tuple[int, int]:
+    """
+    Free segments (total, pieces) left on either side of [from_seq, to_seq)
+    inside the free gap that contains it
+    first_segment/last_segment are the route's first and last segment numbers.
+    """
+    before = 0
+    segment = from_seq - 1
+    while segment >= first_segment and not occupied_mask & (1 << segment):
+        before += 1
+        segment -= 1
+
+    after = 0
+    segment = to_seq
+    while segment <= last_segment and not occupied_mask & (1 << segment):
+        after += 1
+        segment += 1
+
+    return before + after, (before > 0) + (after > 0)
+
+
+class SeatAllocator:
+    """Picks N free seats for a segment, packing partial-route bookings tightly"""
+
+    @staticmethod
+    def _ranked_candidates(
+        db: Session,
+        journey_date: date,
+        from_seq: int,
+        to_seq: int,
+        berth_type: Optional[str],
+        masks: Optional[Dict[int, int]]
+    ) -> Tuple[List[Seat], Dict[int, Tuple[int, int]]]:
+        """Operational seats in layout order, and the fit score of every free one"""
+        query = db.query(Seat).filter(Seat.is_available == True)
+        if berth_type:
+            query = query.filter(Seat.seat_type == berth_type)
+        seats = query.order_by(Seat.seat_number).all()
+
+        stations = StationRegistry.current(db).stations
+        first_segment, last_segment = stations[0].sequence, stations[-1].sequence - 1
+
+        requested = SeatInventory.segment_mask(from_seq, to_seq)
+        if masks is None:
+            masks = SeatInventory.seat_masks(db, journey_date)
+        scores = {}
+        for seat in seats:
+            mask = masks.get(seat.id, 0)
+            if not mask & requested:
+                scores[seat.id] = gap_leftover(mask, from_seq, to_seq, first_segment, last_segment)
+        return seats, scores
+
+    @staticmethod
+    def _adjacent_block(seats: List[Seat], scores: Dict[int, Tuple[int, int]], count: int) -> Optional[List[Seat]]:
+        """Best-fitting run of `count` neighbouring free seats on the same deck"""
+        best, best_score = None, None
+        for start in range(len(seats) - count + 1):
+            window = seats[start:start + count]
+            if any(seat.id not in scores for seat in window):
+                continue
+            if len({seat.seat_type for seat in window}) != 1:
+                continue  # Runs don't continue across decks
+            leftover = sum(scores[seat.id][0] for seat in window)
+            pieces = sum(scores[seat.id][1] for seat in window)
+            if best_score is None or (leftover, pieces) < best_score:
+                best, best_score = window, (leftover, pieces)
+        return best
+
+    @staticmethod
+    def allocate(
+        db: Session,
+        count: int,
+        from_seq: int,
+        to_seq: int,
+        journey_date: date,
+        berth_type: Optional[str] = None,
+        adjacent: bool = False,
+        masks: Optional[Dict[int, int]] = None
+    ) -> List[Seat]:
+        """
+        Choose `count` seats free for the whole segment
+        - berth_type restricts the choice to 'lower' or 'upper' berths
+        - adjacent prefers neighbouring seats on one deck; if no such run is
+          free the best individual seats are returned instead
+        - masks overrides the inventory's bitmaps (e.g. occupancy as it will be
+          once the caller's uncommitted transaction lands)
+        Raises SeatNotAvailableException when fewer than `count` seats are free.
+        """
+        seats, scores = SeatAllocator._ranked_candidates(
+            db, journey_date, from_seq, to_seq, berth_type, masks
+        )
+        if len(scores) < count and masks is None:
+            # Seats freed by another worker may not be in this worker's cache yet
+            SeatInventory.refresh(db, journey_date)
+            seats, scores = SeatAllocator._ranked_candidates(
+                db, journey_date, from_seq, to_seq, berth_type, masks
+            )
+
+        if len(scores) < count:
+            berth = f" {berth_type} berth" if berth_type else ""
+            raise SeatNotAvailableException(
+                f"Only {len(scores)}{berth} seats are free for this route and date, {count} requested"
+            )
+
+        if adjacent and count > 1:
+            block = SeatAllocator._adjacent_block(seats, scores, count)
+            if block:
+                return block
+
+        # Sorted is stable, so equal fits keep layout order
+        free_seats = [seat for seat in seats if seat.id in scores]
+        return sorted(free_seats, key=lambda seat: scores[seat.id])[:count]
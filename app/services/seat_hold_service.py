@@ -0,0 +1,236 @@
+"""Seat Hold Service - Time-limited seat reservations during checkout
+
+A hold reserves (seat, segment, date) while the customer fills in the
+passenger and meal details, so the seats can't be sold out from under them.
+
+Holds are ordinary seat_availability rows with is_booked=True, booked_by
+NULL and a hold_token / hold_expires_at pair. As a result:
+- SeatInventory counts them as occupied, like any booked segment
+- the PostgreSQL exclusion constraint rejects overlapping holds and bookings
+- turning a hold into a booking is a single UPDATE that sets booked_by
+
+Expired holds are deleted by a background reaper in batches of
+SEAT_HOLD_REAPER_BATCH_SIZE rows. Each batch is one DELETE ... RETURNING
+driven by the hold_expires_at index, so there are no per-row scans.
+"""
+
+import asyncio
+import secrets
+from datetime import date, datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import SEAT_HOLD_TTL_SECONDS, SEAT_HOLD_REAPER_INTERVAL_SECONDS, SEAT_HOLD_REAPER_BATCH_SIZE
+from ..core.common import (
+    InvalidBookingException,
+    InvalidStationException,
+    SeatHoldNotFoundException,
+    SeatNotAvailableException
+)
+from ..models.seat import Seat, SeatAvailability
+from ..models.station import Station
+from ..utils.utils import validate_station_combination
+from .seat_inventory import SeatInventory
+from .seat_service import SeatService
+from .station_registry import StationRegistry
+
+
+class SeatHoldService:
+    """Places, converts, releases and expires checkout seat holds"""
+
+    @staticmethod
+    def create_hold(db: Session, hold_data) -> dict:
+        """Hold seats for SEAT_HOLD_TTL_SECONDS (all-or-nothing, like a booking)"""
+        stations = StationRegistry.current(db)
+        from_station = stations.by_name(hold_data.from_station)
+        to_station = stations.by_name(hold_data.to_station)
+
+        if not from_station or not to_station:
+            raise InvalidStationException("One or both stations not found")
+        if not validate_station_combination(from_station.sequence, to_station.sequence):
+            raise InvalidStationException("From station must come before to station in the route")
+        if len(set(hold_data.seats)) != len(hold_data.seats):
+            raise InvalidBookingException("Each seat can only be requested once per hold")
+
+        journey_date_str = hold_data.travel_date.strftime("%Y-%m-%d")
+        seats = SeatService.check_seats_availability(
+            db, hold_data.seats, from_station, to_station, journey_date_str
+        )
+        seat_ids = [seat.id for seat in seats]
+
+        hold_token = secrets.token_urlsafe(16)
+        expires_at = datetime.utcnow() + timedelta(seconds=SEAT_HOLD_TTL_SECONDS)
+        try:
+            SeatService.block_seats(
+                db, seat_ids, from_station, to_station, journey_date_str, None,
+                hold_token=hold_token, hold_expires_at=expires_at
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        for seat_id in seat_ids:
+            SeatInventory.mark_booked(seat_id, hold_data.travel_date, from_station.sequence, to_station.sequence)
+
+        return {
+            "hold_token": hold_token,
+            "seats": list(hold_data.seats),
+            "from_station": from_station.name,
+            "to_station": to_station.name,
+            "travel_date": hold_data.travel_date,
+            "expires_at": expires_at
+        }
+
+    @staticmethod
+    def held_seats(
+        db: Session,
+        hold_token: str,
+        seat_numbers: List[str],
+        from_station: Station,
+        to_station: Station,
+        journey_date: date
+    ) -> List[Seat]:
+        """
+        Seats covered by an active hold, in request order
+        The booking must ask for exactly the held seats, segment and date.
+        """
+        rows = db.query(SeatAvailability, Seat).join(
+            Seat, Seat.id == SeatAvailability.seat_id
+        ).filter(
+            SeatAvailability.hold_token == hold_token,
+            SeatAvailability.booked_by == None,
+            SeatAvailability.hold_expires_at > datetime.utcnow()
+        ).all()
+
+        if not rows:
+            raise SeatHoldNotFoundException()
+
+        seats_by_number = {seat.seat_number: seat for _, seat in rows}
+        matches = (
+            set(seats_by_number) == set(seat_numbers)
+            and all(
+                block.journey_date == journey_date
+                and block.from_sequence == from_station.sequence
+                and block.to_sequence == to_station.sequence
+                for block, _ in rows
+            )
+        )
+        if not matches:
+            raise InvalidBookingException("Booking must match the held seats, route and date")
+
+        unavailable = [number for number in seat_numbers if not seats_by_number[number].is_available]
+        if unavailable:
+            raise SeatNotAvailableException(
+                f"Seats do not exist or are not available: {', '.join(unavailable)}"
+            )
+        return [seats_by_number[number] for number in seat_numbers]
+
+    @staticmethod
+    def convert_hold(db: Session, hold_token: str, booking_id: int, seat_count: int):
+        """
+        Attach held rows to a booking inside the caller's transaction (no commit)
+        The expiry is re-checked in the UPDATE itself, so a hold the reaper is
+        about to delete can't be converted.
+        """
+        result = db.execute(
+            update(SeatAvailability).where(
+                SeatAvailability.hold_token == hold_token,
+                SeatAvailability.booked_by == None,
+                SeatAvailability.hold_expires_at > datetime.utcnow()
+            ).values(booked_by=booking_id, hold_token=None, hold_expires_at=None)
+        )
+        if result.rowcount != seat_count:
+            raise SeatHoldNotFoundException("Seat hold expired before the booking completed")
+
+    @staticmethod
+    def release_hold(db: Session, hold_token: str) -> int:
+        """Give held seats back early (e.g. the customer abandoned checkout)"""
+        released = db.execute(
+            delete(SeatAvailability).where(
+                SeatAvailability.hold_token == hold_token,
+                SeatAvailability.booked_by == None
+            ).returning(
+                SeatAvailability.seat_id,
+                SeatAvailability.journey_date,
+                SeatAvailability.from_sequence,
+                SeatAvailability.to_sequence
+            )
+        ).all()
+        if not released:
+            db.rollback()
+            raise SeatHoldNotFoundException()
+        db.commit()
+
+        for seat_id, journey_date, from_seq, to_seq in released:
+            SeatInventory.mark_released(seat_id, journey_date, from_seq, to_seq)
+        return len(released)
+
+    @staticmethod
+    def reap_expired(db: Session, batch_size: int = SEAT_HOLD_REAPER_BATCH_SIZE) -> int:
+        """
+        Delete expired holds in batches, committing after each batch
+        SKIP LOCKED lets several workers reap concurrently without blocking
+        on (or double-deleting) the same rows.
+        """
+        reaped = 0
+        while True:
+            expired_ids = select(SeatAvailability.id).where(
+                SeatAvailability.hold_expires_at <= datetime.utcnow(),
+                SeatAvailability.booked_by == None
+            ).order_by(
+                SeatAvailability.hold_expires_at
+            ).limit(batch_size).with_for_update(skip_locked=True).scalar_subquery()
+
+            released = db.execute(
+                delete(SeatAvailability).where(
+                    SeatAvailability.id.in_(expired_ids)
+                ).returning(
+                    SeatAvailability.seat_id,
+                    SeatAvailability.journey_date,
+                    SeatAvailability.from_sequence,
+                    SeatAvailability.to_sequence
+                )
+            ).all()
+            db.commit()
+
+            for seat_id, journey_date, from_seq, to_seq in released:
+                SeatInventory.mark_released(seat_id, journey_date, from_seq, to_seq)
+
+            reaped += len(released)
+            if len(released) < batch_size:
+                return reaped
+
+
+class AsyncSeatHoldService:
+    """
+    Async facade over SeatHoldService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync.
+    """
+
+    @staticmethod
+    async def create_hold(db: AsyncSession, hold_data) -> dict:
+        return await db.run_sync(SeatHoldService.create_hold, hold_data)
+
+    @staticmethod
+    async def release_hold(db: AsyncSession, hold_token: str) -> int:
+        return await db.run_sync(SeatHoldService.release_hold, hold_token)
+
+    @staticmethod
+    async def reap_expired(db: AsyncSession) -> int:
+        return await db.run_sync(SeatHoldService.reap_expired)
+
+    @staticmethod
+    async def run_reaper(session_factory):
+        """Background task: sweep expired holds every SEAT_HOLD_REAPER_INTERVAL_SECONDS"""
+        while True:
+            await asyncio.sleep(SEAT_HOLD_REAPER_INTERVAL_SECONDS)
+            try:
+                async with session_factory() as db:
+                    await AsyncSeatHoldService.reap_expired(db)
+            except Exception as e:
+                # Keep sweeping; a failed pass is retried on the next tick
+                print(f"Seat hold reaper failed: {e}")
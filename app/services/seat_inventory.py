@@ -0,0 +1,246 @@
+"""Seat Inventory - In-memory segment bitmaps for seat availability
+
+The route is split into segments between consecutive stations. Segment N
+runs from the station with sequence N to the station with sequence N+1.
+For every (journey_date, seat) the inventory keeps ONE integer where bit N
+is set when segment N is occupied, so all availability questions become
+bit operations:
+
+    overlap check  -> occupied & requested_mask != 0
+    block a seat   -> occupied |= requested_mask
+    release a seat -> occupied &= ~requested_mask
+
+Checkout holds (see seat_hold_service.py) are seat_availability rows too,
+so held segments count as occupied until the hold is booked or released.
+
+The seat_availability table stays the source of truth. A journey date is
+loaded into memory with a single query the first time it is accessed and
+is then kept in step by mark_booked / mark_released, which callers invoke
+after their transaction has committed.
+
+The cache is per process, and only the worker that committed a change
+marks it. Bookings, cancellations, modifications and hold releases in
+other workers are picked up in two ways:
+
+- A cached date is reloaded once it is SEAT_INVENTORY_TTL_SECONDS old,
+  so the seat map and listings are never staler than that.
+- A cached conflict is never the last word. Before a booking is rejected
+  as overlapping, callers reload the date with refresh() and re-check.
+  A seat freed in another worker is then bookable at once. Conflicts the
+  cache misses are caught by the segment exclusion constraint on insert.
+
+The load query runs without holding the lock. Under AsyncSession.run_sync
+it yields to the event loop, and the lock gives no exclusion between
+coroutines on the loop thread anyway. Instead, every mark_booked /
+mark_released / invalidate bumps the date's generation. A load that
+overlapped one of them is returned to its caller but not cached, so a
+snapshot taken before a commit never replaces the marked bitmaps.
+
+Next to the bitmaps, every cached date keeps a counter of occupied seats
+per segment. mark_booked / mark_released adjust it by the bits that
+actually changed (O(segments)), so a journey's occupancy - the seats taken
+on its busiest segment - is read without scanning seat_availability.
+"""
+
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import SEAT_INVENTORY_TTL_SECONDS
+from ..models.seat import SeatAvailability
+from .station_registry import StationRegistry
+
+
+class SeatInventory:
+    """Process-wide cache of occupied route segments per journey date and seat"""
+
+    # journey_date -> {seat_id: occupied segment bitmask}
+    _dates: Dict[date, Dict[int, int]] = {}
+    # journey_date -> {segment: number of seats occupied on it}
+    _segment_counts: Dict[date, Dict[int, int]] = {}
+    # journey_date -> monotonic time the date was loaded
+    _loaded_at: Dict[date, float] = {}
+    # journey_date -> changes marked since startup; _epoch is bumped by invalidate()
+    _generations: Dict[date, int] = {}
+    _epoch = 0
+    # Guards the dicts above; never held across a query
+    _lock = threading.Lock()
+
+    @staticmethod
+    def segment_mask(from_seq: int, to_seq: int) -> int:
+        """Bitmask covering segments from_seq .. to_seq-1 (e.g. 2->4 sets bits 2 and 3)"""
+        if to_seq <= from_seq:
+            return 0
+        return ((1 << (to_seq - from_seq)) - 1) << from_seq
+
+    @staticmethod
+    def _count_segments(counts: Dict[int, int], mask: int, step: int):
+        """Add step to the counter of every segment set in mask"""
+        while mask:
+            lowest = mask & -mask
+            segment = lowest.bit_length() - 1
+            counts[segment] = counts.get(segment, 0) + step
+            mask ^= lowest
+
+    @staticmethod
+    def station_sequence(db: Session, station_id: int) -> Optional[int]:
+        """Route sequence for a station ID (None if the station doesn't exist)"""
+        station = StationRegistry.current(db).by_id(station_id)
+        return station.sequence if station else None
+
+    @staticmethod
+    def _generation(journey_date: date) -> Tuple[int, int]:
+        return SeatInventory._epoch, SeatInventory._generations.get(journey_date, 0)
+
+    @staticmethod
+    def _bump(journey_date: date):
+        """Record a change to a date (caller holds the lock)"""
+        SeatInventory._generations[journey_date] = SeatInventory._generations.get(journey_date, 0) + 1
+
+    @staticmethod
+    def _read(db: Session, journey_date: date) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """Bitmaps and segment counters for a date straight from seat_availability"""
+        rows = db.query(
+            SeatAvailability.seat_id,
+            SeatAvailability.from_station_id,
+            SeatAvailability.to_station_id,
+            SeatAvailability.from_sequence,
+            SeatAvailability.to_sequence
+        ).filter(
+            SeatAvailability.journey_date == journey_date,
+            SeatAvailability.is_booked == True
+        ).all()
+
+        seat_masks = {}
+        for row in rows:
+            # Rows written before the sequence columns existed fall back to the station map
+            from_seq = row.from_sequence or SeatInventory.station_sequence(db, row.from_station_id)
+            to_seq = row.to_sequence or SeatInventory.station_sequence(db, row.to_station_id)
+            if from_seq is None or to_seq is None:
+                continue
+            seat_masks[row.seat_id] = (
+                seat_masks.get(row.seat_id, 0) | SeatInventory.segment_mask(from_seq, to_seq)
+            )
+
+        counts = {}
+        for mask in seat_masks.values():
+            SeatInventory._count_segments(counts, mask, 1)
+        return seat_masks, counts
+
+    @staticmethod
+    def _get_date(db: Session, journey_date: date) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Bitmaps and segment counters for a date, loaded with one query on
+        first access or once the cached copy is older than the TTL
+        Read the returned dicts under the lock (marks mutate them in place).
+        """
+        with SeatInventory._lock:
+            seat_masks = SeatInventory._dates.get(journey_date)
+            loaded_at = SeatInventory._loaded_at.get(journey_date, 0.0)
+            if seat_masks is not None and time.monotonic() - loaded_at < SEAT_INVENTORY_TTL_SECONDS:
+                return seat_masks, SeatInventory._segment_counts[journey_date]
+            generation = SeatInventory._generation(journey_date)
+
+        seat_masks, counts = SeatInventory._read(db, journey_date)  # No lock held: may yield
+
+        with SeatInventory._lock:
+            if SeatInventory._generation(journey_date) == generation:
+                SeatInventory._dates[journey_date] = seat_masks
+                SeatInventory._segment_counts[journey_date] = counts
+                SeatInventory._loaded_at[journey_date] = time.monotonic()
+        return seat_masks, counts
+
+    @staticmethod
+    def refresh(db: Session, journey_date: date):
+        """Reload a date from the database (re-check a cached conflict before rejecting)"""
+        SeatInventory.invalidate(journey_date)
+        SeatInventory._get_date(db, journey_date)
+
+    @staticmethod
+    def occupied_seat_ids(
+        db: Session,
+        journey_date: date,
+        from_seq: int,
+        to_seq: int
+    ) -> Set[int]:
+        """IDs of all seats with at least one occupied segment inside from_seq -> to_seq"""
+        requested = SeatInventory.segment_mask(from_seq, to_seq)
+        seat_masks, _ = SeatInventory._get_date(db, journey_date)
+        with SeatInventory._lock:
+            return {seat_id for seat_id, mask in seat_masks.items() if mask & requested}
+
+    @staticmethod
+    def is_free(
+        db: Session,
+        seat_id: int,
+        journey_date: date,
+        from_seq: int,
+        to_seq: int
+    ) -> bool:
+        """True when none of the requested segments are occupied for this seat"""
+        requested = SeatInventory.segment_mask(from_seq, to_seq)
+        seat_masks, _ = SeatInventory._get_date(db, journey_date)
+        return not (seat_masks.get(seat_id, 0) & requested)
+
+    @staticmethod
+    def seat_masks(db: Session, journey_date: date) -> Dict[int, int]:
+        """Snapshot of every occupied seat's segment bitmap for a date"""
+        seat_masks, _ = SeatInventory._get_date(db, journey_date)
+        with SeatInventory._lock:
+            return dict(seat_masks)
+
+    @staticmethod
+    def segment_occupancy(db: Session, journey_date: date, from_seq: int, to_seq: int) -> int:
+        """Seats occupied on the busiest segment between from_seq and to_seq"""
+        _, counts = SeatInventory._get_date(db, journey_date)
+        with SeatInventory._lock:
+            return max((counts.get(segment, 0) for segment in range(from_seq, to_seq)), default=0)
+
+    @staticmethod
+    def mark_booked(seat_id: int, journey_date: date, from_seq: int, to_seq: int):
+        """Record a committed seat block (only bumps the generation if the date isn't cached)"""
+        with SeatInventory._lock:
+            SeatInventory._bump(journey_date)
+            seat_masks = SeatInventory._dates.get(journey_date)
+            if seat_masks is not None:
+                previous = seat_masks.get(seat_id, 0)
+                occupied = previous | SeatInventory.segment_mask(from_seq, to_seq)
+                seat_masks[seat_id] = occupied
+                SeatInventory._count_segments(
+                    SeatInventory._segment_counts[journey_date], occupied & ~previous, 1
+                )
+
+    @staticmethod
+    def mark_released(seat_id: int, journey_date: date, from_seq: int, to_seq: int):
+        """Record a committed seat release (only bumps the generation if the date isn't cached)"""
+        with SeatInventory._lock:
+            SeatInventory._bump(journey_date)
+            seat_masks = SeatInventory._dates.get(journey_date)
+            if seat_masks is not None:
+                previous = seat_masks.get(seat_id, 0)
+                remaining = previous & ~SeatInventory.segment_mask(from_seq, to_seq)
+                if remaining:
+                    seat_masks[seat_id] = remaining
+                else:
+                    seat_masks.pop(seat_id, None)
+                SeatInventory._count_segments(
+                    SeatInventory._segment_counts[journey_date], previous & ~remaining, -1
+                )
+
+    @staticmethod
+    def invalidate(journey_date: Optional[date] = None):
+        """Drop cached bitmaps for one date (or everything) so they reload from the DB"""
+        with SeatInventory._lock:
+            if journey_date is None:
+                SeatInventory._epoch += 1
+                SeatInventory._dates.clear()
+                SeatInventory._segment_counts.clear()
+                SeatInventory._loaded_at.clear()
+            else:
+                SeatInventory._bump(journey_date)
+                SeatInventory._dates.pop(journey_date, None)
+                SeatInventory._segment_counts.pop(journey_date, None)
+                SeatInventory._loaded_at.pop(journey_date, None)
@@ -1,11 +1,16 @@
 """Seat Service - Business logic for seat availability and pricing"""
 
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from ..models.seat import Seat, SeatAvailability
 from ..models.station import Station
-from ..core.common import SeatNotAvailableException, DoubleBookingException
-from ..utils.utils import calculate_distance_between_stations, get_distance_multiplier, get_seat_type_multiplier
+from ..core.common import SeatNotAvailableException, DoubleBookingException, is_segment_conflict
+from .seat_inventory import SeatInventory
+from .fare_matrix import FareMatrix
 
 
 class SeatService:
@@ -26,23 +31,14 @@ class SeatService:
         dt_journey_date = datetime.strptime(journey_date, "%Y-%m-%d").date()
 
         # Get station positions in route sequence
-        from_seq = db.query(Station.sequence).filter(Station.id == from_station_id).scalar()
-        to_seq = db.query(Station.sequence).filter(Station.id == to_station_id).scalar()
+        from_seq = SeatInventory.station_sequence(db, from_station_id)
+        to_seq = SeatInventory.station_sequence(db, to_station_id)
         
         if from_seq is None or to_seq is None:
             return []  # Invalid station IDs
 
-        # Find seats booked on overlapping route segments for this date
-        # Overlap occurs when: existing_start < new_end AND existing_end > new_start
-        overlapping_bookings = db.query(SeatAvailability).filter(
-            SeatAvailability.journey_date == dt_journey_date,
-            SeatAvailability.is_booked == True,
-            SeatAvailability.from_station_id < to_seq,  # Existing booking starts before our destination
-            SeatAvailability.to_station_id > from_seq   # Existing booking ends after our origin
-        ).all()
-        
-        # Collect all seat IDs that are blocked
-        blocked_seat_ids = {record.seat_id for record in overlapping_bookings}
+        # Seats with any occupied segment inside our route (bitmask overlap, no DB scan)
+        blocked_seat_ids = SeatInventory.occupied_seat_ids(db, dt_journey_date, from_seq, to_seq)
         
         # Return only operational seats that aren't blocked
         available_seats = db.query(Seat).filter(
@@ -52,6 +48,63 @@ class SeatService:
         
         return available_seats
     
+    @staticmethod
+    def get_seat_map(
+        db: Session,
+        from_station: Station,
+        to_station: Station,
+        journey_date: str
+    ) -> list:
+        """
+        Full bus layout for a route and date: every seat with its booked/available
+        status, deck and fare for the requested segment
+        One seat query plus the cached segment bitmaps; pricing is done in memory.
+        """
+        # Parse date string to date object
+        dt_journey_date = datetime.strptime(journey_date, "%Y-%m-%d").date()
+
+        seats = db.query(Seat).order_by(Seat.seat_number).all()
+        occupied = SeatInventory.occupied_seat_ids(
+            db, dt_journey_date, from_station.sequence, to_station.sequence
+        )
+        prices = SeatService.calculate_seat_prices(db, [seat.id for seat in seats], from_station, to_station)
+
+        seat_map = []
+        for seat in seats:
+            if not seat.is_available:
+                status = "unavailable"  # Out of service
+            elif seat.id in occupied:
+                status = "booked"
+            else:
+                status = "available"
+            seat_map.append({
+                "seat_id": seat.seat_number,
+                "seat_number": seat.seat_number,
+                "type": seat.seat_type,
+                "deck": seat.seat_type,  # Lower berths on the lower deck, upper on the upper
+                "status": status,
+                "price": prices[seat.id]
+            })
+        return seat_map
+    
+    @staticmethod
+    def get_seat_by_number(db: Session, seat_number: str) -> Optional[Seat]:
+        """Look up a seat by its user-facing number (e.g. S10)"""
+        return db.query(Seat).filter(Seat.seat_number == seat_number).first()
+    
+    @staticmethod
+    def is_seat_free(
+        db: Session,
+        seat_id: int,
+        from_station: Station,
+        to_station: Station,
+        journey_date: date
+    ) -> bool:
+        """True when no segment of the route is occupied for this seat on this date"""
+        return SeatInventory.is_free(
+            db, seat_id, journey_date, from_station.sequence, to_station.sequence
+        )
+    
     @staticmethod
     def check_seat_availability(
         db: Session,
@@ -73,38 +126,69 @@ class SeatService:
             raise SeatNotAvailableException("Seat does not exist or is not available")
         
         # Get station sequence numbers for overlap detection
-        from_seq = db.query(Station.sequence).filter(Station.id == from_station_id).scalar()
-        to_seq = db.query(Station.sequence).filter(Station.id == to_station_id).scalar()
+        from_seq = SeatInventory.station_sequence(db, from_station_id)
+        to_seq = SeatInventory.station_sequence(db, to_station_id)
         
-        # Fetch all existing bookings for this seat on this date
-        existing_bookings = db.query(SeatAvailability).join(
-            Station, SeatAvailability.from_station_id == Station.id
-        ).filter(
-            SeatAvailability.seat_id == seat.id,
-            SeatAvailability.journey_date == dt_journey_date,
-            SeatAvailability.is_booked == True
-        ).all()
+        # Overlap occurs when any requested segment bit is already set for this seat.
+        # The cache may miss a release made by another worker: re-check the database first.
+        if not SeatInventory.is_free(db, seat.id, dt_journey_date, from_seq, to_seq):
+            SeatInventory.refresh(db, dt_journey_date)
+        if not SeatInventory.is_free(db, seat.id, dt_journey_date, from_seq, to_seq):
+            raise DoubleBookingException(
+                "Seat is already booked for overlapping route segment"
+            )
         
-        # Check each existing booking for route overlap
-        for booking in existing_bookings:
-            # Get sequence numbers of the existing booking's route
-            existing_from_seq = db.query(Station.sequence).filter(
-                Station.id == booking.from_station_id
-            ).scalar()
-            existing_to_seq = db.query(Station.sequence).filter(
-                Station.id == booking.to_station_id
-            ).scalar()
-            
-            # Detect overlap: new route overlaps if it starts before existing ends AND ends after existing starts
-            if from_seq < existing_to_seq and to_seq > existing_from_seq:
-                raise DoubleBookingException(
-                    f"Seat is already booked for overlapping route segment"
-                )
+        return True
+    
+    @staticmethod
+    def check_seats_availability(
+        db: Session,
+        seat_numbers: List[str],
+        from_station: Station,
+        to_station: Station,
+        journey_date: str
+    ) -> List[Seat]:
+        """
+        Batched version of check_seat_availability for multi-seat bookings
+        Resolves every seat in one query and checks all overlaps in memory,
+        reporting ALL problem seats at once instead of failing on the first.
+        Returns the Seat rows in request order so callers can price/block them
+        without looking them up again.
+        """
+        # Parse date string
+        dt_journey_date = datetime.strptime(journey_date, "%Y-%m-%d").date()
+
+        # Resolve all requested seats in a single query
+        seats = db.query(Seat).filter(Seat.seat_number.in_(seat_numbers)).all()
+        seats_by_number = {seat.seat_number: seat for seat in seats}
         
-        if existing_bookings:
-            raise DoubleBookingException("Seat is already booked for this route segment")
+        unavailable = [
+            number for number in seat_numbers
+            if number not in seats_by_number or not seats_by_number[number].is_available
+        ]
+        if unavailable:
+            raise SeatNotAvailableException(
+                f"Seats do not exist or are not available: {', '.join(unavailable)}"
+            )
         
-        return True
+        # Overlap check for every seat against the cached segment bitmaps. The
+        # cache may miss a release made by another worker, so a conflict is
+        # re-checked against the database before the booking is rejected.
+        for refreshed in (False, True):
+            if refreshed:
+                SeatInventory.refresh(db, dt_journey_date)
+            occupied = SeatInventory.occupied_seat_ids(
+                db, dt_journey_date, from_station.sequence, to_station.sequence
+            )
+            conflicts = [number for number in seat_numbers if seats_by_number[number].id in occupied]
+            if not conflicts:
+                break
+        if conflicts:
+            raise DoubleBookingException(
+                f"Seats already booked for overlapping route segment: {', '.join(conflicts)}"
+            )
+        
+        return [seats_by_number[number] for number in seat_numbers]
     
     @staticmethod
     def block_seat(
@@ -125,17 +209,81 @@ class SeatService:
             raise SeatNotAvailableException(f"Seat {seat_number} not found")
         seat_id = seat.id
 
+        from_seq = SeatInventory.station_sequence(db, from_station_id)
+        to_seq = SeatInventory.station_sequence(db, to_station_id)
+
         # Create booking record to block this seat for this route segment
         seat_availability = SeatAvailability(
             seat_id=seat_id,
             from_station_id=from_station_id,
             to_station_id=to_station_id,
+            from_sequence=from_seq,
+            to_sequence=to_seq,
             journey_date=dt_journey_date,
             is_booked=True,
             booked_by=booking_id
         )
         db.add(seat_availability)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not is_segment_conflict(e):
+                raise
+            SeatInventory.invalidate(dt_journey_date)
+            raise DoubleBookingException(f"Seat {seat_number} was just booked for an overlapping route segment")
+
+        # Keep the in-memory bitmap in step with the committed row
+        SeatInventory.mark_booked(seat_id, dt_journey_date, from_seq, to_seq)
+    
+    @staticmethod
+    def block_seats(
+        db: Session,
+        seat_ids: List[int],
+        from_station: Station,
+        to_station: Station,
+        journey_date: str,
+        booking_id: Optional[int],
+        hold_token: Optional[str] = None,
+        hold_expires_at: Optional[datetime] = None
+    ):
+        """
+        Reserve several already-resolved seats for a booking (or a checkout hold)
+        Runs inside the caller's transaction (no commit) so a booking's seats
+        are blocked all-or-nothing; the caller marks them in SeatInventory
+        once its commit succeeds.
+        Holds pass booking_id=None with a hold token and expiry instead.
+        """
+        # Parse date string
+        dt_journey_date = datetime.strptime(journey_date, "%Y-%m-%d").date()
+
+        # One multi-row INSERT regardless of how many seats are booked.
+        # The segment exclusion constraint rejects overlaps at the database
+        # level, so concurrent bookings can't both slip through.
+        try:
+            db.execute(insert(SeatAvailability), [
+                {
+                    "seat_id": seat_id,
+                    "from_station_id": from_station.id,
+                    "to_station_id": to_station.id,
+                    "from_sequence": from_station.sequence,
+                    "to_sequence": to_station.sequence,
+                    "journey_date": dt_journey_date,
+                    "is_booked": True,
+                    "booked_by": booking_id,
+                    "hold_token": hold_token,
+                    "hold_expires_at": hold_expires_at
+                }
+                for seat_id in seat_ids
+            ])
+        except IntegrityError as e:
+            if not is_segment_conflict(e):
+                raise
+            # Another worker won the race - our cached bitmaps for this date are stale
+            SeatInventory.invalidate(dt_journey_date)
+            raise DoubleBookingException(
+                "Seats were just booked by another request for an overlapping route segment"
+            )
     
     @staticmethod
     def release_seat(
@@ -161,6 +309,12 @@ class SeatService:
         if seat_availability:
             db.delete(seat_availability)
             db.commit()
+            SeatInventory.mark_released(
+                seat_id,
+                dt_journey_date,
+                SeatInventory.station_sequence(db, from_station_id),
+                SeatInventory.station_sequence(db, to_station_id)
+            )
     
     @staticmethod
     def calculate_seat_price(
@@ -171,21 +325,110 @@ class SeatService:
     ) -> int:
         """
         Calculate dynamic price: Base Price × Distance Multiplier × Seat Type Multiplier
-        Longer distances and lower berths cost more
+        Longer distances and lower berths cost more (looked up in the precomputed fare matrix)
         """
-        # Fetch seat and station details
-        seat = db.query(Seat).filter(Seat.id == seat_id).first()
-        from_station = db.query(Station).filter(Station.id == from_station_id).first()
-        to_station = db.query(Station).filter(Station.id == to_station_id).first()
-        
-        # Calculate distance traveled (in km)
-        distance = calculate_distance_between_stations(
-            from_station.distance_km,
-            to_station.distance_km
+        return FareMatrix.fare(
+            db,
+            seat_id,
+            SeatInventory.station_sequence(db, from_station_id),
+            SeatInventory.station_sequence(db, to_station_id)
+        )
+    
+    @staticmethod
+    def calculate_seat_prices(
+        db: Session,
+        seat_ids: List[int],
+        from_station: Station,
+        to_station: Station
+    ) -> Dict[int, int]:
+        """Price several seats for one route, keyed by seat ID (fare matrix lookups, no queries)"""
+        return FareMatrix.fares(db, seat_ids, from_station.sequence, to_station.sequence)
+
+
+class AsyncSeatService:
+    """
+    Async facade over SeatService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync.
+    """
+    
+    @staticmethod
+    async def get_available_seats(
+        db: AsyncSession,
+        from_station_id: int,
+        to_station_id: int,
+        journey_date: str
+    ) -> list:
+        return await db.run_sync(
+            SeatService.get_available_seats, from_station_id, to_station_id, journey_date
+        )
+    
+    @staticmethod
+    async def get_seat_map(
+        db: AsyncSession,
+        from_station: Station,
+        to_station: Station,
+        journey_date: str
+    ) -> list:
+        return await db.run_sync(SeatService.get_seat_map, from_station, to_station, journey_date)
+    
+    @staticmethod
+    async def get_seat_by_number(db: AsyncSession, seat_number: str) -> Optional[Seat]:
+        return await db.run_sync(SeatService.get_seat_by_number, seat_number)
+    
+    @staticmethod
+    async def is_seat_free(
+        db: AsyncSession,
+        seat_id: int,
+        from_station: Station,
+        to_station: Station,
+        journey_date: date
+    ) -> bool:
+        return await db.run_sync(
+            SeatService.is_seat_free, seat_id, from_station, to_station, journey_date
+        )
+    
+    @staticmethod
+    async def check_seat_availability(
+        db: AsyncSession,
+        seat_number: str,
+        from_station_id: int,
+        to_station_id: int,
+        journey_date: str
+    ) -> bool:
+        return await db.run_sync(
+            SeatService.check_seat_availability, seat_number, from_station_id, to_station_id, journey_date
+        )
+    
+    @staticmethod
+    async def check_seats_availability(
+        db: AsyncSession,
+        seat_numbers: List[str],
+        from_station: Station,
+        to_station: Station,
+        journey_date: str
+    ) -> List[Seat]:
+        return await db.run_sync(
+            SeatService.check_seats_availability, seat_numbers, from_station, to_station, journey_date
+        )
+    
+    @staticmethod
+    async def calculate_seat_price(
+        db: AsyncSession,
+        seat_id: int,
+        from_station_id: int,
+        to_station_id: int
+    ) -> int:
+        return await db.run_sync(
+            SeatService.calculate_seat_price, seat_id, from_station_id, to_station_id
+        )
+    
+    @staticmethod
+    async def calculate_seat_prices(
+        db: AsyncSession,
+        seat_ids: List[int],
+        from_station: Station,
+        to_station: Station
+    ) -> Dict[int, int]:
+        return await db.run_sync(
+            SeatService.calculate_seat_prices, seat_ids, from_station, to_station
         )
-        
-        distance_multiplier = get_distance_multiplier(distance)
-        seat_type_multiplier = get_seat_type_multiplier(seat.seat_type)
-        
-        final_price = int(seat.base_price * distance_multiplier * seat_type_multiplier)
-        return final_price
@@ -0,0 +1,195 @@
+"""Station Registry - Immutable in-memory view of the route's stations
+
+The route has a handful of static stations, yet nearly every request used
+to resolve names and sequences with its own queries. The registry is built
+once (at application startup, or lazily on first use) and maps name, id
+and sequence to read-only StationRecord entries. It also precomputes the
+distance and scheduled travel time for every forward segment.
+
+A registry snapshot is never mutated. StationService.create_station
+builds a fresh one with StationRegistry.load and swaps it in atomically.
+The stations query runs without holding the lock (under
+AsyncSession.run_sync it yields to the event loop, where another
+coroutine waiting on a threading.Lock would block the loop thread); the
+lock only guards the swap.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.station import Station
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True)
+class StationRecord:
+    """Read-only copy of a Station row (safe to share between requests)"""
+    id: int
+    name: str
+    arrival_time: str
+    departure_time: str
+    distance_km: int
+    sequence: int
+
+
+def _parse_minutes(value: str) -> Optional[int]:
+    """'HH:MM' -> minutes after midnight (None for placeholders like '--')"""
+    try:
+        parsed = datetime.strptime(value, "%H:%M")
+    except (TypeError, ValueError):
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def _build_timeline(stations: Tuple[StationRecord, ...]) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """
+    Elapsed minutes since the origin's departure at which the bus arrives at
+    and departs from each station (keyed by sequence)
+    Clock times wrap past midnight, so each step adds the forward difference.
+    """
+    timeline = {}
+    elapsed: Optional[int] = 0
+    previous_clock: Optional[int] = None
+
+    for index, station in enumerate(stations):
+        arrival_clock = _parse_minutes(station.arrival_time)
+        departure_clock = _parse_minutes(station.departure_time)
+
+        if index == 0:
+            # Journey time is measured from the origin's departure
+            arrival_at, departure_at = None, 0
+            previous_clock = departure_clock
+            elapsed = 0 if departure_clock is not None else None
+        else:
+            if elapsed is None or previous_clock is None or arrival_clock is None:
+                elapsed = None
+            else:
+                elapsed += (arrival_clock - previous_clock) % MINUTES_PER_DAY
+            arrival_at = elapsed
+
+            if elapsed is not None and departure_clock is not None:
+                departure_at = elapsed + (departure_clock - arrival_clock) % MINUTES_PER_DAY
+                elapsed, previous_clock = departure_at, departure_clock
+            else:
+                departure_at = None
+                elapsed = None
+
+        timeline[station.sequence] = (arrival_at, departure_at)
+    return timeline
+
+
+def format_duration(minutes: Optional[int]) -> str:
+    """Minutes -> '8h 45m' ('TBD' when the schedule doesn't allow computing it)"""
+    if minutes is None:
+        return "TBD"
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+class StationRegistry:
+    """Immutable station lookup with precomputed segment distances and durations"""
+
+    _current: Optional["StationRegistry"] = None
+    # Bumped on every load/reset so a lazy build that raced with one is discarded
+    _generation = 0
+    _lock = threading.Lock()
+
+    def __init__(self, stations: List[StationRecord]):
+        self.stations: Tuple[StationRecord, ...] = tuple(sorted(stations, key=lambda s: s.sequence))
+        self._by_id = {s.id: s for s in self.stations}
+        self._by_name = {s.name: s for s in self.stations}
+        self._by_name_ci = {s.name.lower(): s for s in self.stations}
+        self._by_sequence = {s.sequence: s for s in self.stations}
+
+        # Every forward (from_sequence, to_sequence) pair: distance and travel time
+        timeline = _build_timeline(self.stations)
+        self._distances: Dict[Tuple[int, int], int] = {}
+        self._durations: Dict[Tuple[int, int], Optional[int]] = {}
+        for i, origin in enumerate(self.stations):
+            for destination in self.stations[i + 1:]:
+                key = (origin.sequence, destination.sequence)
+                self._distances[key] = abs(destination.distance_km - origin.distance_km)
+                departs = timeline[origin.sequence][1]
+                arrives = timeline[destination.sequence][0]
+                self._durations[key] = (
+                    arrives - departs if departs is not None and arrives is not None else None
+                )
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+    def by_id(self, station_id: int) -> Optional[StationRecord]:
+        return self._by_id.get(station_id)
+
+    def by_name(self, name: str, ignore_case: bool = False) -> Optional[StationRecord]:
+        if ignore_case:
+            return self._by_name_ci.get(name.lower())
+        return self._by_name.get(name)
+
+    def by_sequence(self, sequence: int) -> Optional[StationRecord]:
+        return self._by_sequence.get(sequence)
+
+    def distance_km(self, from_seq: int, to_seq: int) -> Optional[int]:
+        """Distance travelled between two stations (forward direction only)"""
+        return self._distances.get((from_seq, to_seq))
+
+    def duration_minutes(self, from_seq: int, to_seq: int) -> Optional[int]:
+        """Scheduled minutes from departure at from_seq to arrival at to_seq"""
+        return self._durations.get((from_seq, to_seq))
+
+    def duration_label(self, from_seq: int, to_seq: int) -> str:
+        """Human readable journey duration (e.g. '8h 45m')"""
+        return format_duration(self.duration_minutes(from_seq, to_seq))
+
+    # -------------------------------------------------------------------------
+    # Process-wide snapshot management
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _read(db: Session) -> "StationRegistry":
+        """Build a snapshot from the stations table (does not make it current)"""
+        rows = db.query(Station).order_by(Station.sequence).all()
+        return StationRegistry([
+            StationRecord(
+                id=row.id,
+                name=row.name,
+                arrival_time=row.arrival_time,
+                departure_time=row.departure_time,
+                distance_km=row.distance_km,
+                sequence=row.sequence
+            )
+            for row in rows
+        ])
+
+    @staticmethod
+    def load(db: Session) -> "StationRegistry":
+        """Build a fresh snapshot from the stations table and make it current"""
+        registry = StationRegistry._read(db)
+        with StationRegistry._lock:
+            StationRegistry._generation += 1
+            StationRegistry._current = registry
+        return registry
+
+    @staticmethod
+    def current(db: Session) -> "StationRegistry":
+        """The active snapshot (loaded on first use if startup didn't load it)"""
+        registry = StationRegistry._current
+        if registry is None:
+            generation = StationRegistry._generation
+            registry = StationRegistry._read(db)  # No lock held: may yield to the event loop
+            with StationRegistry._lock:
+                if generation == StationRegistry._generation and StationRegistry._current is None:
+                    StationRegistry._current = registry
+                else:
+                    registry = StationRegistry._current or registry
+        return registry
+
+    @staticmethod
+    def reset():
+        """Forget the current snapshot (next access reloads it)"""
+        with StationRegistry._lock:
+            StationRegistry._generation += 1
+            StationRegistry._current = None
@@ -1,6 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models.station import Station
 from ..core.common import InvalidStationException
+from .seat_inventory import SeatInventory
+from .fare_matrix import FareMatrix
+from .station_registry import StationRegistry, StationRecord
 
 
 class StationService:
@@ -9,23 +13,20 @@ class StationService:
     @staticmethod
     def get_all_stations(db: Session) -> list:
         """Get all stations ordered by sequence"""
-        stations = db.query(Station).order_by(Station.sequence).all()
-        return stations
+        return list(StationRegistry.current(db).stations)
     
     @staticmethod
-    def get_station_by_id(db: Session, station_id: int) -> Station:
+    def get_station_by_id(db: Session, station_id: int) -> StationRecord:
         """Get station details by ID"""
-        station = db.query(Station).filter(Station.id == station_id).first()
+        station = StationRegistry.current(db).by_id(station_id)
         if not station:
             raise InvalidStationException("Station not found")
         return station
     
     @staticmethod
-    def get_station_by_name(db: Session, name: str) -> Station:
+    def get_station_by_name(db: Session, name: str) -> StationRecord:
         """Get station details by name"""
-        station = db.query(Station).filter(
-            Station.name.ilike(name)
-        ).first()
+        station = StationRegistry.current(db).by_name(name, ignore_case=True)
         if not station:
             raise InvalidStationException("Station not found")
         return station
@@ -54,4 +55,46 @@ class StationService:
         db.add(station)
         db.commit()
         db.refresh(station)
+        
+        # Route changed - swap in a fresh registry, then drop everything derived from it
+        StationRegistry.load(db)
+        FareMatrix.invalidate()
+        SeatInventory.invalidate()
         return station
+
+
+class AsyncStationService:
+    """
+    Async facade over StationService for AsyncSession callers (API routes)
+    Each method runs the synchronous implementation through AsyncSession.run_sync.
+    """
+    
+    @staticmethod
+    async def get_registry(db: AsyncSession) -> StationRegistry:
+        """Current station registry (only touches the DB if it isn't loaded yet)"""
+        return await db.run_sync(StationRegistry.current)
+    
+    @staticmethod
+    async def get_all_stations(db: AsyncSession) -> list:
+        return await db.run_sync(StationService.get_all_stations)
+    
+    @staticmethod
+    async def get_station_by_id(db: AsyncSession, station_id: int) -> StationRecord:
+        return await db.run_sync(StationService.get_station_by_id, station_id)
+    
+    @staticmethod
+    async def get_station_by_name(db: AsyncSession, name: str) -> StationRecord:
+        return await db.run_sync(StationService.get_station_by_name, name)
+    
+    @staticmethod
+    async def create_station(
+        db: AsyncSession,
+        name: str,
+        arrival_time: str,
+        departure_time: str,
+        distance_km: int,
+        sequence: int
+    ) -> Station:
+        return await db.run_sync(
+            StationService.create_station, name, arrival_time, departure_time, distance_km, sequence
+        )
@@ -0,0 +1,262 @@
+"""Waitlist Service - Queue seat-count bookings and promote them on cancellation
+
+A seat-count booking made with waitlist_if_full=True on a full route is
+stored as a WAITLISTED booking plus a waitlist_entries row instead of
+failing. The pending rows of one (journey_date, from_sequence,
+to_sequence) form a FIFO queue ordered by id.
+
+The queues live only in the database - every worker sees entries queued
+through any other worker. When a cancellation releases seats, promote()
+runs INSIDE the cancellation's transaction and reads the head of each
+segment queue whose segment overlaps the released segments:
+
+    SELECT ... WHERE journey_date = :d AND from_sequence = :f AND to_sequence = :t
+               AND promoted_at IS NULL
+    ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED
+
+an index range scan on ix_waitlist_entries_pending. A route with S stations
+has at most S*(S-1)/2 segment queues (10 here), so the work per
+cancellation depends on the number of promotions, not on how many entries
+are waiting. A head locked by a concurrent promotion is skipped rather
+than waited for; that transaction promotes it or releases it.
+
+Each promotion gets its own SAVEPOINT: a conflict (e.g. a concurrent hold on
+the chosen seat) skips that entry without failing the cancellation. The
+inventory learns about promoted seats once the caller's commit succeeds
+(promotions_committed).
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from ..core.common import DoubleBookingException, SeatNotAvailableException
+from ..models.booking import Booking
+from ..models.waitlist import WaitlistEntry
+from .seat_allocator import SeatAllocator
+from .seat_inventory import SeatInventory
+from .seat_service import SeatService
+from .station_registry import StationRegistry
+
+SegmentKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class WaitlistItem:
+    """Copy of a pending waitlist_entries row"""
+    entry_id: int
+    booking_id: int
+    journey_date: date
+    from_seq: int
+    to_seq: int
+    seat_count: int
+    berth_type: Optional[str]
+    adjacent: bool
+
+
+@dataclass(frozen=True)
+class Promotion:
+    """A waitlisted booking that received seats in the current transaction"""
+    item: WaitlistItem
+    seat_ids: Tuple[int, ...]
+
+
+class WaitlistService:
+    """Per-(date, segment) FIFO queues of waitlisted bookings, read from the database"""
+
+    @staticmethod
+    def _item(row) -> WaitlistItem:
+        return WaitlistItem(
+            entry_id=row.id,
+            booking_id=row.booking_id,
+            journey_date=row.journey_date,
+            from_seq=row.from_sequence,
+            to_seq=row.to_sequence,
+            seat_count=row.seat_count,
+            berth_type=row.berth_type,
+            adjacent=bool(row.adjacent)
+        )
+
+    @staticmethod
+    def _head(db: Session, journey_date: date, key: SegmentKey) -> Optional[WaitlistItem]:
+        """Earliest pending entry of one segment queue not locked by another promotion"""
+        row = db.query(WaitlistEntry).filter(
+            WaitlistEntry.journey_date == journey_date,
+            WaitlistEntry.from_sequence == key[0],
+            WaitlistEntry.to_sequence == key[1],
+            WaitlistEntry.promoted_at == None
+        ).order_by(WaitlistEntry.id).limit(1).with_for_update(skip_locked=True).first()
+        return WaitlistService._item(row) if row is not None else None
+
+    @staticmethod
+    def _segment_keys(db: Session, freed: int) -> List[SegmentKey]:
+        """Every (from_seq, to_seq) of the route that overlaps the freed segments"""
+        stations = StationRegistry.current(db).stations
+        return [
+            (origin.sequence, destination.sequence)
+            for i, origin in enumerate(stations)
+            for destination in stations[i + 1:]
+            if freed & SeatInventory.segment_mask(origin.sequence, destination.sequence)
+        ]
+
+    # -------------------------------------------------------------------------
+    # Joining / leaving (caller commits)
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def add_entry(
+        db: Session,
+        booking_id: int,
+        journey_date: date,
+        from_seq: int,
+        to_seq: int,
+        seat_count: int,
+        berth_type: Optional[str],
+        adjacent: bool
+    ) -> WaitlistItem:
+        """Insert the waitlist row inside the caller's transaction (no commit)"""
+        entry = db.execute(
+            insert(WaitlistEntry).returning(WaitlistEntry),
+            [{
+                "booking_id": booking_id,
+                "journey_date": journey_date,
+                "from_sequence": from_seq,
+                "to_sequence": to_seq,
+                "seat_count": seat_count,
+                "berth_type": berth_type,
+                "adjacent": adjacent
+            }]
+        ).scalar_one()
+        return WaitlistService._item(entry)
+
+    @staticmethod
+    def remove_entry(db: Session, booking_id: int) -> Optional[int]:
+        """Delete a waitlisted booking's entry (no commit); returns its ID (None if it had none)"""
+        entry = db.query(WaitlistEntry).filter(
+            WaitlistEntry.booking_id == booking_id,
+            WaitlistEntry.promoted_at == None
+        ).first()
+        if entry is None:
+            return None
+        entry_id = entry.id
+        db.delete(entry)
+        return entry_id
+
+    # -------------------------------------------------------------------------
+    # Promotion on cancellation
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _promote_entry(db: Session, item: WaitlistItem, seat_ids: List[int]) -> Optional[bool]:
+        """
+        Confirm one waitlisted booking on the given seats inside a SAVEPOINT
+        Returns True when promoted, False on a seat conflict (entry keeps its
+        place) and None when the entry was already promoted or removed elsewhere.
+        """
+        stations = StationRegistry.current(db)
+        from_station = stations.by_sequence(item.from_seq)
+        to_station = stations.by_sequence(item.to_seq)
+
+        savepoint = db.begin_nested()
+        try:
+            claimed = db.execute(
+                update(WaitlistEntry).where(
+                    WaitlistEntry.id == item.entry_id,
+                    WaitlistEntry.promoted_at == None
+                ).values(promoted_at=datetime.utcnow())
+            ).rowcount
+            if claimed != 1:
+                savepoint.rollback()
+                return None
+
+            fares = SeatService.calculate_seat_prices(db, seat_ids, from_station, to_station)
+            SeatService.block_seats(
+                db, seat_ids, from_station, to_station,
+                item.journey_date.strftime("%Y-%m-%d"), item.booking_id
+            )
+            db.execute(
+                update(Booking).where(
+                    Booking.id == item.booking_id,
+                    Booking.status == "WAITLISTED"
+                ).values(
+                    status="CONFIRMED",
+                    total_amount=Booking.total_amount + sum(fares.values())
+                )
+            )
+            savepoint.commit()
+            return True
+        except DoubleBookingException:
+            savepoint.rollback()
+            return False
+
+    @staticmethod
+    def promote(
+        db: Session,
+        journey_date: date,
+        released: List[Tuple[int, int, int]],
+        claimed: List[Tuple[int, int, int]] = ()
+    ) -> List[Promotion]:
+        """
+        Give released seats to waitlisted bookings, earliest entry first
+        released: (seat_id, from_seq, to_seq) segments the caller has just
+        freed in its open transaction; claimed: segments it has just taken
+        (e.g. a booking moved to another seat). Nothing is committed here.
+        """
+        if not released:
+            return []
+
+        # Occupancy as it will be after the caller commits
+        masks = SeatInventory.seat_masks(db, journey_date)
+        freed = 0
+        for seat_id, from_seq, to_seq in released:
+            segment = SeatInventory.segment_mask(from_seq, to_seq)
+            masks[seat_id] = masks.get(seat_id, 0) & ~segment
+            freed |= segment
+        for seat_id, from_seq, to_seq in claimed:
+            masks[seat_id] = masks.get(seat_id, 0) | SeatInventory.segment_mask(from_seq, to_seq)
+
+        # Current head of every queue this cancellation could serve (None = empty)
+        heads: Dict[SegmentKey, Optional[WaitlistItem]] = {
+            key: WaitlistService._head(db, journey_date, key)
+            for key in WaitlistService._segment_keys(db, freed)
+        }
+
+        promotions = []
+        while True:
+            waiting = [(item.entry_id, key, item) for key, item in heads.items() if item is not None]
+            if not waiting:
+                return promotions
+
+            # Oldest entry among the eligible queue heads goes first
+            _, key, item = min(waiting)
+            try:
+                seats = SeatAllocator.allocate(
+                    db, item.seat_count, item.from_seq, item.to_seq, journey_date,
+                    berth_type=item.berth_type, adjacent=item.adjacent, masks=masks
+                )
+            except SeatNotAvailableException:
+                heads[key] = None  # The head keeps its place; later entries must not overtake it
+                continue
+
+            seat_ids = [seat.id for seat in seats]
+            outcome = WaitlistService._promote_entry(db, item, seat_ids)
+            if outcome is False:
+                heads[key] = None
+                continue
+
+            if outcome:
+                segment = SeatInventory.segment_mask(item.from_seq, item.to_seq)
+                for seat_id in seat_ids:
+                    masks[seat_id] = masks.get(seat_id, 0) | segment
+                promotions.append(Promotion(item=item, seat_ids=tuple(seat_ids)))
+            heads[key] = WaitlistService._head(db, journey_date, key)
+
+    @staticmethod
+    def promotions_committed(promotions: List[Promotion]):
+        """The caller's commit succeeded - the promoted seats are now occupied"""
+        for promotion in promotions:
+            for seat_id in promotion.seat_ids:
+                SeatInventory.mark_booked(
+                    seat_id, promotion.item.journey_date, promotion.item.from_seq, promotion.item.to_seq
+                )
@@ -1,5 +1,7 @@
+import base64
 import re
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 
 # =============================================================================
 # VALIDATION UTILITIES
@@ -91,3 +93,21 @@ def get_seat_type_multiplier(seat_type: str) -> float:
     if seat_type.lower() == "lower":
         return 1.3
     return 1.0
+
+# =============================================================================
+# PAGINATION UTILITIES
+# =============================================================================
+
+def encode_history_cursor(created_at: datetime, booking_id: int) -> str:
+    """Opaque cursor pointing just past a (created_at, id) position in booking history"""
+    raw = f"{created_at.isoformat()}|{booking_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_history_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Cursor -> (created_at, id); None if the cursor is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, booking_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(booking_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
@@ -0,0 +1,38 @@
+"""
+Export the pickled booking predictor to the JSON scorer artifact
+
+Reads app/ml/saved_models/booking_predictor.pkl and encoders.pkl (needs
+scikit-learn and joblib) and writes booking_predictor.json into a new model
+registry version directory (saved_models/vN/). The API scores it with
+app/ml/scorer.py without importing sklearn.
+
+Training (app/ml/train_model.py) writes the JSON artifact itself; this
+script is for models trained before that.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import joblib
+from app.ml.scorer import export_logistic_artifact
+from app.services.model_registry import ARTIFACT_NAME, ModelRegistry
+
+MODEL_DIR = project_root / 'app' / 'ml' / 'saved_models'
+
+
+def export():
+    model = joblib.load(MODEL_DIR / 'booking_predictor.pkl')
+    encoders = joblib.load(MODEL_DIR / 'encoders.pkl')
+    features = [str(name) for name in model.feature_names_in_]
+
+    path = ModelRegistry.new_version_dir() / ARTIFACT_NAME
+    export_logistic_artifact(model, encoders, features, path)
+    print(f"✅ Model artifact written to {path}")
+    print(f"   Serve it with POST /api/v1/admin/model/reload {{\"version\": \"{path.parent.name}\"}}")
+
+
+if __name__ == "__main__":
+    export()
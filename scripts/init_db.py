@@ -13,9 +13,12 @@ from app.config import STATIONS, BUS_CONFIG
 # Import all models to register them with Base
 from app.models.user import User
 from app.models.booking import Booking, BookingMeal
+from app.models.id_block import IdBlock
+from app.models.idempotency import IdempotencyKey
 from app.models.meal import Meal
 from app.models.seat import Seat
 from app.models.station import Station
+from app.models.waitlist import WaitlistEntry
 
 def init_database():
     """
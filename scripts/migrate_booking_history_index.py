@@ -0,0 +1,45 @@
+"""
+Migration: composite index for keyset-paginated booking history
+
+Adds ix_bookings_email_created_at_id on bookings (email, created_at DESC,
+id DESC). GET /api/v1/bookings/history/{email} pages through one email's
+bookings newest first using (created_at, id) cursors; with this index every
+page is a short range scan, however deep into the history it is.
+
+Fresh databases created by scripts/init_db.py already get the index. The
+index is built CONCURRENTLY so bookings keep flowing while it runs, and
+IF NOT EXISTS makes re-running the script safe.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from app.database import engine
+
+INDEX_NAME = "ix_bookings_email_created_at_id"
+
+CREATE_INDEX = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME}
+        ON bookings (email, created_at DESC, id DESC)
+"""
+
+
+def migrate():
+    """Build the booking history index (outside a transaction, as CONCURRENTLY requires)"""
+    print("=" * 50)
+    print("🚀 Adding booking history index...")
+    print("=" * 50)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print(f"\n➡️  Creating index {INDEX_NAME}...")
+        conn.execute(text(CREATE_INDEX))
+
+    print("\n✨ Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,51 @@
+"""
+Migration: checkout seat holds on seat_availability
+
+Adds hold_token / hold_expires_at columns (and their indexes) used by
+POST /api/v1/holds. A hold is a seat_availability row with is_booked=True
+and booked_by NULL, so the existing segment exclusion constraint already
+keeps holds and bookings from overlapping - no constraint change is needed.
+
+Fresh databases created by scripts/init_db.py already get this schema.
+Every step is idempotent, so re-running it is safe.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from app.database import engine
+
+MIGRATION_STEPS = [
+    ("Adding hold columns",
+     """
+     ALTER TABLE seat_availability
+         ADD COLUMN IF NOT EXISTS hold_token VARCHAR(64),
+         ADD COLUMN IF NOT EXISTS hold_expires_at TIMESTAMP
+     """),
+    ("Indexing hold tokens",
+     "CREATE INDEX IF NOT EXISTS ix_seat_availability_hold_token ON seat_availability (hold_token)"),
+    ("Indexing hold expiry (drives the expired-hold reaper)",
+     "CREATE INDEX IF NOT EXISTS ix_seat_availability_hold_expires_at ON seat_availability (hold_expires_at)"),
+]
+
+
+def migrate():
+    """Apply the seat hold migration in a single transaction"""
+    print("=" * 50)
+    print("🚀 Migrating seat_availability for seat holds...")
+    print("=" * 50)
+
+    with engine.begin() as conn:
+        for description, statement in MIGRATION_STEPS:
+            print(f"\n➡️  {description}...")
+            conn.execute(text(statement))
+
+    print("\n✨ Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,105 @@
+"""
+Migration: database-enforced segment non-overlap on seat_availability
+
+Adds from_sequence / to_sequence columns (each booking's segment as a
+range of station sequences), backfills them from the stations table and
+adds a GiST exclusion constraint so PostgreSQL itself rejects two booked
+rows for the same seat and date whose [from_sequence, to_sequence) ranges
+overlap.
+
+Fresh databases created by scripts/init_db.py already get this schema; run
+this script once against databases created before the change. Every step
+is idempotent, so re-running it is safe.
+
+The constraint can't be added while overlapping rows exist - the script
+lists any offenders and stops so they can be resolved by hand first.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from app.database import engine
+
+CONSTRAINT_NAME = "ex_seat_availability_segment_overlap"
+
+MIGRATION_STEPS = [
+    ("Enabling btree_gist extension",
+     "CREATE EXTENSION IF NOT EXISTS btree_gist"),
+    ("Adding segment sequence columns",
+     """
+     ALTER TABLE seat_availability
+         ADD COLUMN IF NOT EXISTS from_sequence INTEGER,
+         ADD COLUMN IF NOT EXISTS to_sequence INTEGER
+     """),
+    ("Backfilling segment sequences from stations",
+     """
+     UPDATE seat_availability sa
+        SET from_sequence = fs.sequence,
+            to_sequence = ts.sequence
+       FROM stations fs, stations ts
+      WHERE fs.id = sa.from_station_id
+        AND ts.id = sa.to_station_id
+        AND (sa.from_sequence IS NULL OR sa.to_sequence IS NULL)
+     """),
+]
+
+OVERLAP_CHECK = """
+    SELECT a.id, b.id, a.seat_id, a.journey_date
+      FROM seat_availability a
+      JOIN seat_availability b
+        ON a.seat_id = b.seat_id
+       AND a.journey_date = b.journey_date
+       AND a.id < b.id
+       AND a.is_booked AND b.is_booked
+       AND int4range(a.from_sequence, a.to_sequence) && int4range(b.from_sequence, b.to_sequence)
+"""
+
+ADD_CONSTRAINT = f"""
+    ALTER TABLE seat_availability
+        ADD CONSTRAINT {CONSTRAINT_NAME}
+        EXCLUDE USING gist (
+            seat_id WITH =,
+            journey_date WITH =,
+            int4range(from_sequence, to_sequence) WITH &&
+        ) WHERE (is_booked)
+"""
+
+
+def migrate():
+    """Apply the segment exclusion migration in a single transaction"""
+    print("=" * 50)
+    print("🚀 Migrating seat_availability segments...")
+    print("=" * 50)
+
+    with engine.begin() as conn:
+        for description, statement in MIGRATION_STEPS:
+            print(f"\n➡️  {description}...")
+            conn.execute(text(statement))
+
+        exists = conn.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+            {"name": CONSTRAINT_NAME}
+        ).first()
+        if exists:
+            print(f"\n✅ Constraint {CONSTRAINT_NAME} already present")
+            return
+
+        overlaps = conn.execute(text(OVERLAP_CHECK)).all()
+        if overlaps:
+            print("\n❌ Overlapping bookings must be resolved before adding the constraint:")
+            for first_id, second_id, seat_id, journey_date in overlaps:
+                print(f"   - rows {first_id} & {second_id} (seat {seat_id}, {journey_date})")
+            raise SystemExit(1)
+
+        print(f"\n➡️  Adding exclusion constraint {CONSTRAINT_NAME}...")
+        conn.execute(text(ADD_CONSTRAINT))
+
+    print("\n✨ Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
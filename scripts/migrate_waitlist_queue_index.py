@@ -0,0 +1,47 @@
+"""
+Migration: index for reading waitlist queue heads from the database
+
+Adds ix_waitlist_entries_pending on waitlist_entries (journey_date,
+from_sequence, to_sequence, id) WHERE promoted_at IS NULL. On a
+cancellation, WaitlistService.promote() reads the head of every affected
+segment queue with ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED; with this
+index each read is a short range scan over pending entries.
+
+Fresh databases created by scripts/init_db.py already get the index. The
+index is built CONCURRENTLY so bookings keep flowing while it runs, and
+IF NOT EXISTS makes re-running the script safe.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from app.database import engine
+
+INDEX_NAME = "ix_waitlist_entries_pending"
+
+CREATE_INDEX = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME}
+        ON waitlist_entries (journey_date, from_sequence, to_sequence, id)
+        WHERE promoted_at IS NULL
+"""
+
+
+def migrate():
+    """Build the waitlist queue index (outside a transaction, as CONCURRENTLY requires)"""
+    print("=" * 50)
+    print("🚀 Adding waitlist queue index...")
+    print("=" * 50)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print(f"\n➡️  Creating index {INDEX_NAME}...")
+        conn.execute(text(CREATE_INDEX))
+
+    print("\n✨ Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
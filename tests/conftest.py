@@ -1,15 +1,29 @@
+import asyncio
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.api import dependencies
 from app.api.dependencies import get_db
 from app.database import Base
 from app.main import app
 from app.models.booking import Booking, BookingMeal
+from app.models.id_block import IdBlock
+from app.models.idempotency import IdempotencyKey
 from app.models.meal import Meal
 from app.models.seat import Seat, SeatAvailability
 from app.models.station import Station
+from app.models.waitlist import WaitlistEntry
+from app.services.fare_matrix import FareMatrix
+from app.services.id_service import IdService
+from app.services.idempotency_service import IdempotencyService
+from app.services.seat_inventory import SeatInventory
+from app.services.station_registry import StationRegistry
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -19,11 +33,46 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# API routes use AsyncSession; point them at the same SQLite file via aiosqlite.
+# NullPool because TestClient may drive each request on a fresh event loop.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def run_async_with_timeout(make_coroutine, seconds=10):
+    """
+    asyncio.run(make_coroutine()) on a separate thread, failing after `seconds`
+    A thread lock held across an awaited query blocks the event loop itself,
+    so asyncio.wait_for could never fire - the join timeout still does.
+    """
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = asyncio.run(make_coroutine())
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), f"Event loop still blocked after {seconds}s (deadlock)"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
 
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    StationRegistry.reset()
+    SeatInventory.invalidate()
+    FareMatrix.invalidate()
+    IdempotencyService.reset()
+    IdService.reset()
     db = TestingSessionLocal()
     try:
         yield db
@@ -33,11 +82,12 @@ def db_session():
 
 @pytest.fixture(scope="function")
 def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.rollback()
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                await session.rollback()
 
     app.dependency_overrides[get_db] = override_get_db
     test_client = TestClient(app)
@@ -45,6 +95,13 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def admin_headers(monkeypatch):
+    """Configure an admin key and return the headers that carry it"""
+    monkeypatch.setattr(dependencies, "ADMIN_API_KEY", "test-admin-key")
+    return {"X-Admin-Key": "test-admin-key"}
+
+
 @pytest.fixture(scope="function")
 def seed_data(db_session):
     stations = [
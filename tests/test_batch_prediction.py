@@ -0,0 +1,104 @@
+import json
+
+from app.api.v1 import predictions
+from app.services.model_registry import ModelRegistry
+from app.services.prediction_service import PredictionService
+
+
+def _requests(count):
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    return [
+        {
+            "days_before_journey": index % 366,
+            "current_occupancy_percent": index % 101,
+            "seat_type": ("lower", "upper", "middle")[index % 3],
+            "route_type": ("full", "partial")[index % 2],
+            "day_of_week": days[index % 7],
+            "seats_requested": index % 10 + 1,
+            "is_holiday_season": index % 5 == 0,
+            "booking_hour": index % 24,
+        }
+        for index in range(count)
+    ]
+
+
+def test_batch_matches_single_endpoint_in_order(client):
+    requests = _requests(50)
+    response = client.post("/prediction/booking-confirmation/batch", json=requests)
+    assert response.status_code == 200
+    predictions = response.json()["predictions"]
+    assert len(predictions) == 50
+
+    for request, prediction in zip(requests[:10], predictions):
+        single = client.post("/prediction/booking-confirmation", json=request).json()
+        assert prediction == single
+
+
+def test_batch_accepts_ndjson(client):
+    requests = _requests(5)
+    body = "\n".join(json.dumps(request) for request in requests) + "\n"
+    response = client.post(
+        "/prediction/booking-confirmation/batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    expected = client.post("/prediction/booking-confirmation/batch", json=requests).json()
+    assert response.json() == expected
+
+
+def test_ndjson_is_parsed_as_it_streams(client, monkeypatch):
+    requests = _requests(4)
+    text = "\n".join(json.dumps(request) for request in requests)  # No trailing newline
+
+    def chunks(size):
+        for start in range(0, len(text), size):
+            yield text[start:start + size].encode()
+
+    # Lines split across chunks are reassembled
+    response = client.post(
+        "/prediction/booking-confirmation/batch",
+        content=chunks(40),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json() == client.post("/prediction/booking-confirmation/batch", json=requests).json()
+
+    # Past the row limit the rest of the body is never parsed
+    monkeypatch.setattr(predictions, "PREDICTION_BATCH_MAX_ROWS", 3)
+    response = client.post(
+        "/prediction/booking-confirmation/batch",
+        content=text + "\nnot json\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+
+
+def test_batch_rejects_invalid_rows(client):
+    response = client.post(
+        "/prediction/booking-confirmation/batch", json=[{"booking_hour": 3}, {"booking_hour": 30}]
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"]["index"] == 1
+
+    assert client.post("/prediction/booking-confirmation/batch", json={"booking_hour": 3}).status_code == 400
+
+
+def test_batch_scoring_is_vectorized(monkeypatch):
+    requests = _requests(2000)
+    PredictionService.predict_batch(requests[:1])  # Load the model
+
+    model = ModelRegistry.current().scorer
+    calls = []
+    original = model.predict_proba
+
+    def counting_predict_proba(matrix):
+        calls.append(matrix.shape)
+        return original(matrix)
+
+    monkeypatch.setattr(model, "predict_proba", counting_predict_proba)
+    batch = PredictionService.predict_batch(requests)
+
+    # The whole batch is scored by a single call over one feature matrix
+    assert calls == [(2000, 8)]
+    assert batch[:200] == [PredictionService.predict(request) for request in requests[:200]]
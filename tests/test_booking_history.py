@@ -0,0 +1,69 @@
+from datetime import date, datetime, timedelta
+
+from app.models.booking import Booking
+
+
+def _add_bookings(db_session, seed_data, count, email="agent@example.com"):
+    stations = seed_data["stations"]
+    created = datetime(2026, 1, 1, 9, 0)
+    for index in range(count):
+        journey = date(2026, 3, 1) + timedelta(days=index)
+        db_session.add(Booking(
+            booking_reference=f"BUS-AHM-MUM-{index:04d}",
+            pnr=f"PNR{index:06d}",
+            user_name="Agent",
+            email=email,
+            phone="9876543210",
+            from_station_id=stations[0].id,
+            to_station_id=stations[4].id,
+            booking_date="2026-01-01",
+            journey_date=journey.strftime("%Y-%m-%d"),
+            status="CANCELLED" if index % 3 == 0 else "CONFIRMED",
+            total_amount=1000 + index,
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            created_at=created + timedelta(minutes=index // 2),
+        ))
+    db_session.commit()
+
+
+def test_history_pages_cover_every_booking_once(client, db_session, seed_data):
+    _add_bookings(db_session, seed_data, 7)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/bookings/history/agent@example.com", params=params)
+        assert page.status_code == 200
+        body = page.json()
+        seen.extend(entry["booking_id"] for entry in body["bookings"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"BUS-AHM-MUM-{index:04d}" for index in reversed(range(7))]
+    first = client.get("/api/v1/bookings/history/agent@example.com", params={"limit": 1}).json()
+    assert set(first["bookings"][0]) == {
+        "booking_id", "pnr", "from_station", "to_station", "journey_date", "status", "total_amount", "created_at"
+    }
+    assert first["bookings"][0]["from_station"] == "Ahmedabad"
+
+
+def test_history_filters_and_rejects_bad_cursor(client, db_session, seed_data):
+    _add_bookings(db_session, seed_data, 7)
+
+    cancelled = client.get(
+        "/api/v1/bookings/history/agent@example.com", params={"status": "CANCELLED"}
+    ).json()
+    assert [entry["pnr"] for entry in cancelled["bookings"]] == ["PNR000006", "PNR000003", "PNR000000"]
+
+    ranged = client.get(
+        "/api/v1/bookings/history/agent@example.com",
+        params={"date_from": "2026-03-02", "date_to": "2026-03-04"},
+    ).json()
+    assert [entry["journey_date"] for entry in ranged["bookings"]] == ["2026-03-04", "2026-03-03", "2026-03-02"]
+
+    assert client.get(
+        "/api/v1/bookings/history/agent@example.com", params={"cursor": "not-a-cursor"}
+    ).status_code == 400
@@ -0,0 +1,178 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.booking import Booking
+from app.models.seat import SeatAvailability
+from app.schemas.schemas import BookingModification
+from app.services import booking_modification_service
+from app.services.booking_modification_service import BookingModificationService, segment_difference
+from app.services.booking_service import BookingService
+from app.services.seat_inventory import SeatInventory
+from app.services.seat_service import SeatService
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(from_station, to_station, email="modify@example.com", **selection):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "passenger_details": {"name": "Modify User", "contact": "9876543210", "email": email},
+        "meals": [],
+        **selection,
+    }
+
+
+def test_segment_difference():
+    assert segment_difference(1, 5, 2, 4) == [(1, 2), (4, 5)]
+    assert segment_difference(2, 4, 1, 5) == []
+    assert segment_difference(1, 3, 3, 5) == [(1, 3)]
+
+
+def test_drop_seat_refunds_removed_fare(client, db_session, seed_data):
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seats=["L01", "U01"])
+    ).json()
+    stations = seed_data["stations"]
+    upper_fare = SeatService.calculate_seat_price(db_session, seed_data["seats"][1].id, stations[0].id, stations[-1].id)
+
+    response = client.patch(f"/api/v1/bookings/{booking['booking_id']}", json={"drop_seats": ["U01"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["booking"]["booking_id"] == booking["booking_id"]
+    assert body["booking"]["pnr"] == booking["pnr"]
+    assert body["booking"]["seats"] == ["L01"]
+    assert body["refund_status"] == "FULL_REFUND"
+    assert body["additional_charge"] == 0
+    assert body["booking"]["total_amount"] == booking["total_amount"] - body["refund_amount"]
+    assert body["refund_amount"] == upper_fare
+
+    # The dropped seat is free again, the kept one is not
+    assert client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", "next@example.com", seats=["U01"])
+    ).status_code == 200
+    assert client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", "next@example.com", seats=["L01"])
+    ).status_code == 409
+
+
+def test_late_drop_keeps_retained_fare_in_total(client, db_session, seed_data, monkeypatch):
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seats=["L01", "U01"])
+    ).json()
+    stations = seed_data["stations"]
+    upper_fare = SeatService.calculate_seat_price(db_session, seed_data["seats"][1].id, stations[0].id, stations[-1].id)
+
+    class EighteenHoursBefore(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.combine(TRAVEL_DATE, datetime.min.time()) - timedelta(hours=18)
+
+    monkeypatch.setattr(booking_modification_service, "datetime", EighteenHoursBefore)
+    response = client.patch(f"/api/v1/bookings/{booking['booking_id']}", json={"drop_seats": ["U01"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["refund_status"] == "PARTIAL_REFUND"
+    assert body["refund_amount"] == int(upper_fare * 0.5)
+    # Only the refund leaves the total; the retained half of the dropped fare stays paid
+    assert body["booking"]["total_amount"] == booking["total_amount"] - body["refund_amount"]
+    assert body["booking"]["total_amount"] > booking["total_amount"] - upper_fare
+
+
+def _refund_recorded(db_session, reference):
+    return db_session.query(Booking).filter(Booking.booking_reference == reference).one().refund_amount
+
+
+def test_cancelling_a_modified_booking_adds_to_its_refund(client, db_session, seed_data):
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seats=["L01", "U01"])
+    ).json()
+    dropped = client.patch(f"/api/v1/bookings/{booking['booking_id']}", json={"drop_seats": ["U01"]}).json()
+    assert dropped["refund_amount"] > 0
+
+    cancelled = client.delete(f"/api/v1/bookings/{booking['booking_id']}").json()
+    assert cancelled["refund_amount"] == dropped["booking"]["total_amount"]
+    assert _refund_recorded(db_session, booking["booking_id"]) == dropped["refund_amount"] + cancelled["refund_amount"]
+
+    # Trip cancellation adds to the modification refund the same way
+    trip = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", "trip@example.com", seats=["U01", "L02"])
+    ).json()
+    dropped = client.patch(f"/api/v1/bookings/{trip['booking_id']}", json={"drop_seats": ["L02"]}).json()
+    db_session.expire_all()
+
+    result = BookingService.cancel_trip(db_session, TRAVEL_DATE, refund_percentage=50)
+    trip_refund = dropped["booking"]["total_amount"] // 2
+    assert [row.refund_amount for row in result["refunds"]] == [trip_refund]
+    assert result["summary"]["total_refund"] == trip_refund
+    db_session.expire_all()
+    assert _refund_recorded(db_session, trip["booking_id"]) == dropped["refund_amount"] + trip_refund
+
+
+def test_shorten_and_swap_write_only_the_diff(client, db_session, seed_data):
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seats=["L01", "U01"])
+    ).json()
+    block_ids = {row.id for row in db_session.query(SeatAvailability).all()}
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        result = BookingModificationService.modify_booking(
+            db_session,
+            booking["booking_id"],
+            BookingModification(to_station="Surat", swap_seats={"U01": "L02"}),
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+
+    # One executemany UPDATE for both seat rows plus the booking UPDATE
+    assert len(statements) == 2
+    assert result["refund_amount"] > 0
+    rows = db_session.query(SeatAvailability).all()
+    assert {row.id for row in rows} == block_ids
+    assert {(row.seat_id, row.from_sequence, row.to_sequence) for row in rows} == {
+        (seed_data["seats"][0].id, 1, 3),
+        (seed_data["seats"][2].id, 1, 3),
+    }
+
+    # Freed segments show up in the inventory straight away
+    assert SeatInventory.is_free(db_session, seed_data["seats"][1].id, TRAVEL_DATE, 1, 5)
+    assert SeatInventory.is_free(db_session, seed_data["seats"][0].id, TRAVEL_DATE, 3, 5)
+    assert not SeatInventory.is_free(db_session, seed_data["seats"][2].id, TRAVEL_DATE, 2, 3)
+
+
+def test_extension_is_charged_and_conflicts_rejected(client, db_session, seed_data):
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Vapi", seats=["L01"])
+    ).json()
+    client.post("/api/v1/bookings/", json=_booking_payload("Vapi", "Mumbai", "other@example.com", seats=["L01"]))
+
+    blocked = client.patch(f"/api/v1/bookings/{booking['booking_id']}", json={"to_station": "Mumbai"})
+    assert blocked.status_code == 409
+
+    # Past 300 km the distance multiplier goes up, so the longer trip costs more
+    extended = client.patch(
+        f"/api/v1/bookings/{booking['booking_id']}", json={"to_station": "Mumbai", "swap_seats": {"L01": "L02"}}
+    )
+    assert extended.status_code == 200
+    body = extended.json()
+    assert body["additional_charge"] > 0
+    assert body["refund_amount"] == 0
+    assert body["booking"]["seats"] == ["L02"]
+    assert body["booking"]["journey_details"]["to_station"] == "Mumbai"
+    assert body["booking"]["total_amount"] == booking["total_amount"] + body["additional_charge"]
+
+    assert client.patch(f"/api/v1/bookings/{booking['booking_id']}", json={}).status_code == 422
+    assert client.patch(
+        f"/api/v1/bookings/{booking['booking_id']}", json={"drop_seats": ["L02"]}
+    ).status_code == 400
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+
+from app.schemas.schemas import BookingCreate
+from app.services.booking_service import BookingService
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_data(seats, meals=()):
+    return BookingCreate(
+        from_station="Vadodara",
+        to_station="Mumbai",
+        travel_date=TRAVEL_DATE,
+        seats=seats,
+        passenger_details={"name": "Response User", "contact": "9876543210", "email": "response@example.com"},
+        meals=[{"meal_id": meal_id, "quantity": 2} for meal_id in meals],
+    )
+
+
+def _count_statements(db_session, action):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        result = action()
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+    return result, statements
+
+
+def test_booking_response_is_loaded_in_one_query(db_session, seed_data):
+    meal_ids = [meal.id for meal in seed_data["meals"][:2]]
+    booking, _ = BookingService.create_booking(db_session, _booking_data(["U01", "L01"], meal_ids))
+    reference = booking.booking_reference
+    db_session.expunge_all()
+
+    response, statements = _count_statements(
+        db_session, lambda: BookingService.get_booking_response_by_reference(db_session, reference)
+    )
+
+    assert len(statements) == 1
+    assert response["seats"] == ["L01", "U01"]
+    assert sorted(meal["meal_id"] for meal in response["meals"]) == sorted(meal_ids)
+    assert response["journey_details"]["from_station"] == "Vadodara"
+
+
+def test_new_booking_response_reuses_in_session_data(db_session, seed_data):
+    db_session.expire_on_commit = False
+    booking_data = _booking_data(["L02"], [seed_data["meals"][0].id])
+    booking, seat_numbers = BookingService.create_booking(db_session, booking_data)
+
+    fresh, statements = _count_statements(
+        db_session, lambda: BookingService.new_booking_response(db_session, booking, seat_numbers, booking_data)
+    )
+
+    assert statements == []
+    assert jsonable_encoder(fresh) == jsonable_encoder(
+        BookingService.get_booking_response_object(db_session, booking.id)
+    )
+
+
+def test_allocated_seats_are_returned_without_touching_the_request(db_session, seed_data):
+    db_session.expire_on_commit = False
+    booking_data = BookingCreate(
+        from_station="Vadodara",
+        to_station="Mumbai",
+        travel_date=TRAVEL_DATE,
+        seat_count=2,
+        passenger_details={"name": "Response User", "contact": "9876543210", "email": "response@example.com"},
+    )
+    before = booking_data.dict()
+
+    booking, seat_numbers = BookingService.create_booking(db_session, booking_data)
+
+    assert booking_data.dict() == before
+    assert len(seat_numbers) == 2
+    response = BookingService.new_booking_response(db_session, booking, seat_numbers, booking_data)
+    assert response["seats"] == sorted(seat_numbers)
+    assert response["seats"] == BookingService.get_booking_response_object(db_session, booking.id)["seats"]
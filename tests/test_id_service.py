@@ -0,0 +1,70 @@
+import asyncio
+from datetime import date, timedelta
+
+from app.core.common import ID_ALPHABET, FeistelPermutation, generate_booking_reference, generate_pnr
+from app.models.id_block import IdBlock
+from app.services.id_service import IdService
+from tests.conftest import TestingAsyncSessionLocal, run_async_with_timeout
+
+
+def test_feistel_permutation_is_a_bijection():
+    permutation = FeistelPermutation(1000, "test-key")
+    shuffled = [permutation.permute(value) for value in range(1000)]
+    assert sorted(shuffled) == list(range(1000))
+    assert shuffled[:10] != list(range(10))
+
+    other = FeistelPermutation(1000, "other-key")
+    assert [other.permute(value) for value in range(10)] != shuffled[:10]
+
+
+def test_identifiers_are_unique_and_well_formed():
+    pnrs = {generate_pnr(sequence) for sequence in range(1, 5001)}
+    references = {generate_booking_reference("Ahmedabad", "Mumbai", sequence) for sequence in range(1, 5001)}
+    assert len(pnrs) == 5000
+    assert len(references) == 5000
+    assert all(len(pnr) == 9 and set(pnr) <= set(ID_ALPHABET) for pnr in pnrs)
+    assert all(reference.startswith("BUS-AHM-MUM-") and len(reference.split("-")[-1]) == 4 for reference in references)
+
+
+def test_ids_are_leased_in_blocks(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.id_service.ID_BLOCK_SIZE", 3)
+
+    first = [IdService.next_id(db_session) for _ in range(3)]
+    assert first == [1, 2, 3]
+    assert db_session.query(IdBlock).one().next_value == 4
+
+    # Another worker leases the next block; this one never reuses its numbers
+    IdService.reset()
+    assert IdService.next_id(db_session) == 4
+    db_session.expire_all()
+    assert db_session.query(IdBlock).one().next_value == 7
+
+
+def test_concurrent_leases_do_not_block_the_event_loop(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.id_service.ID_BLOCK_SIZE", 2)
+
+    async def next_id():
+        async with TestingAsyncSessionLocal() as session:
+            return await session.run_sync(IdService.next_id)
+
+    async def next_ids():
+        return await asyncio.gather(*(next_id() for _ in range(6)))
+
+    # Every caller starts on an empty block, so several lease at once
+    values = run_async_with_timeout(next_ids)
+    assert len(set(values)) == 6
+    db_session.expire_all()
+    assert max(values) < db_session.query(IdBlock).one().next_value
+
+
+def test_bookings_get_distinct_identifiers(client, seed_data):
+    payload = {
+        "from_station": "Ahmedabad",
+        "to_station": "Vadodara",
+        "travel_date": (date.today() + timedelta(days=30)).isoformat(),
+        "passenger_details": {"name": "Id User", "contact": "9876543210", "email": "ids@example.com"},
+        "meals": [],
+    }
+    bookings = [client.post("/api/v1/bookings/", json={**payload, "seats": [seat]}).json() for seat in ["L01", "U01", "L02"]]
+    assert len({booking["booking_id"] for booking in bookings}) == 3
+    assert len({booking["pnr"] for booking in bookings}) == 3
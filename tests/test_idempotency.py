@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date, timedelta
+
+from app.models.booking import Booking
+from app.schemas.schemas import BookingCreate
+from app.services.idempotency_service import IdempotencyService
+from tests.conftest import TestingAsyncSessionLocal
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(seats, email="retry@example.com"):
+    return {
+        "from_station": "Ahmedabad",
+        "to_station": "Mumbai",
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "seats": seats,
+        "passenger_details": {"name": "Retry User", "contact": "9876543210", "email": email},
+        "meals": [],
+    }
+
+
+def test_repeated_key_replays_stored_response(client, db_session, seed_data):
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/api/v1/bookings/", json=_booking_payload(["L01"]), headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/api/v1/bookings/", json=_booking_payload(["L01"]), headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # Served from the idempotency_keys table once the in-memory entry is gone
+    IdempotencyService.reset()
+    from_db = client.post("/api/v1/bookings/", json=_booking_payload(["L01"]), headers=headers)
+    assert from_db.status_code == 200
+    assert from_db.json()["booking_id"] == first.json()["booking_id"]
+
+    assert db_session.query(Booking).count() == 1
+
+
+def test_key_reused_with_different_body_is_rejected(client, seed_data):
+    headers = {"Idempotency-Key": "retry-2"}
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["L01"]), headers=headers).status_code == 200
+
+    response = client.post("/api/v1/bookings/", json=_booking_payload(["U01"]), headers=headers)
+    assert response.status_code == 422
+
+
+def test_concurrent_duplicates_share_one_booking(db_session, seed_data):
+    booking_data = BookingCreate(**_booking_payload(["L02"]))
+
+    async def submit():
+        async with TestingAsyncSessionLocal() as session:
+            return await IdempotencyService.create_booking(session, "retry-3", booking_data)
+
+    async def submit_twice():
+        return await asyncio.gather(submit(), submit())
+
+    (first, first_replayed), (second, second_replayed) = asyncio.run(submit_twice())
+
+    assert first["booking_id"] == second["booking_id"]
+    assert sorted([first_replayed, second_replayed]) == [False, True]
+    assert db_session.query(Booking).count() == 1
@@ -0,0 +1,120 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.ml.scorer import LogisticScorer
+from app.services import model_registry
+from app.services.model_registry import ModelRegistry
+from app.services.prediction_service import PredictionService
+
+
+ARTIFACT = Path(__file__).parent.parent / "app" / "ml" / "saved_models" / "v1" / "booking_predictor.json"
+REQUEST = {"days_before_journey": 3, "current_occupancy_percent": 40}
+
+
+@pytest.fixture
+def registry_dir(tmp_path, monkeypatch):
+    """Empty registry directory in place of app/ml/saved_models"""
+    monkeypatch.setattr(model_registry, "MODEL_REGISTRY_DIR", str(tmp_path))
+    ModelRegistry.reset()
+    yield tmp_path
+    ModelRegistry.reset()
+
+
+def _add_version(root, version, intercept_shift=0.0):
+    (root / version).mkdir()
+    artifact = json.loads(ARTIFACT.read_text())
+    artifact["intercept"] += intercept_shift
+    (root / version / "booking_predictor.json").write_text(json.dumps(artifact))
+
+
+def test_newest_version_is_served(registry_dir):
+    _add_version(registry_dir, "v2")
+    _add_version(registry_dir, "v10", intercept_shift=1.0)
+    assert ModelRegistry.versions() == ["v2", "v10"]
+
+    assert ModelRegistry.load().version == "v10"
+    assert ModelRegistry.current().scorer.intercept == json.loads(ARTIFACT.read_text())["intercept"] + 1.0
+    assert ModelRegistry.new_version_dir().name == "v11"
+
+
+def test_failed_load_is_not_retried_every_call(registry_dir, monkeypatch):
+    (registry_dir / "v1").mkdir()
+    (registry_dir / "v1" / "booking_predictor.json").write_text("{not json")
+    monkeypatch.setattr(model_registry, "MODEL_REFRESH_SECONDS", 0)
+
+    loads = []
+    original = LogisticScorer.load
+
+    def counting_load(path):
+        loads.append(path)
+        return original(path)
+
+    monkeypatch.setattr(LogisticScorer, "load", counting_load)
+
+    heuristic = PredictionService._predict_heuristic(REQUEST)
+    for _ in range(20):
+        assert PredictionService.predict(REQUEST) == heuristic
+    assert len(loads) == 1
+    assert "v1" in ModelRegistry.status()["failures"]
+
+    # Once the cool-down has passed, a fixed artifact is picked up
+    monkeypatch.setattr(model_registry, "MODEL_LOAD_RETRY_SECONDS", 0)
+    shutil.copy(ARTIFACT, registry_dir / "v1" / "booking_predictor.json")
+    assert PredictionService.predict(REQUEST) != heuristic
+    assert ModelRegistry.current().version == "v1"
+    assert ModelRegistry.status()["failures"] == {}
+
+
+def test_admin_reload_swaps_model(client, registry_dir, admin_headers):
+    _add_version(registry_dir, "v1")
+    _add_version(registry_dir, "v2", intercept_shift=-2.0)
+    ModelRegistry.load("v1")
+    before = client.post("/prediction/booking-confirmation", json=REQUEST).json()
+
+    response = client.post("/api/v1/admin/model/reload", json={"version": "v2"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["version"] == "v2"
+    assert (registry_dir / "CURRENT").read_text().strip() == "v2"
+    after = client.post("/prediction/booking-confirmation", json=REQUEST).json()
+    assert after["confirmation_probability"] < before["confirmation_probability"]
+
+    # A version that can't load leaves the served model alone
+    assert client.post("/api/v1/admin/model/reload", json={"version": "v9"}, headers=admin_headers).status_code == 503
+    assert client.post(
+        "/api/v1/admin/model/reload", json={"version": "../v1"}, headers=admin_headers
+    ).status_code == 422
+    status = client.get("/api/v1/admin/model", headers=admin_headers).json()
+    assert status["version"] == "v2"
+    assert status["pinned_version"] == "v2"
+    assert status["available_versions"] == ["v1", "v2"]
+
+
+def test_model_admin_endpoints_require_admin_key(client, registry_dir, admin_headers):
+    _add_version(registry_dir, "v1")
+    _add_version(registry_dir, "v2", intercept_shift=-2.0)
+    ModelRegistry.load("v1")
+
+    assert client.get("/api/v1/admin/model").status_code == 403
+    assert client.post("/api/v1/admin/model/reload", json={"version": "v2"}).status_code == 403
+    assert client.post(
+        "/api/v1/admin/model/reload", json={"version": "v2"}, headers={"X-Admin-Key": "wrong"}
+    ).status_code == 403
+
+    # Nothing was promoted
+    assert ModelRegistry.current().version == "v1"
+    assert not (registry_dir / "CURRENT").exists()
+
+
+def test_workers_follow_the_pointer(registry_dir):
+    _add_version(registry_dir, "v1")
+    _add_version(registry_dir, "v2", intercept_shift=-2.0)
+    ModelRegistry.load("v1")
+
+    # Another worker promoted v2: this one switches at its next check
+    (registry_dir / "CURRENT").write_text("v2\n")
+    assert ModelRegistry.current().version == "v1"
+    ModelRegistry._next_check = 0.0  # Refresh interval elapsed
+    assert ModelRegistry.current().version == "v2"
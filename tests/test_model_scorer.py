@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from app.ml.scorer import LogisticScorer, export_logistic_artifact
+from app.services.prediction_service import PredictionService
+
+
+MODEL_DIR = Path(__file__).parent.parent / "app" / "ml" / "saved_models"
+
+
+def _sklearn_model():
+    return joblib.load(MODEL_DIR / "booking_predictor.pkl"), joblib.load(MODEL_DIR / "encoders.pkl")
+
+
+def test_artifact_matches_sklearn(tmp_path):
+    model, encoders = _sklearn_model()
+    scorer = export_logistic_artifact(
+        model, encoders, list(model.feature_names_in_), tmp_path / "model.json"
+    )
+    assert LogisticScorer.load(tmp_path / "model.json").to_dict() == scorer.to_dict()
+
+    rng = np.random.default_rng(7)
+    matrix = np.column_stack([
+        rng.integers(0, 366, 5000),
+        rng.integers(0, 101, 5000),
+        rng.integers(0, 3, 5000),
+        rng.integers(0, 2, 5000),
+        rng.integers(0, 7, 5000),
+        rng.integers(1, 11, 5000),
+        rng.integers(0, 2, 5000),
+        rng.integers(0, 24, 5000),
+    ]).astype(float)
+    expected = model.predict_proba(matrix)[:, 1]
+
+    np.testing.assert_allclose(scorer.predict_proba(matrix), expected, rtol=1e-12)
+    np.testing.assert_allclose([scorer.probability(row) for row in matrix[:200]], expected[:200], rtol=1e-12)
+
+    for name, encoder in encoders.items():
+        codes = scorer.category_codes()[name]
+        assert [codes[value] for value in encoder.classes_] == list(encoder.transform(encoder.classes_))
+
+
+def test_committed_artifact_matches_pickle():
+    model, encoders = _sklearn_model()
+    scorer = LogisticScorer.load(MODEL_DIR / "v1" / "booking_predictor.json")
+    assert scorer.coefficients == model.coef_[0].tolist()
+    assert scorer.intercept == float(model.intercept_[0])
+    assert scorer.categories == {name: list(encoder.classes_) for name, encoder in encoders.items()}
+
+
+def test_serving_does_not_import_sklearn(tmp_path):
+    code = (
+        "import sys\n"
+        "from app.main import app\n"
+        "from app.services.model_registry import ModelRegistry\n"
+        "from app.services.prediction_service import PredictionService\n"
+        "PredictionService.predict({'days_before_journey': 3})\n"
+        "assert ModelRegistry.current() is not None\n"
+        "assert 'sklearn' not in sys.modules and 'joblib' not in sys.modules\n"
+    )
+    # Run from another directory: the model is found relative to the package, not the cwd
+    root = Path(__file__).parent.parent
+    subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=tmp_path, env={**os.environ, "PYTHONPATH": str(root)}
+    )
+    assert PredictionService.predict({"days_before_journey": 3}).confirmation_probability > 0
+
+
+def test_fast_rounding_matches_numpy():
+    rng = np.random.default_rng(11)
+    probabilities = np.concatenate([rng.random(20000), np.arange(0, 10001) / 10000])
+    for prob in probabilities:
+        # The sklearn-era formulas, on NumPy scalars
+        expected = round(min(np.float64(prob) * 100, 95), 2)
+        expected_risk = max(8.0, min(25.0, round((100 - expected) * 0.85, 2)))
+
+        result = PredictionService._ml_result(float(prob), {})
+        assert result.confirmation_probability == expected
+        assert result.cancellation_risk == expected_risk
+
+
+def test_booking_path_matches_full_prediction():
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    for index in range(500):
+        request = {
+            "days_before_journey": index % 120,
+            "current_occupancy_percent": index % 101,
+            "seat_type": ("lower", "upper", "middle")[index % 3],
+            "route_type": ("full", "partial")[index % 2],
+            "day_of_week": days[index % 7],
+            "seats_requested": index % 10 + 1,
+            "is_holiday_season": index % 5 == 0,
+            "booking_hour": index % 24,
+        }
+        expected = PredictionService.predict(request).confirmation_probability
+        assert PredictionService.confirmation_probability(request) == expected
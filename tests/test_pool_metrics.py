@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.pool_metrics import InstrumentedQueuePool
+
+
+def _engine(name=None):
+    return create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+
+def test_pool_records_checkouts_waits_and_timeouts():
+    engine = _engine()
+    metrics = engine.pool.metrics
+
+    held = engine.connect()
+    held.execute(text("SELECT 1"))
+    stats = metrics.snapshot()
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["checkouts_total"] == 1
+    assert stats["checked_out"] == 1
+    assert stats["pool_size"] == 1
+
+    # The only connection is in use, so the next checkout waits and times out
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+
+    stats = metrics.snapshot()
+    assert stats["checkout_timeouts_total"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["wait_ms_max"] >= 50
+    assert stats["wait_ms_histogram"][-1] == {"le_ms": "+Inf", "count": 2}
+    engine.dispose()
+
+
+def test_each_engine_has_its_own_metrics():
+    first, second = _engine("first"), _engine("second")
+    first.connect().close()
+    first.connect().close()
+    second.connect().close()
+
+    assert first.pool.metrics is not second.pool.metrics
+    assert first.pool.metrics.snapshot()["checkouts_total"] == 2
+    assert second.pool.metrics.snapshot()["checkouts_total"] == 1
+    assert second.pool.metrics.snapshot()["pool"] == "second"
+
+    # dispose() swaps in a new pool; its checkouts keep adding to the same metrics
+    first.dispose()
+    first.connect().close()
+    stats = first.pool.metrics.snapshot()
+    assert stats["checkouts_total"] == 3
+    assert stats["checked_out"] == 0
+    second.dispose()
+
+
+def test_db_pool_endpoint(client, admin_headers):
+    assert client.get("/api/v1/admin/db-pool").status_code == 403
+
+    response = client.get("/api/v1/admin/db-pool", headers=admin_headers)
+    assert response.status_code == 200
+    names = {pool["pool"] for pool in response.json()["pools"]}
+    assert names == {"sync", "async"}
@@ -0,0 +1,95 @@
+import asyncio
+
+from app.services import prediction_batcher
+from app.services.prediction_batcher import PredictionBatcher
+from app.services.prediction_service import PredictionService
+
+
+def _requests(count):
+    return [
+        {
+            "days_before_journey": index % 30,
+            "current_occupancy_percent": (index * 7) % 101,
+            "seat_type": ("lower", "upper")[index % 2],
+            "route_type": ("full", "partial")[index % 2],
+            "day_of_week": "Friday",
+            "seats_requested": index % 4 + 1,
+            "is_holiday_season": index % 3 == 0,
+            "booking_hour": index % 24,
+        }
+        for index in range(count)
+    ]
+
+
+def _score_concurrently(requests):
+    async def run():
+        return await asyncio.gather(*(PredictionBatcher.predict(request) for request in requests))
+
+    return asyncio.run(run())
+
+
+def _count_batches(monkeypatch):
+    sizes = []
+    original = PredictionService.predict_batch
+
+    def counting_predict_batch(requests):
+        sizes.append(len(requests))
+        return original(requests)
+
+    monkeypatch.setattr(PredictionService, "predict_batch", staticmethod(counting_predict_batch))
+    return sizes
+
+
+def test_concurrent_calls_share_one_batch(monkeypatch):
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_WINDOW_MS", 2)
+    sizes = _count_batches(monkeypatch)
+    requests = _requests(50)
+
+    results = _score_concurrently(requests)
+
+    assert sizes == [50]
+    assert results == [PredictionService.predict(request) for request in requests]
+
+
+def test_full_batch_is_scored_without_waiting(monkeypatch):
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_SIZE", 8)
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_WINDOW_MS", 60000)
+    sizes = _count_batches(monkeypatch)
+    requests = _requests(16)
+
+    results = _score_concurrently(requests)
+
+    assert sizes == [8, 8]
+    assert results == [PredictionService.predict(request) for request in requests]
+
+
+def test_batches_can_be_scored_in_a_process_pool(monkeypatch):
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_PROCESSES", 2)
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_SIZE", 10)
+    monkeypatch.setattr(prediction_batcher, "PREDICTION_BATCH_WINDOW_MS", 2)
+    requests = _requests(40)
+
+    PredictionBatcher.start()
+    try:
+        assert PredictionBatcher._executor is not None
+        results = _score_concurrently(requests)
+    finally:
+        PredictionBatcher.shutdown()
+
+    assert PredictionBatcher._executor is None
+    assert results == [PredictionService.predict(request) for request in requests]
+
+
+def test_endpoint_bypasses_batcher_by_default(client, monkeypatch):
+    async def unexpected(request_data):
+        raise AssertionError("batcher used while PREDICTION_BATCH_WINDOW_MS is 0")
+
+    monkeypatch.setattr(PredictionBatcher, "predict", staticmethod(unexpected))
+    assert not PredictionBatcher.enabled()
+
+    request = _requests(1)[0]
+    response = client.post("/prediction/booking-confirmation", json=request)
+
+    assert response.status_code == 200
+    expected = PredictionService.predict(request)
+    assert response.json()["confirmation_probability"] == expected.confirmation_probability
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+from app.services.seat_allocator import SeatAllocator, gap_leftover
+from app.services.seat_inventory import SeatInventory
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(from_station, to_station, email="group@example.com", **selection):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "passenger_details": {"name": "Group Buyer", "contact": "9876543210", "email": email},
+        "meals": [],
+        **selection,
+    }
+
+
+def test_gap_leftover_measures_fit():
+    # Route segments 1..4; seat already sold for segment 1 (Ahmedabad -> Vadodara)
+    booked = SeatInventory.segment_mask(1, 2)
+    assert gap_leftover(booked, 2, 3, 1, 4) == (2, 1)
+    assert gap_leftover(0, 2, 3, 1, 4) == (3, 2)
+    assert gap_leftover(0, 1, 5, 1, 4) == (0, 0)
+    assert gap_leftover(booked | SeatInventory.segment_mask(3, 5), 2, 3, 1, 4) == (0, 0)
+
+
+def test_partial_route_is_packed_next_to_existing_booking(client, db_session, seed_data):
+    assert client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Vadodara", seats=["L02"])
+    ).status_code == 200
+
+    response = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Vadodara", "Surat", "second@example.com", seat_count=1)
+    )
+    assert response.status_code == 200
+    assert response.json()["seats"] == ["L02"]
+
+    upper = client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Vadodara", "Surat", "third@example.com", seat_count=1, berth_type="upper"),
+    )
+    assert upper.json()["seats"] == ["U01"]
+
+
+def test_adjacent_preference_and_shortage(db_session, seed_data):
+    seats = {seat.seat_number: seat for seat in seed_data["seats"]}
+    SeatInventory.invalidate()
+    SeatInventory.seat_masks(db_session, TRAVEL_DATE)
+    SeatInventory.mark_booked(seats["U01"].id, TRAVEL_DATE, 1, 2)
+
+    best_fit = SeatAllocator.allocate(db_session, 2, 2, 3, TRAVEL_DATE)
+    assert [seat.seat_number for seat in best_fit] == ["U01", "L01"]
+
+    together = SeatAllocator.allocate(db_session, 2, 2, 3, TRAVEL_DATE, adjacent=True)
+    assert [seat.seat_number for seat in together] == ["L01", "L02"]
+
+
+def test_allocation_rejects_when_too_few_seats(client, seed_data):
+    response = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seat_count=3, berth_type="lower")
+    )
+    assert response.status_code == 400
+    assert "Only 2 lower berth seats" in response.json()["detail"]
+
+    both = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", seats=["L01"], seat_count=1)
+    )
+    assert both.status_code == 422
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.seat import SeatAvailability
+from app.services.seat_hold_service import SeatHoldService
+from app.services.seat_inventory import SeatInventory
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _hold_payload(seats, from_station="Ahmedabad", to_station="Mumbai"):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "seats": seats,
+    }
+
+
+def _booking_payload(seats, hold_token=None, from_station="Ahmedabad", to_station="Mumbai"):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "seats": seats,
+        "passenger_details": {"name": "Hold User", "contact": "9876543210", "email": "hold@example.com"},
+        "meals": [],
+        "hold_token": hold_token,
+    }
+
+
+def test_held_seats_are_occupied_and_convert_to_booking(client, db_session, seed_data):
+    hold = client.post("/api/v1/holds/", json=_hold_payload(["L01", "U01"]))
+    assert hold.status_code == 200
+    token = hold.json()["hold_token"]
+
+    # Nobody else can book or hold them meanwhile
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["L01"])).status_code == 409
+    assert client.post("/api/v1/holds/", json=_hold_payload(["U01"], "Surat", "Vapi")).status_code == 409
+    seats = client.get(
+        "/api/v1/seats/", params={"from": "Ahmedabad", "to": "Mumbai", "date": TRAVEL_DATE.isoformat()}
+    ).json()["seats"]
+    assert [seat["seat_number"] for seat in seats] == ["L02"]
+
+    # The hold's owner books them; the held rows become the booking's rows
+    booked = client.post("/api/v1/bookings/", json=_booking_payload(["U01", "L01"], token))
+    assert booked.status_code == 200
+    assert booked.json()["seats"] == ["L01", "U01"]
+
+    booking = db_session.query(Booking).one()
+    rows = db_session.query(SeatAvailability).all()
+    assert len(rows) == 2
+    assert all(row.booked_by == booking.id and row.hold_token is None for row in rows)
+
+    # A hold is used once
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["U01", "L01"], token)).status_code == 404
+
+
+def test_booking_must_match_hold(client, seed_data):
+    token = client.post("/api/v1/holds/", json=_hold_payload(["L01"])).json()["hold_token"]
+
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["L02"], token)).status_code == 400
+    assert client.post(
+        "/api/v1/bookings/", json=_booking_payload(["L01"], token, "Vadodara", "Mumbai")
+    ).status_code == 400
+
+
+def test_release_and_reap_free_held_seats(client, db_session, seed_data):
+    released = client.post("/api/v1/holds/", json=_hold_payload(["L01"])).json()["hold_token"]
+    assert client.delete(f"/api/v1/holds/{released}").json()["released_seats"] == 1
+    assert client.delete(f"/api/v1/holds/{released}").status_code == 404
+
+    client.post("/api/v1/holds/", json=_hold_payload(["L01"]))
+    client.post("/api/v1/holds/", json=_hold_payload(["U01", "L02"]))
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == {
+        seat.id for seat in seed_data["seats"]
+    }
+
+    # Expire every hold, then reap in batches smaller than the backlog
+    db_session.query(SeatAvailability).update(
+        {SeatAvailability.hold_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+
+    assert SeatHoldService.reap_expired(db_session, batch_size=2) == 3
+    assert db_session.query(SeatAvailability).count() == 0
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == set()
@@ -0,0 +1,285 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.common import InvalidStationException
+from app.models.seat import SeatAvailability
+from app.services import seat_inventory
+from app.services.fare_matrix import FareMatrix
+from app.services.seat_inventory import SeatInventory
+from app.services.seat_service import AsyncSeatService
+from app.services.station_registry import StationRegistry
+from tests.conftest import TestingAsyncSessionLocal, run_async_with_timeout
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(seats, from_station="Ahmedabad", to_station="Mumbai", email="inventory@example.com"):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "seats": seats,
+        "passenger_details": {"name": "Inventory User", "contact": "9876543210", "email": email},
+        "meals": [],
+    }
+
+
+def test_segment_mask_covers_route_segments():
+    assert SeatInventory.segment_mask(1, 5) == 0b11110
+    assert SeatInventory.segment_mask(2, 3) == 0b00100
+    assert SeatInventory.segment_mask(1, 3) & SeatInventory.segment_mask(3, 5) == 0
+    assert SeatInventory.segment_mask(3, 3) == 0
+
+
+def test_inventory_loads_existing_rows_once(db_session, seed_data):
+    stations, seats = seed_data["stations"], seed_data["seats"]
+    db_session.add(SeatAvailability(
+        seat_id=seats[0].id, from_station_id=stations[1].id, to_station_id=stations[3].id,
+        journey_date=TRAVEL_DATE, is_booked=True,
+    ))
+    db_session.commit()
+
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 3) == {seats[0].id}
+    assert SeatInventory.is_free(db_session, seats[0].id, TRAVEL_DATE, 1, 2)
+    assert SeatInventory.is_free(db_session, seats[0].id, TRAVEL_DATE, 4, 5)
+    assert not SeatInventory.is_free(db_session, seats[0].id, TRAVEL_DATE, 3, 5)
+
+    SeatInventory.mark_released(seats[0].id, TRAVEL_DATE, 2, 4)
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == set()
+
+
+def test_non_overlapping_segments_share_a_seat(client, seed_data):
+    first = client.post("/api/v1/bookings/", json=_booking_payload(["L01"], "Ahmedabad", "Surat"))
+    assert first.status_code == 200
+
+    second = client.post("/api/v1/bookings/", json=_booking_payload(["L01"], "Surat", "Mumbai"))
+    assert second.status_code == 200
+
+    overlap = client.post("/api/v1/bookings/", json=_booking_payload(["L01"], "Vadodara", "Vapi"))
+    assert overlap.status_code == 409
+
+
+def test_cancellation_frees_seat_in_listing(client, seed_data):
+    booking = client.post("/api/v1/bookings/", json=_booking_payload(["U01"]))
+    assert booking.status_code == 200
+
+    params = {"from": "Ahmedabad", "to": "Mumbai", "date": TRAVEL_DATE.isoformat()}
+    listed = {s["seat_number"] for s in client.get("/api/v1/seats/", params=params).json()["seats"]}
+    assert "U01" not in listed
+
+    cancel = client.delete(f"/api/v1/bookings/{booking.json()['booking_id']}")
+    assert cancel.status_code == 200
+
+    listed = {s["seat_number"] for s in client.get("/api/v1/seats/", params=params).json()["seats"]}
+    assert "U01" in listed
+
+
+
+def _release_in_another_worker(db_session, seat_id):
+    """Delete the seat's rows without telling this worker's inventory"""
+    db_session.query(SeatAvailability).filter(SeatAvailability.seat_id == seat_id).delete()
+    db_session.commit()
+
+
+def test_release_by_another_worker_does_not_reject_booking(client, db_session, seed_data):
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["U01"])).status_code == 200
+    _release_in_another_worker(db_session, seed_data["seats"][1].id)
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == {seed_data["seats"][1].id}
+
+    # The cached conflict is re-checked against the database before a 409
+    rebooked = client.post("/api/v1/bookings/", json=_booking_payload(["U01"], email="other@example.com"))
+    assert rebooked.status_code == 200
+
+
+def test_cached_date_expires_after_ttl(client, db_session, seed_data, monkeypatch):
+    assert client.post("/api/v1/bookings/", json=_booking_payload(["U01"])).status_code == 200
+    _release_in_another_worker(db_session, seed_data["seats"][1].id)
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == {seed_data["seats"][1].id}
+
+    monkeypatch.setattr(seat_inventory, "SEAT_INVENTORY_TTL_SECONDS", 0)
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == set()
+
+
+def test_load_overlapping_a_mark_is_not_cached(db_session, seed_data, monkeypatch):
+    seat_id = seed_data["seats"][0].id
+    original = SeatInventory._read
+
+    def read_then_commit_elsewhere(db, journey_date):
+        result = original(db, journey_date)
+        SeatInventory.mark_booked(seat_id, journey_date, 1, 5)  # Committed while the query ran
+        return result
+
+    monkeypatch.setattr(SeatInventory, "_read", staticmethod(read_then_commit_elsewhere))
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == set()
+    assert TRAVEL_DATE not in SeatInventory._dates
+
+def test_multi_seat_booking_reports_all_conflicts(client, seed_data):
+    first = client.post("/api/v1/bookings/", json=_booking_payload(["L01", "U01"]))
+    assert first.status_code == 200
+
+    second = client.post("/api/v1/bookings/", json=_booking_payload(["L01", "L02", "U01"], "Surat", "Vapi"))
+    assert second.status_code == 409
+    detail = second.json()["detail"]
+    assert "L01" in detail and "U01" in detail and "L02" not in detail
+
+
+def test_multi_seat_booking_query_count_is_constant(db_session, seed_data):
+    from sqlalchemy import event
+
+    from app.schemas.schemas import BookingCreate
+    from app.services.booking_service import BookingService
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        # Warm the inventory cache so both measured bookings take the same path
+        BookingService.create_booking(
+            db_session, BookingCreate(**_booking_payload(["L01"], "Ahmedabad", "Vadodara", "warm@example.com"))
+        )
+        statements.clear()
+        BookingService.create_booking(
+            db_session, BookingCreate(**_booking_payload(["L01"], "Surat", "Mumbai", "one@example.com"))
+        )
+        single = len(statements)
+        statements.clear()
+        BookingService.create_booking(
+            db_session,
+            BookingCreate(**_booking_payload(["L02", "U01"], email="two@example.com")),
+        )
+        multi = len(statements)
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+
+    assert multi == single
+
+
+def test_booking_rows_store_segment_sequences(client, seed_data, db_session):
+    resp = client.post("/api/v1/bookings/", json=_booking_payload(["L02"], "Vadodara", "Vapi"))
+    assert resp.status_code == 200
+
+    row = db_session.query(SeatAvailability).filter_by(seat_id=seed_data["seats"][2].id).one()
+    assert (row.from_sequence, row.to_sequence) == (2, 4)
+
+
+def test_exclusion_violation_is_detected():
+    from sqlalchemy.exc import IntegrityError
+
+    from app.core.common import is_segment_conflict
+
+    class PgError(Exception):
+        def __init__(self, sqlstate):
+            self.sqlstate = sqlstate
+
+    assert is_segment_conflict(IntegrityError("INSERT", {}, PgError("23P01")))
+    assert not is_segment_conflict(IntegrityError("INSERT", {}, PgError("23505")))
+
+
+def test_failed_booking_leaves_no_partial_blocks(db_session, seed_data, monkeypatch):
+    import pytest
+
+    from app.models.booking import Booking
+    from app.schemas.schemas import BookingCreate
+    from app.services.booking_service import BookingService
+    from app.services.seat_service import SeatService
+
+    original_block = SeatService.block_seats
+
+    def block_then_fail(*args, **kwargs):
+        original_block(*args, **kwargs)
+        raise RuntimeError("meal insert failed")
+
+    monkeypatch.setattr(SeatService, "block_seats", staticmethod(block_then_fail))
+
+    with pytest.raises(RuntimeError):
+        BookingService.create_booking(db_session, BookingCreate(**_booking_payload(["L01", "U01"])))
+
+    assert db_session.query(Booking).count() == 0
+    assert db_session.query(SeatAvailability).count() == 0
+    assert SeatInventory.occupied_seat_ids(db_session, TRAVEL_DATE, 1, 5) == set()
+
+
+def test_seat_map_lists_every_seat_with_status(client, seed_data):
+    booking = client.post("/api/v1/bookings/", json=_booking_payload(["L01"], "Ahmedabad", "Surat"))
+    assert booking.status_code == 200
+
+    params = {"from": "Vadodara", "to": "Vapi", "date": TRAVEL_DATE.isoformat(), "view": "map"}
+    resp = client.get("/api/v1/seats/", params=params)
+    assert resp.status_code == 200
+    seat_map = {s["seat_number"]: s for s in resp.json()["seats"]}
+
+    assert set(seat_map) == {"L01", "L02", "U01"}
+    assert seat_map["L01"]["status"] == "booked"
+    assert seat_map["L02"]["status"] == "available"
+    assert seat_map["U01"]["deck"] == "upper"
+    assert all(s["price"] > 0 for s in seat_map.values())
+
+
+def test_reversed_or_same_station_route_is_rejected(client, db_session, seed_data):
+    for origin, destination in (("Mumbai", "Vadodara"), ("Surat", "Surat")):
+        for view in ("available", "map"):
+            params = {"from": origin, "to": destination, "date": TRAVEL_DATE.isoformat(), "view": view}
+            assert client.get("/api/v1/seats/", params=params).status_code == 400
+
+        params = {"from": origin, "to": destination, "date": TRAVEL_DATE.isoformat()}
+        assert client.get("/api/v1/seats/L01", params=params).status_code == 400
+
+    with pytest.raises(InvalidStationException):
+        FareMatrix.fare(db_session, seed_data["seats"][0].id, 4, 2)
+    with pytest.raises(InvalidStationException):
+        FareMatrix.fares(db_session, [seed_data["seats"][0].id], 3, 3)
+
+
+def test_fare_matrix_prices_match_formula_and_rebuild_on_change(db_session, seed_data):
+    from app.services.fare_matrix import FareMatrix, compute_fare
+
+    lower = seed_data["seats"][0]
+    stations = seed_data["stations"]
+
+    expected = compute_fare(lower.base_price, lower.seat_type, stations[0].distance_km, stations[4].distance_km)
+    assert FareMatrix.fare(db_session, lower.id, 1, 5) == expected
+
+    lower.base_price = 900
+    db_session.commit()
+
+    expected = compute_fare(900, lower.seat_type, stations[0].distance_km, stations[4].distance_km)
+    assert FareMatrix.fare(db_session, lower.id, 1, 5) == expected
+
+
+def test_concurrent_cold_fare_matrix_lookups_complete(db_session, seed_data):
+    lower = seed_data["seats"][0]
+    stations = seed_data["stations"]
+    StationRegistry.reset()
+    FareMatrix.invalidate()
+
+    async def price():
+        async with TestingAsyncSessionLocal() as session:
+            return await AsyncSeatService.calculate_seat_prices(session, [lower.id], stations[0], stations[4])
+
+    async def price_concurrently():
+        return await asyncio.gather(*(price() for _ in range(4)))
+
+    results = run_async_with_timeout(price_concurrently)
+    assert results == [{lower.id: FareMatrix.fare(db_session, lower.id, 1, 5)}] * 4
+
+
+def test_fare_matrix_drops_prices_from_rolled_back_changes(db_session, seed_data):
+    lower = seed_data["seats"][0]
+    original = FareMatrix.fare(db_session, lower.id, 1, 5)
+
+    lower.base_price = 900
+    db_session.flush()
+    assert FareMatrix.fare(db_session, lower.id, 1, 5) == original  # Not dropped until the transaction ends
+
+    FareMatrix.invalidate()
+    assert FareMatrix.fare(db_session, lower.id, 1, 5) != original  # Rebuilt from uncommitted rows
+    db_session.rollback()
+
+    assert FareMatrix.fare(db_session, lower.id, 1, 5) == original
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.services.fare_matrix import FareMatrix
+from app.services.prediction_service import PredictionService
+from app.services.seat_inventory import SeatInventory
+
+
+TRAVEL_DATE = date.today() + timedelta(days=20)
+
+
+def _booking_payload(from_station, to_station, email, **selection):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "passenger_details": {"name": "Occupancy User", "contact": "9876543210", "email": email},
+        "meals": [],
+        **selection,
+    }
+
+
+def test_counters_follow_bookings_and_cancellations(client, db_session, seed_data):
+    first = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Surat", "a@example.com", seats=["L01", "U01"])
+    ).json()
+    client.post("/api/v1/bookings/", json=_booking_payload("Vadodara", "Vapi", "b@example.com", seats=["L02"]))
+
+    # Segments: 1 = Ahmedabad-Vadodara, 2 = Vadodara-Surat, 3 = Surat-Vapi, 4 = Vapi-Mumbai
+    assert SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 1, 2) == 2
+    assert SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 1, 5) == 3
+    assert SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 3, 5) == 1
+    assert SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 4, 5) == 0
+
+    assert client.delete(f"/api/v1/bookings/{first['booking_id']}").status_code == 200
+    counts = dict(SeatInventory._segment_counts[TRAVEL_DATE])
+    assert SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 1, 5) == 1
+
+    # Incremental counters match a fresh load from seat_availability
+    SeatInventory.invalidate(TRAVEL_DATE)
+    SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 1, 5)
+    assert {k: v for k, v in counts.items() if v} == SeatInventory._segment_counts[TRAVEL_DATE]
+
+
+def test_booking_is_scored_with_real_occupancy(client, db_session, seed_data):
+    client.post("/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", "a@example.com", seats=["L01"]))
+    booking = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Vadodara", "Surat", "b@example.com", seats=["U01"])
+    ).json()
+
+    # One of three seats is taken on the journey's segments; upper berth, partial route
+    expected = PredictionService.predict_confirmation_probability(
+        date.today(), TRAVEL_DATE, 1, occupancy_percent=33, seat_type="upper", route_type="partial"
+    )
+    assert booking["confirmation_probability"] == expected
+    assert expected != PredictionService.predict_confirmation_probability(date.today(), TRAVEL_DATE, 1)
+
+    # Reading the features costs no queries once the date is loaded
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        SeatInventory.segment_occupancy(db_session, TRAVEL_DATE, 2, 3)
+        FareMatrix.seat_count(db_session)
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+    assert statements == []
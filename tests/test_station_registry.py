@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+from app.config import STATIONS
+from app.services.station_registry import StationRecord, StationRegistry
+
+
+def _config_registry():
+    return StationRegistry([
+        StationRecord(id=index + 1, **station) for index, station in enumerate(STATIONS)
+    ])
+
+
+def test_registry_indexes_stations():
+    registry = _config_registry()
+
+    assert registry.by_name("Surat").sequence == 3
+    assert registry.by_name("surat") is None
+    assert registry.by_name("surat", ignore_case=True).name == "Surat"
+    assert registry.by_id(5).name == "Mumbai"
+    assert registry.by_sequence(2).name == "Vadodara"
+    assert [s.sequence for s in registry.stations] == [1, 2, 3, 4, 5]
+
+
+def test_segment_distance_and_duration_cross_midnight():
+    registry = _config_registry()
+
+    assert registry.distance_km(1, 5) == 500
+    assert registry.distance_km(2, 3) == 150
+    # 20:15 departure from Ahmedabad -> 05:00 arrival in Mumbai
+    assert registry.duration_label(1, 5) == "8h 45m"
+    # 22:15 departure from Vadodara -> 00:30 arrival in Surat
+    assert registry.duration_label(2, 3) == "2h 15m"
+    assert registry.duration_minutes(5, 1) is None
+
+
+def test_booking_response_includes_duration(client, seed_data):
+    payload = {
+        "from_station": "Vadodara",
+        "to_station": "Vapi",
+        "travel_date": (date.today() + timedelta(days=10)).isoformat(),
+        "seats": ["L01"],
+        "passenger_details": {"name": "Registry User", "contact": "9876543210", "email": "registry@example.com"},
+        "meals": [],
+    }
+    resp = client.post("/api/v1/bookings/", json=payload)
+    assert resp.status_code == 200
+    # Seed schedule: departs Vadodara 10:30, arrives Vapi 14:00
+    assert resp.json()["journey_details"]["duration"] == "3h 30m"
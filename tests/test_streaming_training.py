@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import log_loss
+
+from app.ml import train_streaming
+from app.ml.scorer import LogisticScorer
+from app.services import model_registry
+from app.services.model_registry import ModelRegistry
+
+
+ROOT = Path(__file__).parent.parent
+DATA = ROOT / "app" / "data" / "historical_bookings.csv"
+COMMITTED = ROOT / "app" / "ml" / "saved_models" / "v1" / "booking_predictor.json"
+
+
+def _dataset(categories):
+    df = pd.read_csv(DATA, dtype=train_streaming.DTYPES)
+    holdout = train_streaming._holdout_mask(df, 10)
+    return train_streaming._feature_matrix(df, categories), df["was_confirmed"].to_numpy(), holdout
+
+
+def test_streamed_model_matches_in_memory_training(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_REGISTRY_DIR", str(tmp_path))
+    ModelRegistry.reset()
+    try:
+        summary = train_streaming.train_streaming(str(DATA), chunk_size=50, epochs=20)
+        assert summary["version"] == "v1"
+        assert ModelRegistry.load().version == "v1"
+    finally:
+        ModelRegistry.reset()
+
+    # Same artifact format and category codes as the committed model
+    scorer = LogisticScorer.load(summary["path"])
+    committed = LogisticScorer.load(COMMITTED)
+    assert scorer.features == committed.features
+    assert scorer.categories == committed.categories
+
+    # Holdout rows are never trained on; quality matches LogisticRegression on the same split
+    X, y, holdout = _dataset(scorer.categories)
+    assert summary["train_rows"] == int((~holdout).sum())
+    assert summary["holdout"]["rows"] == int(holdout.sum())
+    reference = LogisticRegression(max_iter=1000).fit(X[~holdout], y[~holdout])
+    expected = log_loss(y[holdout], reference.predict_proba(X[holdout])[:, 1])
+    assert abs(log_loss(y[holdout], scorer.predict_proba(X[holdout])) - expected) < 0.02
+    assert abs(summary["holdout"]["log_loss"] - log_loss(y[holdout], scorer.predict_proba(X[holdout]))) < 1e-9
+
+
+def test_scan_statistics_do_not_depend_on_chunk_size():
+    small = train_streaming._scan(str(DATA), 7, 10)
+    large = train_streaming._scan(str(DATA), 10_000, 10)
+    assert small["categories"] == large["categories"]
+    assert (small["rows"], small["train_rows"]) == (large["rows"], large["train_rows"])
+    np.testing.assert_allclose(small["mean"], large["mean"])
+    np.testing.assert_allclose(small["std"], large["std"])
+
+    X, _, holdout = _dataset(small["categories"])
+    np.testing.assert_allclose(small["mean"], X[~holdout].mean(axis=0))
+    np.testing.assert_allclose(small["std"], X[~holdout].std(axis=0))
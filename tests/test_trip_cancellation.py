@@ -0,0 +1,121 @@
+import json
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.api import dependencies
+from app.models.seat import SeatAvailability
+from app.models.waitlist import WaitlistEntry
+from app.services.booking_service import BookingService
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(email, travel_date=TRAVEL_DATE, **selection):
+    return {
+        "from_station": "Ahmedabad",
+        "to_station": "Mumbai",
+        "travel_date": travel_date.isoformat(),
+        "passenger_details": {"name": "Trip User", "contact": "9876543210", "email": email},
+        "meals": [],
+        **selection,
+    }
+
+
+def test_trip_cancellation_returns_refund_report(client, db_session, seed_data, admin_headers):
+    kept = client.post(
+        "/api/v1/bookings/", json=_booking_payload("other@example.com", TRAVEL_DATE + timedelta(days=1), seats=["L01"])
+    ).json()
+    booked = client.post("/api/v1/bookings/", json=_booking_payload("a@example.com", seats=["L01", "U01"])).json()
+    client.post("/api/v1/bookings/", json=_booking_payload("b@example.com", seats=["L02"]))
+    waitlisted = client.post(
+        "/api/v1/bookings/", json=_booking_payload("c@example.com", seat_count=1, waitlist_if_full=True)
+    ).json()
+    assert waitlisted["status"] == "WAITLISTED"
+
+    response = client.post(
+        "/api/v1/admin/trips/cancel",
+        json={"journey_date": TRAVEL_DATE.isoformat(), "refund_percentage": 50},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    summary = lines[0]["summary"]
+    assert summary["cancelled_bookings"] == 3
+    assert summary["released_seat_blocks"] == 3
+    assert summary["removed_waitlist_entries"] == 1
+
+    refunds = {line["booking_reference"]: line for line in lines[1:]}
+    assert refunds[booked["booking_id"]]["refund_amount"] == int(booked["total_amount"]) // 2
+    assert summary["total_refund"] == sum(line["refund_amount"] for line in lines[1:])
+
+    assert client.get(f"/api/v1/bookings/{booked['booking_id']}").json()["status"] == "CANCELLED"
+    assert client.get(f"/api/v1/bookings/{kept['booking_id']}").json()["status"] == "CONFIRMED"
+    assert db_session.query(WaitlistEntry).count() == 0
+    assert db_session.query(SeatAvailability).count() == 1
+
+    # The freed seats are bookable again straight away
+    assert client.post("/api/v1/bookings/", json=_booking_payload("d@example.com", seats=["L01"])).status_code == 200
+
+
+def test_trip_cancellation_is_set_based(client, db_session, seed_data):
+    for index, seat in enumerate(["L01", "U01", "L02"]):
+        client.post("/api/v1/bookings/", json=_booking_payload(f"user{index}@example.com", seats=[seat]))
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        result = BookingService.cancel_trip(db_session, TRAVEL_DATE)
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+
+    assert result["summary"]["cancelled_bookings"] == 3
+    assert result["summary"]["total_refund"] == sum(row.total_amount for row in result["refunds"])
+    # One UPDATE and two DELETEs, whatever the number of bookings
+    assert len(statements) == 3
+
+    again = BookingService.cancel_trip(db_session, TRAVEL_DATE)
+    assert again["summary"]["cancelled_bookings"] == 0
+
+
+def test_trip_cancellation_rejects_backwards_range(client, seed_data, admin_headers):
+    response = client.post(
+        "/api/v1/admin/trips/cancel",
+        json={"journey_date": TRAVEL_DATE.isoformat(), "end_date": (TRAVEL_DATE - timedelta(days=1)).isoformat()},
+        headers=admin_headers,
+    )
+    assert response.status_code == 422
+
+
+def test_trip_cancellation_caps_date_range(client, seed_data, admin_headers):
+    response = client.post(
+        "/api/v1/admin/trips/cancel",
+        json={"journey_date": TRAVEL_DATE.isoformat(), "end_date": (TRAVEL_DATE + timedelta(days=365)).isoformat()},
+        headers=admin_headers,
+    )
+    assert response.status_code == 422
+
+
+def test_trip_cancellation_requires_admin_key(client, seed_data, admin_headers, monkeypatch):
+    booked = client.post("/api/v1/bookings/", json=_booking_payload("a@example.com", seats=["L01"])).json()
+    payload = {"journey_date": TRAVEL_DATE.isoformat()}
+
+    assert client.post("/api/v1/admin/trips/cancel", json=payload).status_code == 403
+    assert client.post(
+        "/api/v1/admin/trips/cancel", json=payload, headers={"X-Admin-Key": "wrong"}
+    ).status_code == 403
+    # No key configured: the endpoint is disabled
+    monkeypatch.setattr(dependencies, "ADMIN_API_KEY", "")
+    assert client.post(
+        "/api/v1/admin/trips/cancel", json=payload, headers={"X-Admin-Key": ""}
+    ).status_code == 403
+
+    assert client.get(f"/api/v1/bookings/{booked['booking_id']}").json()["status"] == "CONFIRMED"
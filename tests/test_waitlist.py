@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+
+from app.models.waitlist import WaitlistEntry
+from app.services.waitlist_service import WaitlistService
+
+
+TRAVEL_DATE = date.today() + timedelta(days=30)
+
+
+def _booking_payload(from_station, to_station, email, **selection):
+    return {
+        "from_station": from_station,
+        "to_station": to_station,
+        "travel_date": TRAVEL_DATE.isoformat(),
+        "passenger_details": {"name": "Waitlist User", "contact": "9876543210", "email": email},
+        "meals": [],
+        **selection,
+    }
+
+
+def _fill_route(client):
+    """Book every seat end to end; returns the booking references"""
+    response = client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Ahmedabad", "Mumbai", "full@example.com", seats=["L01", "U01", "L02"]),
+    )
+    assert response.status_code == 200
+    return response.json()["booking_id"]
+
+
+def test_sold_out_booking_joins_waitlist(client, db_session, seed_data):
+    _fill_route(client)
+
+    refused = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Vadodara", "Surat", "late@example.com", seat_count=1)
+    )
+    assert refused.status_code == 400
+
+    response = client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Vadodara", "Surat", "late@example.com", seat_count=1, waitlist_if_full=True),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "WAITLISTED"
+    assert body["seats"] == []
+
+    entry = db_session.query(WaitlistEntry).one()
+    assert (entry.from_sequence, entry.to_sequence, entry.promoted_at) == (2, 3, None)
+
+    named = client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Vadodara", "Surat", "late@example.com", seats=["L01"], waitlist_if_full=True),
+    )
+    assert named.status_code == 422
+
+
+def test_cancellation_promotes_oldest_entry(client, db_session, seed_data):
+    full_reference = _fill_route(client)
+
+    references = []
+    for email in ("first@example.com", "second@example.com"):
+        response = client.post(
+            "/api/v1/bookings/",
+            json=_booking_payload("Vadodara", "Surat", email, seat_count=1, waitlist_if_full=True),
+        )
+        references.append(response.json()["booking_id"])
+
+    assert client.delete(f"/api/v1/bookings/{full_reference}").status_code == 200
+
+    first = client.get(f"/api/v1/bookings/{references[0]}").json()
+    second = client.get(f"/api/v1/bookings/{references[1]}").json()
+    assert first["status"] == "CONFIRMED"
+    assert len(first["seats"]) == 1
+    assert first["total_amount"] > 0
+    # Three seats came free, so the second entry is promoted by the same cancellation
+    assert second["status"] == "CONFIRMED"
+    assert first["seats"] != second["seats"]
+    assert db_session.query(WaitlistEntry).filter(WaitlistEntry.promoted_at == None).count() == 0
+
+
+def test_promotion_respects_queue_order_and_segment(client, db_session, seed_data):
+    client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Ahmedabad", "Mumbai", "full@example.com", seats=["U01", "L02"]),
+    )
+    single = client.post(
+        "/api/v1/bookings/", json=_booking_payload("Ahmedabad", "Mumbai", "one@example.com", seats=["L01"])
+    ).json()["booking_id"]
+
+    waitlisted = {}
+    for email, route in (("vapi@example.com", ("Surat", "Mumbai")), ("early@example.com", ("Vadodara", "Surat")),
+                         ("later@example.com", ("Vadodara", "Surat"))):
+        response = client.post(
+            "/api/v1/bookings/", json=_booking_payload(*route, email, seat_count=1, waitlist_if_full=True)
+        )
+        waitlisted[email] = response.json()["booking_id"]
+
+    assert client.delete(f"/api/v1/bookings/{single}").status_code == 200
+
+    statuses = {
+        email: client.get(f"/api/v1/bookings/{reference}").json()["status"]
+        for email, reference in waitlisted.items()
+    }
+    # One freed seat: both non-overlapping segments fit on it, the later duplicate does not
+    assert statuses == {
+        "vapi@example.com": "CONFIRMED",
+        "early@example.com": "CONFIRMED",
+        "later@example.com": "WAITLISTED",
+    }
+
+
+def test_cancelling_waitlisted_booking_leaves_queue(client, db_session, seed_data):
+    full_reference = _fill_route(client)
+    reference = client.post(
+        "/api/v1/bookings/",
+        json=_booking_payload("Vadodara", "Surat", "quit@example.com", seat_count=1, waitlist_if_full=True),
+    ).json()["booking_id"]
+
+    assert client.delete(f"/api/v1/bookings/{reference}").status_code == 200
+    assert db_session.query(WaitlistEntry).count() == 0
+
+    assert client.delete(f"/api/v1/bookings/{full_reference}").status_code == 200
+    assert client.get(f"/api/v1/bookings/{reference}").json()["status"] == "CANCELLED"
+
+
+def test_entries_queued_by_another_worker_keep_fifo_order(client, db_session, seed_data):
+    full_reference = _fill_route(client)
+    references = {}
+    for email in ("first@example.com", "second@example.com"):
+        references[email] = client.post(
+            "/api/v1/bookings/",
+            json=_booking_payload("Vadodara", "Surat", email, seat_count=2, waitlist_if_full=True),
+        ).json()["booking_id"]
+
+    # Another worker re-queues first@ behind second@: the change exists only in the database
+    first = db_session.query(WaitlistEntry).order_by(WaitlistEntry.id).first()
+    requeued = (first.booking_id, first.journey_date, first.from_sequence, first.to_sequence,
+                first.seat_count, first.berth_type, first.adjacent)
+    db_session.delete(first)
+    db_session.flush()
+    WaitlistService.add_entry(db_session, *requeued)
+    db_session.commit()
+
+    # Three seats free up: the now-oldest entry (second@) takes two, first@ can't get two more
+    assert client.delete(f"/api/v1/bookings/{full_reference}").status_code == 200
+    statuses = {
+        email: client.get(f"/api/v1/bookings/{reference}").json()["status"]
+        for email, reference in references.items()
+    }
+    assert statuses == {"second@example.com": "CONFIRMED", "first@example.com": "WAITLISTED"}